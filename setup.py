@@ -131,6 +131,7 @@ setup(
 
     packages=find_packages(exclude=["test", "test.*"]),
     extras_require={
+        "numpy": ["numpy"],
         "test": ["coverage", "flake8 >= 3.7", "flake8-quotes", "mypy",
                  "pytest", "pretend"],
     },
@@ -0,0 +1,51 @@
+import json
+
+from verspec import bench
+
+
+def run_main(capsys, *args):
+    assert bench.main(list(args)) == 0
+    return capsys.readouterr().out
+
+
+class TestBench:
+    def test_corpus_deterministic(self):
+        a, b = bench.Corpus(0.01), bench.Corpus(0.01)
+        assert a.python_versions == b.python_versions
+        assert a.python_specifier_sets == b.python_specifier_sets
+        assert len(a.python_versions) == 100
+
+    def test_list(self, capsys):
+        out = run_main(capsys, "--list")
+        assert out.splitlines() == [b.name for b in bench.BENCHMARKS]
+
+    def test_all(self):
+        results = bench.run(repeat=1, scale=0.01, min_time=0)
+        assert [r["name"] for r in results["results"]] == [
+            b.name for b in bench.BENCHMARKS
+        ]
+
+    def test_json(self, capsys):
+        out = run_main(capsys, "python.version.*", "-o", "-", "-r", "2",
+                       "--scale", "0.01", "--min-time", "0")
+        results = json.loads(out)
+        assert results["seed"] == bench.SEED
+        assert results["scale"] == 0.01
+        assert [r["name"] for r in results["results"]] == [
+            "python.version.parse", "python.version.parse_cached",
+            "python.version.sort", "python.version.sort_key",
+        ]
+        for r in results["results"]:
+            assert len(r["times"]) == 2
+            assert r["best"] == min(r["times"])
+            assert r["best_per_op"] == r["best"] / r["ops"]
+
+    def test_output_file(self, capsys, tmp_path):
+        path = tmp_path / "results.json"
+        out = run_main(capsys, "loose.*", "-o", str(path), "-r", "1",
+                       "--scale", "0.01", "--min-time", "0")
+        assert "loose.version.parse" in out
+        with open(path) as f:
+            results = json.load(f)
+        assert all(r["name"].startswith("loose.")
+                   for r in results["results"])
@@ -0,0 +1,144 @@
+import threading
+
+import pytest
+
+from verspec.cache import CacheInfo, ParseCache
+from verspec.loose import LooseVersion
+from verspec.python import InvalidVersion, PythonVersion
+
+
+class TestParseCache:
+    def test_hit_and_miss(self):
+        cache = ParseCache(maxsize=4)
+        calls = []
+
+        def parse(s):
+            calls.append(s)
+            return s.upper()
+
+        assert cache.get("a", parse) == "A"
+        assert cache.get("a", parse) == "A"
+        assert cache.get("b", parse) == "B"
+        assert calls == ["a", "b"]
+        assert cache.info() == CacheInfo(hits=1, misses=2, maxsize=4,
+                                         currsize=2)
+
+    def test_lru_eviction(self):
+        cache = ParseCache(maxsize=2)
+        cache.get("a", str.upper)
+        cache.get("b", str.upper)
+        # Touch "a" so that "b" is the least-recently used entry.
+        cache.get("a", str.upper)
+        cache.get("c", str.upper)
+
+        assert len(cache) == 2
+        cache.get("a", str.upper)
+        assert cache.info().hits == 2
+        cache.get("b", str.upper)
+        assert cache.info().misses == 4
+
+    def test_unbounded(self):
+        cache = ParseCache(maxsize=None)
+        for i in range(100):
+            cache.get(str(i), str.upper)
+        assert cache.info() == CacheInfo(0, 100, None, 100)
+
+    def test_disabled(self):
+        cache = ParseCache(maxsize=0)
+        cache.get("a", str.upper)
+        cache.get("a", str.upper)
+        assert cache.info() == CacheInfo(0, 2, 0, 0)
+
+    def test_resize(self):
+        cache = ParseCache(maxsize=10)
+        for i in range(10):
+            cache.get(str(i), str.upper)
+        cache.maxsize = 3
+        assert cache.maxsize == 3
+        assert len(cache) == 3
+
+        # The most-recently used entries survive.
+        cache.get("9", str.upper)
+        assert cache.info().hits == 1
+
+    def test_invalid_maxsize(self):
+        with pytest.raises(ValueError):
+            ParseCache(maxsize=-1)
+        cache = ParseCache()
+        with pytest.raises(ValueError):
+            cache.maxsize = -1
+
+    def test_clear(self):
+        cache = ParseCache(maxsize=4)
+        cache.get("a", str.upper)
+        cache.get("a", str.upper)
+        cache.clear()
+        assert cache.info() == CacheInfo(0, 0, 4, 0)
+
+    def test_exceptions_not_cached(self):
+        cache = ParseCache(maxsize=4)
+
+        def parse(s):
+            raise ValueError(s)
+
+        for i in range(2):
+            with pytest.raises(ValueError):
+                cache.get("a", parse)
+        assert cache.info() == CacheInfo(0, 2, 4, 0)
+
+    def test_repr(self):
+        assert repr(ParseCache(maxsize=8)) == "<ParseCache(maxsize=8)>"
+
+    def test_threads(self):
+        cache = ParseCache(maxsize=16)
+        keys = [str(i) for i in range(32)]
+        errors = []
+
+        def worker():
+            try:
+                for _ in range(50):
+                    for k in keys:
+                        assert cache.get(k, str.upper) == k.upper()
+            except Exception as e:  # pragma: no cover
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert not errors
+        info = cache.info()
+        assert info.hits + info.misses == 8 * 50 * 32
+        assert info.currsize <= 16
+
+
+@pytest.mark.parametrize("version_type", [PythonVersion, LooseVersion])
+class TestVersionCache:
+    @pytest.fixture(autouse=True)
+    def fresh_cache(self, version_type):
+        old = version_type.parse_cache
+        version_type.parse_cache = ParseCache(maxsize=8)
+        yield
+        version_type.parse_cache = old
+
+    def test_repeated_parse(self, version_type):
+        a = version_type("1.0")
+        b = version_type("1.0")
+        assert a == b
+        assert a._key is b._key
+        assert version_type.parse_cache.info() == CacheInfo(1, 1, 8, 1)
+
+    def test_clear(self, version_type):
+        version_type("1.0")
+        version_type.parse_cache.clear()
+        assert len(version_type.parse_cache) == 0
+        assert str(version_type("1.0")) == "1.0"
+
+
+def test_python_invalid_not_cached():
+    with pytest.raises(InvalidVersion):
+        PythonVersion("not a version")
+    with pytest.raises(InvalidVersion):
+        PythonVersion("not a version")
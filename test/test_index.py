@@ -0,0 +1,263 @@
+import random
+
+import pytest
+
+from verspec.index import SpecifierIndex, VersionIndex, match_matrix
+from verspec.loose import LooseSpecifier, LooseSpecifierSet, LooseVersion
+from verspec.python import PythonSpecifier, PythonSpecifierSet, PythonVersion
+
+from .test_intervals import ALL_SPECIFIERS, EXTRA_VERSIONS
+from .test_specifiers import LOOSE_SPECIFIERS
+from .test_version import LOOSE_VERSIONS, VERSIONS
+
+PYTHON_VERSIONS = VERSIONS + EXTRA_VERSIONS
+PRERELEASE_VERSIONS = ["1.0a1", "1.0b2", "1.0rc1", "1.0.dev0", "2.0a1"]
+
+SPECIFIER_SETS = [
+    "",
+    ">=1.0",
+    ">=1.0,<2.0",
+    ">=1.0,!=1.0.*",
+    "~=1.0,!=1.1",
+    ">1.0a1,<1.0.post1",
+    "==1.*,===1.0",
+    "<1.0",
+    ">=1.0a1",
+]
+
+
+def expected(spec, versions, version_type, prereleases):
+    # VersionIndex returns the results sorted by version, so sort the results
+    # of `filter` to match.
+    return sorted(spec.filter(versions, prereleases=prereleases),
+                  key=lambda v: version_type(v)._key)
+
+
+def check(spec, versions, version_type=PythonVersion, prereleases=None):
+    index = VersionIndex(versions, version_type)
+    result = expected(spec, versions, version_type, prereleases)
+    assert index.filter(spec, prereleases) == result
+    assert index.count(spec, prereleases) == len(result)
+    assert index.best_match(spec, prereleases) == (
+        result[-1] if result else None
+    )
+
+
+@pytest.mark.parametrize("prereleases", [None, True, False])
+class TestPythonIndex:
+    @pytest.mark.parametrize("specifier", ALL_SPECIFIERS)
+    def test_specifier(self, specifier, prereleases):
+        check(PythonSpecifier(specifier), PYTHON_VERSIONS,
+              prereleases=prereleases)
+
+    @pytest.mark.parametrize("specifier", ALL_SPECIFIERS)
+    def test_specifier_prereleases_only(self, specifier, prereleases):
+        check(PythonSpecifier(specifier), PRERELEASE_VERSIONS,
+              prereleases=prereleases)
+
+    @pytest.mark.parametrize("spec_prereleases", [None, True, False])
+    @pytest.mark.parametrize("specifier", ["<=2.0", "==1.0a1", ">=1.0.dev0"])
+    def test_specifier_policy(self, specifier, spec_prereleases,
+                              prereleases):
+        spec = PythonSpecifier(specifier, prereleases=spec_prereleases)
+        check(spec, PYTHON_VERSIONS, prereleases=prereleases)
+        check(spec, PRERELEASE_VERSIONS, prereleases=prereleases)
+
+    @pytest.mark.parametrize("spec_prereleases", [None, True, False])
+    @pytest.mark.parametrize("specifier", SPECIFIER_SETS)
+    def test_specifier_set(self, specifier, spec_prereleases, prereleases):
+        spec = PythonSpecifierSet(specifier, prereleases=spec_prereleases)
+        check(spec, PYTHON_VERSIONS, prereleases=prereleases)
+        check(spec, PRERELEASE_VERSIONS, prereleases=prereleases)
+
+
+class TestLooseIndex:
+    @pytest.mark.parametrize("specifier", LOOSE_SPECIFIERS)
+    def test_specifier(self, specifier):
+        check(LooseSpecifier(specifier), LOOSE_VERSIONS, LooseVersion)
+
+    @pytest.mark.parametrize("specifier", ["", ">=1.0", ">=1.0,<2.0"])
+    def test_specifier_set(self, specifier):
+        check(LooseSpecifierSet(specifier), LOOSE_VERSIONS, LooseVersion)
+
+
+class TestVersionIndex:
+    def test_sorted(self):
+        index = VersionIndex(["2.0", "1.0", "1.0a1", "1.0.0", "0.9"])
+        assert len(index) == 5
+        assert list(index) == ["0.9", "1.0a1", "1.0", "1.0.0", "2.0"]
+
+    def test_parsed_items(self):
+        versions = [PythonVersion("2.0"), PythonVersion("1.0")]
+        index = VersionIndex(versions)
+        assert index.filter(PythonSpecifier(">=1.0")) == versions[::-1]
+        assert index.best_match(PythonSpecifier("<2.0")) is versions[1]
+
+    def test_empty(self):
+        index = VersionIndex([])
+        assert len(index) == 0
+        assert index.filter(PythonSpecifierSet(">=1.0")) == []
+        assert index.count(PythonSpecifierSet(">=1.0")) == 0
+        assert index.best_match(PythonSpecifierSet(">=1.0")) is None
+
+    def test_residual(self):
+        index = VersionIndex(["1.0", "1.0.0", "1.0.1", "1.1"])
+        spec = PythonSpecifierSet("===1.0.0")
+        assert index.filter(spec) == ["1.0.0"]
+        assert index.count(spec) == 1
+        assert index.best_match(spec) == "1.0.0"
+
+    def test_repr(self):
+        assert repr(VersionIndex(["1.0", "0.9"])) == (
+            "<VersionIndex(['0.9', '1.0'])>"
+        )
+
+
+def python_specifiers():
+    # ===foobar can't determine its own prerelease policy, so give it one.
+    def policy(spec):
+        return True if spec == "===foobar" else None
+
+    return (
+        [PythonSpecifier(s, policy(s)) for s in ALL_SPECIFIERS] +
+        [PythonSpecifierSet(s, policy(s)) for s in ALL_SPECIFIERS] +
+        [PythonSpecifierSet(s, p) for s in SPECIFIER_SETS
+         for p in (None, True, False)]
+    )
+
+
+def check_match(index, versions, prereleases=None):
+    for version in versions:
+        expected = [s for s in index if s.contains(version, prereleases)]
+        result = index.match(version, prereleases)
+        assert sorted(map(id, result)) == sorted(map(id, expected)), version
+
+
+class TestSpecifierIndex:
+    @pytest.mark.parametrize("prereleases", [None, True, False])
+    def test_match(self, prereleases):
+        index = SpecifierIndex(python_specifiers())
+        check_match(index, PYTHON_VERSIONS + PRERELEASE_VERSIONS,
+                    prereleases)
+
+    def test_parsed_version(self):
+        index = SpecifierIndex([PythonSpecifierSet(">=1.0"),
+                                PythonSpecifierSet("<1.0")])
+        assert index.match(PythonVersion("1.5")) == [
+            PythonSpecifierSet(">=1.0")
+        ]
+
+    def test_add_remove(self):
+        specs = python_specifiers()
+        rng = random.Random(0)
+        index = SpecifierIndex(specs[::2])
+        for i in range(300):
+            if len(index) and rng.random() < 0.4:
+                index.remove(rng.choice(list(index)))
+            else:
+                index.add(rng.choice(specs))
+            if i % 50 == 0:
+                check_match(index, PYTHON_VERSIONS)
+        check_match(index, PYTHON_VERSIONS + PRERELEASE_VERSIONS)
+
+    def test_duplicates(self):
+        a, b = PythonSpecifierSet(">=1.0"), PythonSpecifierSet(">=1.0")
+        index = SpecifierIndex([a, b])
+        assert len(index.match("1.0")) == 2
+        index.remove(PythonSpecifierSet(">=1.0"))
+        assert len(index.match("1.0")) == 1
+        assert a in index
+        index.remove(a)
+        assert index.match("1.0") == []
+        assert a not in index
+        with pytest.raises(ValueError):
+            index.remove(a)
+
+    def test_remove_prereleases(self):
+        a = PythonSpecifierSet(">=1.0", prereleases=True)
+        b = PythonSpecifierSet(">=1.0")
+        index = SpecifierIndex([a, b])
+        index.remove(a)
+        assert a not in index
+        assert b in index
+        assert index.match("1.5a1") == []
+        assert index.match("1.5") == [b]
+
+        index = SpecifierIndex([a, b])
+        index.remove(PythonSpecifierSet(">=1.0"))
+        assert index.match("1.5a1") == [a]
+        with pytest.raises(ValueError):
+            index.remove(PythonSpecifierSet(">=1.0"))
+        index.remove(PythonSpecifierSet(">=1.0", prereleases=True))
+        assert len(index) == 0
+
+    def test_empty(self):
+        index = SpecifierIndex()
+        assert len(index) == 0
+        assert index.match("1.0") == []
+        index.add(PythonSpecifierSet(">=1.0"))
+        assert index.match("1.0") == [PythonSpecifierSet(">=1.0")]
+
+    def test_residual(self):
+        index = SpecifierIndex([PythonSpecifierSet("===1.0.0"),
+                                PythonSpecifierSet("==1.0.*")])
+        assert sorted(index.match("1.0.0"), key=str) == [
+            PythonSpecifierSet("==1.0.*"), PythonSpecifierSet("===1.0.0")
+        ]
+        assert index.match("1.0") == [PythonSpecifierSet("==1.0.*")]
+        assert index.match("1a1") == []
+
+    def test_loose(self):
+        specs = [LooseSpecifier(s) for s in LOOSE_SPECIFIERS]
+        index = SpecifierIndex(specs, LooseVersion)
+        check_match(index, LOOSE_VERSIONS)
+
+    def test_repr(self):
+        index = SpecifierIndex([PythonSpecifierSet(">=1.0"),
+                                PythonSpecifier("<2.0")])
+        assert repr(index) == "<SpecifierIndex(['>=1.0', '<2.0'])>"
+
+
+class TestMatchMatrix:
+    @pytest.mark.parametrize("prereleases", [None, True, False])
+    @pytest.mark.parametrize("versions", [
+        PYTHON_VERSIONS, PRERELEASE_VERSIONS,
+        PYTHON_VERSIONS + PRERELEASE_VERSIONS,
+    ])
+    def test_match(self, versions, prereleases):
+        specs = python_specifiers()
+        index = VersionIndex(versions)
+        matrix = index.match_matrix(specs, prereleases)
+        assert len(matrix) == len(specs)
+        assert matrix.versions == list(index)
+        for i, spec in enumerate(specs):
+            assert matrix.filter(i) == index.filter(spec, prereleases)
+            assert matrix.count(i) == index.count(spec, prereleases)
+
+    def test_rows(self):
+        matrix = match_matrix(
+            [PythonSpecifierSet(">=1.0,!=1.2"), PythonSpecifierSet("<1.0"),
+             PythonSpecifierSet("===1.1")],
+            ["1.2", "0.9", "1.1", "1.0", "1.3", "1.0a1"]
+        )
+        assert matrix.versions == ["0.9", "1.0a1", "1.0", "1.1", "1.2", "1.3"]
+        assert list(matrix) == [0b101100, 0b000001, 0b001000]
+        assert matrix[1] == 0b000001
+        assert matrix.ranges(0) == [(2, 4), (5, 6)]
+        assert matrix.ranges(1) == [(0, 1)]
+        assert matrix.filter(0) == ["1.0", "1.1", "1.3"]
+        assert matrix.count(0) == 3
+
+    def test_empty(self):
+        matrix = match_matrix([PythonSpecifierSet(">=1.0")], [])
+        assert list(matrix) == [0]
+        assert matrix.ranges(0) == []
+        assert matrix.filter(0) == []
+        assert len(match_matrix([], ["1.0"])) == 0
+
+    def test_loose(self):
+        specs = [LooseSpecifier(s) for s in LOOSE_SPECIFIERS]
+        index = VersionIndex(LOOSE_VERSIONS, LooseVersion)
+        matrix = match_matrix(specs, LOOSE_VERSIONS, LooseVersion)
+        for i, spec in enumerate(specs):
+            assert matrix.filter(i) == index.filter(spec)
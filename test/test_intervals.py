@@ -0,0 +1,329 @@
+import itertools
+
+import pytest
+
+from verspec.intervals import (MAX, MIN, Intervals, _Exclusions, after,
+                               before)
+from verspec.loose import LooseSpecifier, LooseSpecifierSet, LooseVersion
+from verspec.python import PythonSpecifier, PythonSpecifierSet, PythonVersion
+
+from .test_specifiers import LOOSE_SPECIFIERS, SPECIFIERS
+from .test_version import LOOSE_VERSIONS, VERSIONS
+
+# Specifiers exercising the special cases of the PEP 440 operators.
+EXTRA_SPECIFIERS = [
+    "==1.0.*",
+    "!=1.0.*",
+    "==1.*",
+    "==0.*",
+    "!=1.2.*",
+    "==1.0a1.*",
+    "==1.0.post456.*",
+    "==1!1.0.*",
+    "!=1!1.*",
+    "==v1.0.*",
+    "~=1.0",
+    "~=1.0.0",
+    "~=1.2.3",
+    "~=1.0a1",
+    "~=1.0.post1",
+    "~=1!1.0",
+    "~=v1.2",
+    "===1.0",
+    "===1.0.0",
+    "===v1.0",
+    "===foobar",
+    "==1.2+abc",
+    "!=1.2+abc",
+    "==1.2",
+    "!=1.2",
+    "<1.0",
+    "<1.0a2",
+    "<1.0.post456",
+    "<=1.0",
+    ">1.0",
+    ">1.0a1",
+    ">1.0.post456",
+    ">1.2.r32",
+    ">=1.0.dev456",
+    ">=1!1.0",
+]
+
+EXTRA_VERSIONS = [
+    "0",
+    "1",
+    "1a1",
+    "1.post1",
+    "1.dev0",
+    "1.0",
+    "1.0.0",
+    "1.0.0a1",
+    "1.0a1.post1",
+    "1.0.post1",
+    "1.0.1",
+    "1.0+abc",
+    "1.0.0+abc",
+    "1.0a1+abc",
+    "1.2.3",
+    "1.2.3.post1",
+    "1.2.4",
+    "1!1",
+    "1!1.0a1",
+    "1!1.0.post1+abc",
+    "2.0",
+]
+
+ALL_SPECIFIERS = SPECIFIERS + EXTRA_SPECIFIERS
+ALL_VERSIONS = [PythonVersion(v) for v in VERSIONS + EXTRA_VERSIONS]
+
+
+def points(*values):
+    return [(0, v) for v in values]
+
+
+class TestIntervals:
+    def test_empty(self):
+        empty = Intervals()
+        assert len(empty) == 0
+        assert 1 not in empty
+        assert list(empty) == []
+
+    def test_everything(self):
+        everything = Intervals.everything()
+        assert len(everything) == 1
+        assert -100 in everything
+        assert 100 in everything
+
+    def test_span(self):
+        i = Intervals.span(before(1), after(3))
+        assert [x in i for x in range(5)] == [False, True, True, True, False]
+
+        i = Intervals.span(after(1), before(3))
+        assert [x in i for x in range(5)] == [False, False, True, False,
+                                              False]
+
+        assert Intervals.span(None, before(2)).bounds == (MIN, before(2))
+        assert Intervals.span(after(2), None).bounds == (after(2), MAX)
+        assert Intervals.span(after(2), before(2)) == Intervals()
+
+    def test_invert(self):
+        i = Intervals.span(before(1), after(3))
+        assert ~i == Intervals((MIN, before(1), after(3), MAX))
+        assert ~~i == i
+        assert ~Intervals() == Intervals.everything()
+        assert ~Intervals.everything() == Intervals()
+
+    @pytest.mark.parametrize(("op", "func"), [
+        (lambda a, b: a & b, lambda a, b: a and b),
+        (lambda a, b: a | b, lambda a, b: a or b),
+        (lambda a, b: a - b, lambda a, b: a and not b),
+        (lambda a, b: a ^ b, lambda a, b: a != b),
+    ])
+    def test_set_operations(self, op, func):
+        left = Intervals((before(1), after(3), after(5), before(8)))
+        right = Intervals((before(3), before(6), before(7), MAX))
+        result = op(left, right)
+
+        for x in range(10):
+            assert (x in result) == func(x in left, x in right)
+
+        # The result should be normalized, so there are no empty intervals.
+        for start, end in result:
+            assert start < end
+
+    def test_touching(self):
+        left = Intervals.span(before(1), before(2))
+        right = Intervals.span(before(2), before(3))
+        assert left | right == Intervals.span(before(1), before(3))
+        assert left & right == Intervals()
+
+    def test_intersection(self):
+        assert Intervals.intersection([]) == Intervals.everything()
+        assert Intervals.intersection([
+            Intervals.span(before(1), None),
+            Intervals.span(None, after(5)),
+            ~Intervals.span(before(3), after(3)),
+        ]) == Intervals((before(1), before(3), after(3), after(5)))
+
+        # Compare against combining the sets one at a time, including sets
+        # which touch or share cuts.
+        spans = [
+            Intervals.span(start, end) |
+            Intervals.span(after(end[0] + 1), None)
+            for start, end in itertools.product(
+                [None, before(1), after(1), before(2)],
+                [before(2), after(2), before(3), after(3)],
+            )
+            if start is None or start < end
+        ]
+        for items in itertools.combinations(spans, 3):
+            expected = items[0] & items[1] & items[2]
+            assert Intervals.intersection(items) == expected
+        assert Intervals.intersection([spans[0], Intervals()]) == Intervals()
+
+    def test_exclusions(self):
+        items = [
+            Intervals.span(before(1), None),
+            Intervals.span(before(2), None),
+            Intervals.span(None, after(5)),
+            ~Intervals.span(before(3), after(3)),
+            ~Intervals.span(before(3), after(3)),
+            Intervals(),
+            Intervals.everything(),
+        ]
+        exclusions = _Exclusions(items)
+        kept = list(range(len(items)))
+        for i in [0, 3, 1, 4, 2, 6, 5]:
+            others = Intervals.intersection(items[j] for j in kept if j != i)
+            assert exclusions.only_excluded_by(i) == (
+                not others.issubset(items[i])
+            )
+            exclusions.remove(i)
+            kept.remove(i)
+
+    def test_equality(self):
+        assert Intervals() == Intervals()
+        assert Intervals() != Intervals.everything()
+        assert hash(Intervals()) == hash(Intervals())
+        assert Intervals().__eq__(None) is NotImplemented
+        assert Intervals().__ne__(None) is NotImplemented
+
+    def test_repr(self):
+        assert repr(Intervals.span(before(1), after(2))) == (
+            "<Intervals(((1, 0), (2, 2)))>"
+        )
+
+
+class TestPythonIntervals:
+    @pytest.mark.parametrize("specifier", ALL_SPECIFIERS)
+    def test_specifier_intervals(self, specifier):
+        spec = PythonSpecifier(specifier)
+        intervals, exact = spec._get_intervals()
+
+        for version in ALL_VERSIONS:
+            expected = spec.contains(version, prereleases=True)
+            inside = version._point in intervals
+            if exact:
+                assert inside == expected, str(version)
+            else:
+                assert inside or not expected, str(version)
+
+    @pytest.mark.parametrize("specifier", [
+        ">=1.0", "<=1.0", "==1.2", "!=1.2", "<1.0", ">1.0", "==1.2+abc",
+        "==1.*", "!=1.2.*", "~=1.0", "===foobar", "===v1.0",
+    ])
+    def test_exact(self, specifier):
+        assert PythonSpecifier(specifier)._get_intervals()[1]
+
+    @pytest.mark.parametrize("specifier", [
+        "==1.0.*", "!=1.0.*", "==1.0a1.*", "==1!1.0.*", "~=1.0.0", "===1.0",
+        "==v1.0.*",
+    ])
+    def test_inexact(self, specifier):
+        assert not PythonSpecifier(specifier)._get_intervals()[1]
+
+    @pytest.mark.parametrize(("left", "right"), list(itertools.combinations(
+        [">=1.0", "<2.0", "!=1.0.*", "~=1.0", ">1.0a1", "===1.0", "<1.0.post1",
+         "==1.*", "!=1.2+abc"], 2
+    )))
+    def test_set_intervals(self, left, right):
+        spec = PythonSpecifierSet(",".join([left, right]), prereleases=True)
+        individual = [PythonSpecifier(left), PythonSpecifier(right)]
+
+        for version in ALL_VERSIONS:
+            assert spec.contains(version) == all(
+                s.contains(version, prereleases=True) for s in individual
+            ), str(version)
+
+    @pytest.mark.parametrize("specifiers", list(itertools.combinations(
+        [">=1.0", ">=1.0a1", ">1.0", "<2.0", "<=1.0", "<1.0.post1", "!=1.0",
+         "!=0.9", "!=1.0.*", "~=1.0", "==1.*", "==1.0", "===1.0",
+         "!=1.2+abc"], 3
+    )))
+    def test_simplify(self, specifiers):
+        spec = PythonSpecifierSet(",".join(specifiers))
+        simplified = spec.simplify()
+        assert set(simplified).issubset(set(spec))
+        assert simplified.prereleases == spec.prereleases
+
+        for version in ALL_VERSIONS:
+            for prereleases in (None, True, False):
+                assert simplified.contains(version, prereleases) == (
+                    spec.contains(version, prereleases)
+                ), (str(version), prereleases)
+
+    @pytest.mark.parametrize(("left", "right"), list(
+        itertools.combinations(ALL_SPECIFIERS, 2)
+    ))
+    def test_satisfiable(self, left, right):
+        spec = PythonSpecifierSet(",".join([left, right]))
+        for prereleases in (True, False):
+            expected = any(spec.contains(v, prereleases)
+                           for v in ALL_VERSIONS)
+            # If we can't find a matching version, the set may still match
+            # something outside of ALL_VERSIONS.
+            if expected:
+                assert spec.is_satisfiable(prereleases), prereleases
+
+    @pytest.mark.parametrize("left", ALL_SPECIFIERS)
+    def test_subset_overlap(self, left):
+        spec = PythonSpecifierSet(left, prereleases=True)
+        for right in ALL_SPECIFIERS:
+            other = PythonSpecifierSet(right, prereleases=True)
+            only_left = any(spec.contains(v) and not other.contains(v)
+                            for v in ALL_VERSIONS)
+            both = any(spec.contains(v) and other.contains(v)
+                       for v in ALL_VERSIONS)
+            # As above, versions outside of ALL_VERSIONS may also be found.
+            if only_left:
+                assert not spec.issubset(other), right
+            if both:
+                assert spec.overlaps(other), right
+
+    def test_compiled_once(self):
+        spec = PythonSpecifierSet(">=1.0,!=1.5")
+        assert spec._compiled is None
+        # The first version is matched without compiling the set.
+        assert "1.0" in spec
+        assert spec._compiled is None
+        assert "1.5" not in spec
+        compiled = spec._compiled
+        assert compiled is not None
+        assert "2.0" in spec
+        assert spec._compiled is compiled
+
+        spec = PythonSpecifierSet(">=1.0,!=1.5")
+        assert list(spec.filter(["0.9", "1.0", "1.5", "2.0"])) == [
+            "1.0", "2.0"
+        ]
+        assert spec._compiled is not None
+
+    def test_residual(self):
+        spec = PythonSpecifierSet(">=1.0,~=1.0.0,===1.0")
+        intervals, residual = spec._get_compiled()
+        assert {str(i) for i in residual} == {"~=1.0.0", "===1.0"}
+
+        assert spec.contains("1.0")
+        assert not spec.contains("1.0.0")
+
+
+class TestLooseIntervals:
+    @pytest.mark.parametrize("specifier", LOOSE_SPECIFIERS)
+    def test_specifier_intervals(self, specifier):
+        spec = LooseSpecifier(specifier)
+        intervals, exact = spec._get_intervals()
+        assert exact
+
+        for version in LOOSE_VERSIONS:
+            version = LooseVersion(version)
+            assert (version._point in intervals) == spec.contains(
+                version
+            ), str(version)
+
+    def test_set_intervals(self):
+        spec = LooseSpecifierSet(">=1.0,!=1.5,<2.0")
+        for version in ["0.9", "1.0", "1.2", "1.5", "2.0", "2.0a1"]:
+            assert spec.contains(version) == (
+                LooseVersion("1.0") <= LooseVersion(version) <
+                LooseVersion("2.0") and version != "1.5"
+            )
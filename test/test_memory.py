@@ -0,0 +1,51 @@
+import gc
+import tracemalloc
+
+import pytest
+
+from verspec.cache import ParseCache
+from verspec.loose import LooseVersion
+from verspec.python import PythonVersion
+
+# The memory budgets for version objects, in bytes per object. A version
+# parsed from a string in the parse cache shares its comparison key with
+# every other version parsed from that string, so it only needs the object
+# itself; otherwise, it also needs its own comparison key.
+SHARED_BUDGET = 72
+DISTINCT_BUDGET = {PythonVersion: 256, LooseVersion: 192}
+
+COUNT = 2000
+
+
+def measure(make):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        objects = make()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    total = sum(i.size_diff for i in after.compare_to(before, "filename"))
+    # Don't count the list holding the objects.
+    total -= len(objects) * 8
+    return total / len(objects)
+
+
+@pytest.mark.parametrize("version_type", [PythonVersion, LooseVersion])
+class TestMemory:
+    def test_slots(self, version_type):
+        assert not hasattr(version_type("1.2.3"), "__dict__")
+
+    def test_shared(self, version_type):
+        version_type("1.2.3")
+        size = measure(lambda: [version_type("1.2.3") for i in range(COUNT)])
+        assert size <= SHARED_BUDGET
+
+    def test_distinct(self, version_type, monkeypatch):
+        monkeypatch.setattr(version_type, "parse_cache", ParseCache(0))
+        strings = ["{}.{}.{}".format(i // 100, i // 10 % 10, i % 10)
+                   for i in range(COUNT)]
+        size = measure(lambda: [version_type(s) for s in strings])
+        assert size <= DISTINCT_BUDGET[version_type]
@@ -0,0 +1,182 @@
+import itertools
+
+import pytest
+
+from verspec import ranges
+from verspec.python import PythonSpecifier, PythonSpecifierSet, PythonVersion
+from verspec.ranges import VersionRange
+
+from .test_intervals import ALL_SPECIFIERS, ALL_VERSIONS
+
+OPERATORS = [
+    ("|", lambda a, b: a | b, lambda a, b: a or b),
+    ("&", lambda a, b: a & b, lambda a, b: a and b),
+    ("-", lambda a, b: a - b, lambda a, b: a and not b),
+    ("^", lambda a, b: a ^ b, lambda a, b: a != b),
+]
+
+
+def specifier_set(spec):
+    # Give ===foobar an explicit prerelease policy, since it can't determine
+    # one itself.
+    return PythonSpecifierSet(spec, True if spec == "===foobar" else None)
+
+
+def check(version_range, contains):
+    for version in ALL_VERSIONS:
+        assert version_range.contains(version) == contains(version), version
+
+
+class TestVersionRange:
+    def test_empty(self):
+        for version_range in (VersionRange(), VersionRange(">=2.0,<1.0")):
+            assert version_range.is_empty()
+            assert version_range.exact
+            assert version_range.to_specifier_sets() == []
+            check(version_range, lambda v: False)
+
+    def test_everything(self):
+        everything = VersionRange.everything()
+        assert not everything.is_empty()
+        assert everything == VersionRange("", prereleases=True)
+        assert everything != VersionRange("")
+        assert everything.to_specifier_sets() == [
+            PythonSpecifierSet("", prereleases=True)
+        ]
+        check(everything, lambda v: True)
+
+    @pytest.mark.parametrize("spec", ALL_SPECIFIERS)
+    def test_from_specifier_set(self, spec):
+        spec_set = specifier_set(spec)
+        check(VersionRange(spec_set), spec_set.contains)
+        check(VersionRange(spec, spec_set.prereleases), spec_set.contains)
+        for prereleases in (True, False):
+            check(VersionRange(spec_set, prereleases),
+                  lambda v: spec_set.contains(v, prereleases))
+        check(~VersionRange(spec_set), lambda v: not spec_set.contains(v))
+
+    def test_from_specifier(self):
+        spec = PythonSpecifier(">=1.0")
+        check(VersionRange(spec), spec.contains)
+        spec = PythonSpecifier(">=1.0", prereleases=True)
+        check(VersionRange(spec), spec.contains)
+
+    @pytest.mark.parametrize("left,right",
+                             itertools.combinations(ALL_SPECIFIERS, 2))
+    def test_combine(self, left, right):
+        a, b = specifier_set(left), specifier_set(right)
+        for _, combine, expected in OPERATORS:
+            result = combine(VersionRange(a), VersionRange(b))
+            check(result, lambda v: expected(a.contains(v), b.contains(v)))
+
+            # Whenever the result can be written as specifier sets, they
+            # should match the same versions.
+            if result.exact:
+                try:
+                    sets = result.to_specifier_sets()
+                except ValueError:
+                    continue
+                check(result, lambda v: any(s.contains(v) for s in sets))
+
+    def test_coerce(self):
+        version_range = VersionRange(">=1.0,<2.0") | ">=3.0"
+        assert version_range == ">=1.0,<2.0" | VersionRange(">=3.0")
+        assert version_range == (PythonSpecifierSet(">=3.0") |
+                                 VersionRange(">=1.0,<2.0"))
+        assert version_range - PythonSpecifier("==3.5") == VersionRange(
+            ">=1.0,<2.0"
+        ) | ">=3.0,!=3.5"
+        assert ">=1.0" & ~VersionRange(">=2.0") == "~=1.0"
+        with pytest.raises(TypeError):
+            version_range | 1
+        with pytest.raises(TypeError):
+            VersionRange(1)
+
+    def test_contains(self):
+        version_range = VersionRange(">=1.0,<2.0") | "~=3.1"
+        assert "1.5" in version_range
+        assert PythonVersion("3.2") in version_range
+        assert "2.0" not in version_range
+        assert "3.0" not in version_range
+        assert "3.2a1" not in version_range
+        assert list(version_range.filter(["0.9", "1.0", "2.5", "3.1"])) == [
+            "1.0", "3.1"
+        ]
+
+    def test_inexact(self):
+        version_range = VersionRange("==1.0.*") | VersionRange("===2.0")
+        assert not version_range.exact
+        assert "1.0.5" in version_range
+        assert "1a1" not in version_range
+        assert "2.0" in version_range
+        assert "2.0.0" not in version_range
+        with pytest.raises(ValueError):
+            version_range.to_specifier_sets()
+
+        assert (version_range - "===2.0").exact is False
+        assert not (version_range - "===2.0").is_empty()
+        assert (version_range & "===2.0") == VersionRange("===2.0")
+        assert (VersionRange("===2.0") - ">=2.0").is_empty()
+
+    def test_exact_and_inexact(self):
+        version_range = VersionRange(">=1.0,<2.0") | "==2.0c1.*"
+        assert "1.5" in version_range
+        assert not version_range.is_empty()
+        assert version_range != VersionRange()
+
+        version_range = VersionRange(">=1.0,<2.0") | "===2.5"
+        assert not version_range.exact
+        assert not version_range.is_empty()
+        assert version_range != VersionRange(">=1.0,<2.0")
+        assert not (version_range - ">=1.0,<2.0").is_empty()
+
+    @pytest.mark.parametrize("version_range,expected", [
+        (VersionRange(">=1.0,<2.0"), ["~=1.0"]),
+        (VersionRange(">=1.0") - "==1.5", ["!=1.5,>=1.0"]),
+        (VersionRange("<1.0") | ">=2.0", ["<1.0", ">=2.0"]),
+        (VersionRange("~=1.2") | ">=1.5,<3.0", ["<3.0,>=1.2"]),
+        (VersionRange("==1.*") | "==3.*", ["~=1.0", "~=3.0"]),
+        (VersionRange(">=1.0a1") | "==0.5", ["==0.5", ">=1.0a1"]),
+        (~VersionRange(">=1.0", prereleases=True), ["!=1.0,<=1.0"]),
+        (VersionRange("<1.0", prereleases=True) | ">=1.0", ["", "<1.0"]),
+    ])
+    def test_to_specifier_sets(self, version_range, expected):
+        sets = version_range.to_specifier_sets()
+        assert [str(i) for i in sets] == expected
+        union = VersionRange()
+        for spec_set in sets:
+            union = union | VersionRange(spec_set)
+        assert union == version_range
+
+    def test_to_specifier_sets_scaling(self, monkeypatch):
+        # Each group of intervals should only try the candidates built from
+        # its own bounds, so the work grows linearly with the groups.
+        calls = []
+        specifier = ranges._specifier
+        monkeypatch.setattr(ranges, "_specifier",
+                            lambda text: calls.append(text) or specifier(text))
+
+        for count in (10, 40):
+            del calls[:]
+            version_range = VersionRange()
+            expected = []
+            for i in range(1, count + 1):
+                version_range = version_range | ">={0}.0,<{0}.5".format(i)
+                expected.append("<{0}.5,>={0}.0".format(i))
+            assert [str(i) for i in version_range.to_specifier_sets()] == \
+                expected
+            assert len(calls) < 25 * count
+
+    def test_not_representable(self):
+        # Nothing can match only the pre-releases after 1.0.
+        with pytest.raises(ValueError):
+            (~VersionRange(">=1.0")).to_specifier_sets()
+        with pytest.raises(ValueError):
+            VersionRange("===1.0").to_specifier_sets()
+
+    def test_equal(self):
+        assert VersionRange(">=1.0,<2.0") == VersionRange("~=1.0")
+        assert VersionRange(">=1.0") | "<1.0" == VersionRange("")
+        assert VersionRange(">=1.0") != VersionRange(">1.0")
+        assert VersionRange(">=1.0") == ">=1.0"
+        assert VersionRange(">=1.0") != 1
@@ -0,0 +1,53 @@
+import itertools
+import sqlite3
+
+import pytest
+
+from verspec.python import PythonVersion
+from verspec.sortkey import encode_int, encode_str
+
+from .test_version import VERSIONS
+
+INTS = [0, 1, 2, 255, 256, 65535, 65536, 2 ** 64, 2 ** 2039, 2 ** 2040,
+        2 ** 5000]
+STRS = ["", "\0", "\0\0", "\0a", "\1", "a", "a\0", "a\0b", "a\1", "ab", "b",
+        "é", "\U0001f600"]
+
+
+def test_encode_int():
+    for a, b in itertools.product(INTS, repeat=2):
+        assert (encode_int(a) < encode_int(b)) == (a < b), (a, b)
+        assert (encode_int(a) == encode_int(b)) == (a == b), (a, b)
+
+    with pytest.raises(ValueError):
+        encode_int(-1)
+
+
+def test_encode_str():
+    for a, b in itertools.product(STRS, repeat=2):
+        assert (encode_str(a) < encode_str(b)) == (a < b), (a, b)
+        # Encodings must be prefix-free so they can be concatenated.
+        if a != b:
+            assert not encode_str(b).startswith(encode_str(a)), (a, b)
+
+
+def test_sqlite_range_scan():
+    db = sqlite3.connect(":memory:")
+    db.execute("CREATE TABLE versions (key BLOB, version TEXT)")
+    db.executemany("INSERT INTO versions VALUES (?, ?)", [
+        (PythonVersion(v).sort_key, v) for v in reversed(VERSIONS)
+    ])
+
+    ordered = [row[0] for row in db.execute(
+        "SELECT version FROM versions ORDER BY key"
+    )]
+    assert ordered == VERSIONS
+
+    low, high = PythonVersion("1.0").sort_key, PythonVersion("1.1").sort_key
+    scanned = [row[0] for row in db.execute(
+        "SELECT version FROM versions WHERE key >= ? AND key < ? "
+        "ORDER BY key", (low, high)
+    )]
+    assert scanned == [v for v in VERSIONS
+                       if PythonVersion("1.0") <= PythonVersion(v) <
+                       PythonVersion("1.1")]
@@ -1,11 +1,18 @@
+import gc
 import itertools
 import operator
+import pickle
 
 import pytest
 
 from verspec.basespecifier import InvalidSpecifier
-from verspec.python import PythonVersion, PythonSpecifier, PythonSpecifierSet
-from verspec.loose import LooseVersion, LooseSpecifier, LooseSpecifierSet
+from verspec import basespecifier, python
+from verspec.cache import ParseCache
+from verspec.python import (FrozenPythonSpecifier, FrozenPythonSpecifierSet,
+                            PythonVersion, PythonSpecifier,
+                            PythonSpecifierSet)
+from verspec.loose import (FrozenLooseSpecifier, FrozenLooseSpecifierSet,
+                           LooseVersion, LooseSpecifier, LooseSpecifierSet)
 
 from .test_version import VERSIONS, LOOSE_VERSIONS
 
@@ -32,6 +39,56 @@ SPECIFIERS = [
     "===1.2.3",
 ]
 
+# Prefix matching specifiers, including ones written in non-normalized forms,
+# and versions to check against them.
+PREFIX_SPECIFIERS = [
+    "==1.*", "==1.0.*", "==1.0.0.*", "==1.0.0.0.*", "==1.2.*", "==0.*",
+    "==1.0a1.*", "==1.0rc0.*", "==1a1.*", "==1.post1.*", "==1.0.post1.*",
+    "==1.0a1.post1.*", "==1!1.*", "==1!1.0.*", "==1!1.0a1.*", "==01.*",
+    "==1.00.*", "==1.0c1.*", "==1.0alpha1.*", "==1.0-1.*", "==v1.0.*",
+    "!=1.0.*", "~=1.0", "~=1.0.0", "~=1.2a1", "~=1!1.0", "~=1.0.post1",
+    "~=1.0-1", "~=1.0.0.dev1",
+]
+
+PREFIX_VERSIONS = [
+    epoch + release + suffix
+    for epoch in ["", "1!"]
+    for release in ["0", "1", "1.0", "1.0.0", "1.0.0.0", "1.0.1", "1.2",
+                    "1.2.0", "2"]
+    for suffix in ["", "a1", "b2", "rc0", ".post1", ".dev0", "a1.post1",
+                   "a1.dev0", ".post1.dev0", "a1.post1.dev0", "+local"]
+]
+
+# Specifiers in (and near) the forms recognized without the regex.
+SPLIT_SPECIFIERS = [
+    space1 + op + space2 + version + space1
+    for space1 in ["", " "]
+    for space2 in ["", " \t"]
+    for op in ["~=", "==", "!=", "<=", ">=", "<", ">", "===", "=", "<>", "~"]
+    for version in [
+        "1", "1.0", "1!1.0", "1.0a1", "1.0rc1.post2.dev3", "1.0+abc.5",
+        "1.0.dev0+abc", "1.*", "1.0.*", "1!1.0.*", "1.0.dev0.*", "1.0+abc.*",
+        "1.0a1.post1.*", "1.0.post1.*", "v1.0", "1.0RC1", "1.0-1",
+        "1.0 .post1", "", ".*", "1.*.*", "=1.0", "foo", "1.0\u00b2",
+    ]
+]
+
+
+def legacy_prefix_match(prefix, version):
+    # The original string-based implementation of prefix matching.
+    split = python._version_split(PythonVersion(version).public)
+    split = split[:len(prefix)]
+
+    def pad(left, right):
+        left_release = list(itertools.takewhile(str.isdigit, left))
+        right_release = list(itertools.takewhile(str.isdigit, right))
+        return (
+            left_release + ["0"] * (len(right_release) - len(left_release)) +
+            left[len(left_release):]
+        )
+
+    return pad(prefix, split) == pad(split, prefix)
+
 
 class TestPythonSpecifier:
     @pytest.mark.parametrize("specifier", SPECIFIERS)
@@ -226,6 +283,23 @@ class TestPythonSpecifier:
         assert (hash(PythonSpecifier(specifier)) ==
                 hash(PythonSpecifier(specifier)))
 
+    def test_specifiers_hash_cached(self, monkeypatch):
+        calls = []
+        canonicalize = python._canonicalize_version
+        monkeypatch.setattr(python, "_canonicalize_version",
+                            lambda v: calls.append(v) or canonicalize(v))
+
+        spec = PythonSpecifier("==2.8.0")
+        assert hash(spec) == hash(spec) == hash(PythonSpecifier("==2.8"))
+        assert spec == "==2.8" and spec == PythonSpecifier("==2.8")
+        assert calls.count("2.8.0") == 1
+
+        # The prerelease policy isn't part of a specifier's identity.
+        spec.prereleases = True
+        assert hash(spec) == hash(PythonSpecifier("==2.8"))
+        assert spec == PythonSpecifier("==2.8")
+        assert calls.count("2.8.0") == 1
+
     @pytest.mark.parametrize(
         ("left", "right", "op"),
         itertools.chain(
@@ -553,6 +627,76 @@ class TestPythonSpecifier:
     def test_specifier_explicit_loose(self):
         assert PythonSpecifier("==1.0").contains(LooseVersion("1.0"))
 
+    @pytest.mark.parametrize("specifier", SPECIFIERS)
+    def test_specifier_compiled_once(self, specifier):
+        spec = PythonSpecifier(specifier)
+        assert spec._matcher is None
+
+        spec.contains("2.0")
+        matcher = spec._matcher
+        assert matcher is not None
+
+        spec.contains("3.0")
+        assert spec._matcher is matcher
+
+    @pytest.mark.parametrize("specifier", ["~=1.2", "==1.*", "===1.5"])
+    def test_pickle(self, specifier):
+        for spec in (PythonSpecifier(specifier),
+                     FrozenPythonSpecifier(specifier, prereleases=True)):
+            expected = [spec.contains(i) for i in ["1.0", "1.5", "1.5a1"]]
+            for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                copy = pickle.loads(pickle.dumps(spec, protocol))
+                assert copy == spec
+                assert copy.prereleases == spec.prereleases
+                assert copy._matcher is None
+                assert [copy.contains(i) for i in ["1.0", "1.5", "1.5a1"]] == \
+                    expected
+
+    def test_split_release(self):
+        fast = 0
+        for specifier in SPLIT_SPECIFIERS:
+            match = PythonSpecifier._regex.search(specifier)
+            expected = match and (match.group("operator").strip(),
+                                  match.group("version").strip())
+            split = python._split_release_spec(specifier)
+            assert split is None or split == expected, specifier
+            fast += split is not None
+
+            if expected:
+                assert PythonSpecifier(specifier)._spec == expected
+            else:
+                with pytest.raises(InvalidSpecifier):
+                    PythonSpecifier(specifier)
+        assert fast > 0
+
+        assert python._split_release_spec(">=1.0") == (">=", "1.0")
+        assert python._split_release_spec("== 1.0.*") == ("==", "1.0.*")
+
+    @pytest.mark.parametrize("specifier", PREFIX_SPECIFIERS)
+    def test_specifier_prefix_match(self, specifier):
+        spec = PythonSpecifier(specifier)
+        operand = spec._parse_operand(spec.version)
+        for version in PREFIX_VERSIONS:
+            assert operand.match_prefix(PythonVersion(version)) == (
+                legacy_prefix_match(operand.prefix, version)
+            ), version
+
+    @pytest.mark.parametrize("specifier", [
+        s for s in PREFIX_SPECIFIERS if s.startswith("~=")
+    ] + ["~=1.0.1", "~=1.2", "~=1.0.0a1", "~=1.0a1", "~=1.0.0.post1",
+         "~=1.2.dev0", "~=0.0", "~=0.1", "~=1.0.0.0"])
+    def test_specifier_compatible_range(self, specifier):
+        spec = PythonSpecifier(specifier)
+        operand = spec._parse_operand(spec.version)
+        for version in PREFIX_VERSIONS:
+            expected = (
+                PythonVersion(PythonVersion(version).public) >=
+                operand.version and
+                legacy_prefix_match(operand.prefix, version)
+            )
+            assert spec.contains(version, prereleases=True) == expected, \
+                version
+
     @pytest.mark.parametrize(
         ("spec", "op"),
         [
@@ -739,6 +883,17 @@ class TestLooseSpecifier:
         spec.prereleases = None
         assert not spec.prereleases
 
+    def test_specifier_compiled_once(self):
+        spec = LooseSpecifier(">=1.0")
+        assert spec._matcher is None
+
+        assert spec.contains("2.0")
+        matcher = spec._matcher
+        assert matcher is not None
+
+        assert not spec.contains("0.1")
+        assert spec._matcher is matcher
+
 
 class TestPythonSpecifierSet:
     @pytest.mark.parametrize("version", VERSIONS)
@@ -826,6 +981,191 @@ class TestPythonSpecifierSet:
 
         assert list(spec.filter(input, **kwargs)) == expected
 
+    @pytest.mark.parametrize("prereleases", [None, True, False])
+    @pytest.mark.parametrize("specifier", [
+        ">=1.0,<2.0", ">=1.0.dev1,!=1.0.*", "~=1.0.0,!=1.0.1,===1.0.2",
+    ])
+    def test_specifier_filter_chained(self, specifier, prereleases):
+        spec = PythonSpecifierSet(specifier)
+        expected = VERSIONS
+        for s in spec:
+            expected = s.filter(expected, prereleases=bool(
+                prereleases if prereleases is not None else spec.prereleases
+            ))
+        assert list(spec.filter(VERSIONS, prereleases)) == list(expected)
+
+    def test_specifier_filter_parses_once(self, monkeypatch):
+        spec = PythonSpecifierSet(">=1.0,<3.0,!=1.5,!=1.0.3,!=2.*")
+        # The set is only compiled once it's reused.
+        spec.contains("1.0")
+        spec.contains("1.0")
+
+        cache = ParseCache(maxsize=0)
+        monkeypatch.setattr(PythonVersion, "parse_cache", cache)
+        items = ["1.0", "1.0.1", "1.0.2", "1.5", "2.0a1"]
+        assert list(spec.filter(items, prereleases=False)) == [
+            "1.0", "1.0.1", "1.0.2"
+        ]
+        assert cache.info().misses == len(items)
+
+    def test_specifier_prereleases_cached(self, monkeypatch):
+        cache = ParseCache(maxsize=0)
+        monkeypatch.setattr(PythonVersion, "parse_cache", cache)
+        spec = PythonSpecifierSet(">=1.0a1,<3.0,==2.*")
+        versions = [PythonVersion(i) for i in ["1.0", "2.0", "2.1a1"]]
+        assert spec.contains(versions[1])
+        assert spec.contains(versions[1])
+        misses = cache.info().misses
+
+        for i in range(3):
+            assert [spec.contains(v) for v in versions] == [
+                False, True, True
+            ]
+        assert cache.info().misses == misses
+
+        spec.prereleases = False
+        assert not spec.contains(versions[2])
+        spec.prereleases = None
+        assert spec.contains(versions[2])
+
+    def test_member_prereleases_changed(self):
+        spec = PythonSpecifierSet(">=1.0")
+        assert not spec.contains("1.1a1")
+        next(iter(spec)).prereleases = True
+        assert spec.prereleases
+        assert spec.contains("1.1a1")
+        assert list(spec.filter(["1.0", "1.1a1"])) == ["1.0", "1.1a1"]
+
+    def test_frozen_prereleases_cached(self):
+        spec = FrozenPythonSpecifierSet(">=1.0a1,<2.0")
+        assert spec.prereleases
+        assert spec._implied_prereleases is True
+
+    def test_intern(self):
+        spec = PythonSpecifierSet.intern(">=1.0,<2.0")
+        assert PythonSpecifierSet.intern(">=1.0,<2.0") is spec
+        assert spec == PythonSpecifierSet(">=1.0,<2.0")
+        assert not spec.prereleases
+        assert "1.5" in spec and "2.0" not in spec
+
+        prerelease_spec = PythonSpecifierSet.intern(">=1.0,<2.0", True)
+        assert prerelease_spec is not spec
+        assert prerelease_spec.prereleases
+        assert "1.5a1" in prerelease_spec
+
+        other = PythonSpecifierSet.intern("<2.0, !=1.5")
+        shared = {str(s): s for s in spec}
+        assert {str(s): s for s in other}["<2.0"] is shared["<2.0"]
+        assert PythonSpecifier.intern("<2.0") is shared["<2.0"]
+
+    def test_intern_immutable(self):
+        spec = PythonSpecifierSet.intern(">=1.0")
+        with pytest.raises(AttributeError):
+            spec.prereleases = True
+        with pytest.raises(AttributeError):
+            next(iter(spec)).prereleases = True
+        assert not spec.prereleases
+
+        combined = spec & PythonSpecifierSet("<2.0")
+        combined.prereleases = True
+        assert combined.prereleases
+
+    def test_intern_released(self):
+        key = (PythonSpecifierSet, ">=3.0,<4.0", None)
+        spec = PythonSpecifierSet.intern(">=3.0,<4.0")
+        assert basespecifier._intern_table[key] is spec
+        del spec
+        gc.collect()
+        assert key not in basespecifier._intern_table
+
+    def test_frozen(self):
+        spec = FrozenPythonSpecifierSet(">=1.0,<2.0", prereleases=True)
+        assert spec == PythonSpecifierSet(">=1.0,<2.0")
+        assert hash(spec) == hash(PythonSpecifierSet(">=1.0,<2.0"))
+        assert all(isinstance(s, FrozenPythonSpecifier) for s in spec)
+        assert "1.5a1" in spec
+
+        with pytest.raises(AttributeError):
+            spec.prereleases = False
+        with pytest.raises(AttributeError):
+            next(iter(spec)).prereleases = False
+        assert spec.prereleases
+
+        with pytest.raises(AttributeError):
+            FrozenPythonSpecifier(">=1.0").prereleases = True
+
+    def test_frozen_combine(self):
+        frozen = FrozenPythonSpecifierSet(">=1.0")
+        plain = PythonSpecifierSet("<2.0", prereleases=True)
+
+        result = frozen & plain
+        assert type(result) is FrozenPythonSpecifierSet
+        assert result == PythonSpecifierSet(">=1.0,<2.0")
+        assert result.prereleases
+        with pytest.raises(AttributeError):
+            result.prereleases = False
+
+        result = plain & frozen
+        assert type(result) is PythonSpecifierSet
+        assert result == PythonSpecifierSet(">=1.0,<2.0")
+
+    def test_frozen_combine_copies_members(self):
+        frozen = FrozenPythonSpecifierSet(">=1.0")
+        intersected = FrozenPythonSpecifierSet.intersect_all(
+            [">=1.0", PythonSpecifierSet("<2.0")]
+        )
+        for result in (frozen & PythonSpecifierSet("<2.0"), intersected):
+            assert all(isinstance(s, FrozenPythonSpecifier) for s in result)
+            assert not result.contains("1.5a1")
+
+        plain = PythonSpecifierSet("<2.0")
+        result = frozen & plain
+        assert not result.contains("1.5a1")
+        next(iter(plain)).prereleases = True
+        assert not result.prereleases
+        assert not result.contains("1.5a1")
+
+        # Explicit policies of the copied members are kept.
+        result = frozen & plain
+        assert result.prereleases
+        assert result.contains("1.5a1")
+        next(iter(plain)).prereleases = False
+        assert result.contains("1.5a1")
+
+    @pytest.mark.parametrize("specifier", [">=1.0,===1.5", "==1.*,!=1.5.*"])
+    def test_pickle(self, specifier):
+        for spec in (PythonSpecifierSet(specifier),
+                     FrozenPythonSpecifierSet(specifier)):
+            expected = [spec.contains(i) for i in ["1.0", "1.5", "1.5.1"]]
+            for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                copy = pickle.loads(pickle.dumps(spec, protocol))
+                assert copy == spec
+                assert copy._compiled is None
+                assert [copy.contains(i) for i in ["1.0", "1.5", "1.5.1"]] == \
+                    expected
+
+    def test_frozen_contains_cached(self, monkeypatch):
+        cache = ParseCache(maxsize=0)
+        monkeypatch.setattr(PythonVersion, "parse_cache", cache)
+        spec = FrozenPythonSpecifierSet(">=1.0,<2.0,!=1.5.*")
+        items = ["1.0", "1.5.1", "1.6a1", "2.0"]
+        assert [spec.contains(i) for i in items] == [
+            True, False, False, False
+        ]
+        misses = cache.info().misses
+
+        for i in range(3):
+            assert [spec.contains(i) for i in items] == [
+                True, False, False, False
+            ]
+            assert spec.contains("1.6a1", prereleases=True)
+        assert cache.info().misses == misses + 1
+
+        spec = FrozenPythonSpecifier("===1.0")
+        assert spec.contains("1.0")
+        assert not spec.contains("1.0.0")
+        assert not spec.contains(PythonVersion("1.0.0"))
+
     @pytest.mark.parametrize(
         ("specifier", "expected"),
         [
@@ -907,6 +1247,209 @@ class TestPythonSpecifierSet:
         with pytest.raises(TypeError):
             PythonSpecifierSet() & 12
 
+    @pytest.mark.parametrize(
+        ("specifier", "expected"),
+        [
+            ("", ""),
+            (">=1.0", ">=1.0"),
+            (">=1.0,>=1.2,<3,<2.5,!=0.9", ">=1.2,<2.5"),
+            (">=1.0,<2.0,!=2.1,!=1.5", ">=1.0,<2.0,!=1.5"),
+            ("==1.2,>=1.0,!=1.3", "==1.2"),
+            ("~=1.2,>=1.0,<2", "~=1.2"),
+            (">1.0,>=1.0", ">1.0"),
+            # Dropping >=1.0a1 would change the prerelease policy.
+            (">=1.0a1,>=1.2", ">=1.0a1,>=1.2"),
+            # Inexact specifiers are never dropped, but can still make others
+            # redundant.
+            ("~=1.2.0,>=1.0", "~=1.2.0"),
+            ("===1.0,>=1.0", "===1.0"),
+            # Arbitrary equality never implies a prerelease policy, even when
+            # its version is invalid.
+            (">=1.0a1,===foobar", ">=1.0a1,===foobar"),
+            (">=1.0,>=1.2,===foobar", "===foobar"),
+        ],
+    )
+    def test_simplify(self, specifier, expected):
+        spec = PythonSpecifierSet(specifier)
+        assert spec.simplify() == PythonSpecifierSet(expected)
+
+    @pytest.mark.parametrize(
+        ("specifier", "expected"),
+        [
+            ("", True),
+            (">=1.0,<=1.0", True),
+            (">1.0,<1.0.0.1", True),
+            (">=1.0,!=1.0.*", True),
+            ("==1.0.*,>1.0", True),
+            ("===1.0,>=1.0", True),
+            (">=1!0", True),
+            (">=1.0,<1.0", False),
+            (">=1.0,<=1.0,!=1.0", False),
+            (">1.0,<=1.0", False),
+            (">1.0,<1.0.post1", False),
+            ("~=1.0,<1.0", False),
+            ("===1.0,>1.0", False),
+            ("==1.0+abc,!=1.0+abc", False),
+            ("==1.2.*,!=1.2.*", False),
+            ("<0.dev0", False),
+        ],
+    )
+    def test_satisfiable(self, specifier, expected):
+        spec = PythonSpecifierSet(specifier)
+        assert spec.is_satisfiable() == expected
+        assert spec.is_empty() == (not expected)
+
+    def test_satisfiable_empty_intervals(self):
+        def predicate(version):
+            raise AssertionError("no candidates should be checked")
+
+        spec = PythonSpecifierSet(",".join(
+            [">=1.0", "<0.5"] + ["!=1.{}.0.*".format(i) for i in range(80)]
+        ))
+        assert not spec.is_satisfiable()
+        assert not python._any_version(spec._matched_intervals(True),
+                                       spec._get_compiled()[1], True,
+                                       predicate)
+
+    @pytest.mark.parametrize(
+        ("specifier", "prereleases", "expected"),
+        [
+            (">=1.0a1,<1.0", None, False),
+            (">=1.0.dev0,<1.0", None, False),
+            (">=0.9.dev0,<1.0", None, True),
+            ("==1.0a1", None, True),
+            ("==1.0a1", False, False),
+            (">=1.0,<1.0.1", None, True),
+            (">1.0,<1.0.0.1", False, True),
+            (">0.9,<1.0", False, True),
+            (">0.9,<1.0", True, True),
+            (">=1.0.dev0,<1.0", False, False),
+        ],
+    )
+    def test_satisfiable_prereleases(self, specifier, prereleases, expected):
+        spec = PythonSpecifierSet(specifier)
+        assert spec.is_satisfiable(prereleases) == expected
+
+    @pytest.mark.parametrize(
+        ("left", "right", "subset", "overlaps"),
+        [
+            ("", "", True, True),
+            (">=1.2", ">=1.0", True, True),
+            (">=1.0", ">=1.2", False, True),
+            (">=1.0,<2.0", ">=0.9,!=2.5", True, True),
+            (">=1.0,<2.0", ">=0.9,!=1.5", False, True),
+            ("~=1.2", ">=1.0,<2", True, True),
+            ("==1.2.*", ">=1.2,<1.3", True, True),
+            ("==1.2.*", ">=1.2.dev0,<1.3", True, True),
+            ("==1.2.3", "==1.2.*", True, True),
+            ("==1.2.3+abc", "==1.2.3", True, True),
+            ("==1.2.3", "==1.2.3+abc", False, True),
+            (">1.0,<1.0.0.1", ">=1.0.0.0.0.1,<2", False, True),
+            (">1.0,<1.0.0.1", ">1.0,<1.1", True, True),
+            ("<1.0", ">=1.0", False, False),
+            ("<1.0", ">0.9,<=1.0,!=0.9.*", False, True),
+            ("===1.0", "==1.0", True, True),
+            ("===1.0", ">1.0", False, False),
+            ("==1.0.*", ">1.0", False, True),
+            (">=1.0,<1.0", ">=2.0", True, False),
+            (">=1.0", "", True, True),
+            ("", ">=1.0", False, True),
+        ],
+    )
+    def test_subset(self, left, right, subset, overlaps):
+        left_set = PythonSpecifierSet(left)
+        right_set = PythonSpecifierSet(right)
+        assert left_set.issubset(right_set) == subset
+        assert left_set.issubset(right) == subset
+        assert right_set.issuperset(left_set) == subset
+        assert left_set.overlaps(right_set) == overlaps
+        assert right_set.overlaps(left_set) == overlaps
+
+    def test_subset_prereleases(self):
+        spec = PythonSpecifierSet(">=1.0a1")
+        assert not spec.issubset(">=0.9")
+        assert spec.issubset(">=0.9", prereleases=False)
+        assert spec.issubset(PythonSpecifierSet(">=0.9", prereleases=True))
+        assert not spec.overlaps("<1.0rc1")
+        assert spec.overlaps("<1.0rc1", prereleases=True)
+        assert not spec.overlaps("<1.0", prereleases=True)
+
+        spec = PythonSpecifierSet("==1.2.*", prereleases=True)
+        assert not spec.issubset(">=1.2,<1.3", prereleases=True)
+        assert spec.issubset(">=1.2.dev0,<1.3", prereleases=True)
+
+    def test_subset_types(self):
+        spec = PythonSpecifierSet(">=1.0")
+        assert spec.issubset(FrozenPythonSpecifierSet(">=0.9"))
+        assert spec.issubset(PythonSpecifier(">=0.9"))
+        with pytest.raises(TypeError):
+            spec.issubset(LooseSpecifierSet(">=0.9"))
+
+    def test_simplify_prereleases(self):
+        spec = PythonSpecifierSet(">=1.0a1,>=1.2", prereleases=False)
+        result = spec.simplify()
+        assert result == PythonSpecifierSet(">=1.2")
+        assert result.prereleases is False
+
+        result = FrozenPythonSpecifierSet(">=1.0,>=1.2").simplify()
+        assert type(result) is FrozenPythonSpecifierSet
+        assert result == PythonSpecifierSet(">=1.2")
+
+    def test_simplify_many(self):
+        kept = [">=1.0", "<300.0"]
+        kept.extend("!={}.5".format(i) for i in range(1, 300))
+        dropped = [">=0.{}".format(i) for i in range(1, 100)]
+        dropped.extend("<{}.0".format(i) for i in range(301, 400))
+        dropped.extend("!=0.{}".format(i) for i in range(1, 100))
+        spec = PythonSpecifierSet(",".join(kept + dropped))
+        assert spec.simplify() == PythonSpecifierSet(",".join(kept))
+
+    @pytest.mark.parametrize(
+        ("specifiers", "expected"),
+        [
+            ([], ""),
+            ([">=1.0"], ">=1.0"),
+            ([">=1.0", "<2.0", ">=1.0"], ">=1.0,<2.0"),
+            ([">=1.0,!=1.5", "<2.0,!=1.5.0", ""], ">=1.0,!=1.5,<2.0"),
+            (["==1.0", "==1.0.0", "!=1.1"], "==1.0,!=1.1"),
+        ],
+    )
+    def test_intersect_all(self, specifiers, expected):
+        result = PythonSpecifierSet.intersect_all(specifiers)
+        assert type(result) is PythonSpecifierSet
+        assert result == PythonSpecifierSet(expected)
+        assert len(result) == len(PythonSpecifierSet(expected))
+
+        sets = [PythonSpecifierSet(i) for i in specifiers]
+        assert PythonSpecifierSet.intersect_all(sets) == result
+
+    def test_intersect_all_prereleases(self):
+        sets = [PythonSpecifierSet(">=1.0"),
+                PythonSpecifierSet("<2.0", prereleases=True),
+                PythonSpecifierSet("!=1.5", prereleases=True)]
+        result = PythonSpecifierSet.intersect_all(sets)
+        assert result.prereleases
+        assert result._prereleases is True
+
+        result = PythonSpecifierSet.intersect_all(sets[:1])
+        assert result._prereleases is None
+
+        sets.append(PythonSpecifierSet("!=1.6", prereleases=False))
+        with pytest.raises(ValueError):
+            PythonSpecifierSet.intersect_all(sets)
+
+    def test_intersect_all_types(self):
+        result = FrozenPythonSpecifierSet.intersect_all(
+            [PythonSpecifierSet(">=1.0"), "<2.0"]
+        )
+        assert type(result) is FrozenPythonSpecifierSet
+        assert result == PythonSpecifierSet(">=1.0,<2.0")
+
+        with pytest.raises(TypeError):
+            PythonSpecifierSet.intersect_all([LooseSpecifierSet(">=1.0")])
+        with pytest.raises(TypeError):
+            PythonSpecifierSet.intersect_all([12])
+
     @pytest.mark.parametrize(
         ("left", "right", "op"),
         itertools.chain(
@@ -1054,6 +1597,52 @@ class TestLooseSpecifierSet:
         with pytest.raises(TypeError):
             PythonSpecifierSet() & 12
 
+    def test_intersect_all(self):
+        result = LooseSpecifierSet.intersect_all([">=1.0", "<2.0", ">=1.0"])
+        assert result == LooseSpecifierSet(">=1.0,<2.0")
+        assert len(result) == 2
+        with pytest.raises(TypeError):
+            LooseSpecifierSet.intersect_all([PythonSpecifierSet(">=1.0")])
+
+    def test_simplify(self):
+        spec = LooseSpecifierSet(">=1.0,>=1.2,<3,!=0.9,!=1.5")
+        assert spec.simplify() == LooseSpecifierSet(">=1.2,<3,!=1.5")
+
+    @pytest.mark.parametrize(
+        ("left", "right", "subset", "overlaps"),
+        [
+            (">=1.2", ">=1.0", True, True),
+            (">=1.0", ">=1.2", False, True),
+            (">=1.0,<2.0", ">=0.9,!=2.5", True, True),
+            (">=1.0,<2.0", ">=0.9,!=1.5", False, True),
+            ("<1.0", ">=1.0", False, False),
+            ("==1.0", "<=1.0,>=1.0", True, True),
+        ],
+    )
+    def test_subset(self, left, right, subset, overlaps):
+        left_set = LooseSpecifierSet(left)
+        assert left_set.issubset(right) == subset
+        assert LooseSpecifierSet(right).issuperset(left_set) == subset
+        assert left_set.overlaps(right) == overlaps
+
+    def test_satisfiable(self):
+        assert LooseSpecifierSet(">=1.0,<2.0").is_satisfiable()
+        assert LooseSpecifierSet(">=1.0,<1.0").is_empty()
+
+    def test_frozen(self):
+        spec = FrozenLooseSpecifierSet(">=1.0,<2.0")
+        assert spec == LooseSpecifierSet(">=1.0,<2.0")
+        assert all(isinstance(s, FrozenLooseSpecifier) for s in spec)
+        assert type(spec & "!=1.5") is FrozenLooseSpecifierSet
+        with pytest.raises(TypeError):
+            spec & FrozenPythonSpecifierSet(">=1.0")
+
+        for i in range(3):
+            assert spec.contains("1.5")
+            assert not spec.contains("2.0")
+        with pytest.raises(AttributeError):
+            spec.prereleases = True
+
     @pytest.mark.parametrize(
         ("left", "right", "op"),
         itertools.chain(
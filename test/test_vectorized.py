@@ -0,0 +1,115 @@
+import pytest
+
+from verspec import vectorized
+from verspec.python import PythonSpecifier, PythonSpecifierSet, PythonVersion
+from verspec.vectorized import VersionArray
+
+from .test_index import PRERELEASE_VERSIONS, PYTHON_VERSIONS, SPECIFIER_SETS
+from .test_intervals import ALL_SPECIFIERS
+
+LOCAL_VERSIONS = ["1.0+abc", "1.0+abc.1", "1.0+abd", "1.0+1", "1.0+1.2",
+                  "1.0", "1.0.post1+abc", "2.0+abc"]
+
+
+@pytest.fixture(params=[False, True], ids=["python", "numpy"])
+def use_numpy(request):
+    if request.param and not vectorized.have_numpy():
+        pytest.skip("numpy not installed")
+    return request.param
+
+
+def check_contains(spec, versions, use_numpy, prereleases=None):
+    array = VersionArray(versions, use_numpy=use_numpy)
+    assert list(array.contains(spec, prereleases)) == [
+        spec.contains(v, prereleases=prereleases) for v in versions
+    ]
+
+
+def check_filter(spec, versions, use_numpy, prereleases=None):
+    array = VersionArray(versions, use_numpy=use_numpy)
+    assert array.filter(spec, prereleases) == list(
+        spec.filter(versions, prereleases=prereleases)
+    )
+
+
+@pytest.mark.parametrize("prereleases", [True, False])
+@pytest.mark.parametrize("specifier", ALL_SPECIFIERS + [
+    "==1.0+abc", "==1.0+abc.1", "!=1.0+1", "!=1.0+abd",
+])
+def test_specifier(specifier, prereleases, use_numpy):
+    spec = PythonSpecifier(specifier)
+    for versions in (PYTHON_VERSIONS, PRERELEASE_VERSIONS, LOCAL_VERSIONS):
+        check_contains(spec, versions, use_numpy, prereleases)
+        check_filter(spec, versions, use_numpy, prereleases)
+
+
+@pytest.mark.parametrize("specifier", ["<=2.0", "==1.0a1", ">=1.0.dev0"])
+def test_specifier_prerelease_policy(specifier, use_numpy):
+    spec = PythonSpecifier(specifier)
+    for versions in (PYTHON_VERSIONS, PRERELEASE_VERSIONS):
+        check_contains(spec, versions, use_numpy)
+        check_filter(spec, versions, use_numpy)
+
+
+@pytest.mark.parametrize("prereleases", [None, True, False])
+@pytest.mark.parametrize("specifier", SPECIFIER_SETS)
+def test_specifier_set(specifier, prereleases, use_numpy):
+    spec = PythonSpecifierSet(specifier)
+    for versions in (PYTHON_VERSIONS, PRERELEASE_VERSIONS):
+        check_contains(spec, versions, use_numpy, prereleases)
+        check_filter(spec, versions, use_numpy, prereleases)
+
+
+@pytest.mark.parametrize("other", ["1.0", "1.0+abc", "1.0+abc.0", "1!1.0",
+                                   "1.0.0.0.0.0.0.1", "0.9a1.dev0"])
+def test_compare(other, use_numpy):
+    versions = PYTHON_VERSIONS + LOCAL_VERSIONS
+    array = VersionArray(versions, use_numpy=use_numpy)
+    other_version = PythonVersion(other)
+    assert list(array.compare(other)) == [
+        (PythonVersion(v) > other_version) - (PythonVersion(v) < other_version)
+        for v in versions
+    ]
+
+
+def test_long_release(use_numpy):
+    array = VersionArray(["1.0", "1.0.0.0.1", "1.1"], use_numpy=use_numpy)
+    spec = PythonSpecifier(">1.0.0.0.0.0.1")
+    assert list(array.contains(spec)) == [False, True, True]
+
+
+def test_huge_numbers(use_numpy):
+    versions = ["1.0", "1.{}".format(2 ** 70), "2.0"]
+    array = VersionArray(versions, use_numpy=use_numpy)
+    assert array.keys is None
+    assert array.filter(PythonSpecifier(">1.0")) == versions[1:]
+
+    array = VersionArray(["1.0", "2.0"], use_numpy=use_numpy)
+    huge = "1.{}".format(2 ** 70)
+    assert array.filter(PythonSpecifier("<" + huge)) == ["1.0"]
+    assert list(array.compare(huge)) == [-1, 1]
+
+
+def test_empty(use_numpy):
+    array = VersionArray([], use_numpy=use_numpy)
+    assert len(array) == 0
+    assert list(array.contains(PythonSpecifierSet(">=1.0"))) == []
+    assert array.filter(PythonSpecifierSet(">=1.0")) == []
+
+
+def test_numpy_keys():
+    pytest.importorskip("numpy")
+    array = VersionArray(["1.0", "1.2.3a1", "1!2.0.post1+abc"])
+    assert array.keys.tolist() == [
+        [0, 0, 1, 0, 0, vectorized._HI, 0, -1, vectorized._HI, -1],
+        [4, 0, 1, 2, 3, 0, 1, -1, vectorized._HI, -1],
+        [3, 1, 2, 0, 0, vectorized._HI, 0, 1, vectorized._HI, 0],
+    ]
+
+
+def test_numpy_unavailable(monkeypatch):
+    monkeypatch.setattr(vectorized, "numpy", None)
+    assert not vectorized.have_numpy()
+    assert VersionArray(["1.0"]).keys is None
+    with pytest.raises(ImportError):
+        VersionArray(["1.0"], use_numpy=True)
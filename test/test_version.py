@@ -1,9 +1,11 @@
 import itertools
 import operator
+import pickle
 
 import pretend  # type: ignore
 import pytest
 
+from verspec import python
 from verspec.python import PythonVersion, InvalidVersion, _canonicalize_version
 from verspec.loose import LooseVersion
 
@@ -296,6 +298,14 @@ class TestPythonVersion:
     def test_version_hash(self, version):
         assert hash(PythonVersion(version)) == hash(PythonVersion(version))
 
+    @pytest.mark.parametrize("version", VERSIONS)
+    def test_version_pickle(self, version):
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            copy = pickle.loads(pickle.dumps(PythonVersion(version), protocol))
+            assert type(copy) is PythonVersion
+            assert copy == PythonVersion(version)
+            assert str(copy) == str(PythonVersion(version))
+
     @pytest.mark.parametrize(
         ("version", "public"),
         [
@@ -758,6 +768,70 @@ class TestPythonVersion:
         assert PythonVersion("2.1").micro == 0
         assert PythonVersion("2").micro == 0
 
+    def test_sort_key(self):
+        versions = [PythonVersion(v) for v in VERSIONS + [
+            "1.0.0", "1!0", "1.0+abc.5", "1.0+abc.a", "1.0+5.abc",
+            "1.0+abc.5.0", "1.{}".format(2 ** 3000),
+        ]]
+        for a, b in itertools.product(versions, repeat=2):
+            assert (a.sort_key < b.sort_key) == (a < b), (a, b)
+            assert (a.sort_key == b.sort_key) == (a == b), (a, b)
+
+        assert sorted(versions, key=lambda v: v.sort_key) == sorted(versions)
+
+    @pytest.mark.parametrize("version", VERSIONS)
+    def test_public_key(self, version):
+        v = PythonVersion(version)
+        assert v.public_key == PythonVersion(v.public)._key
+        assert v.public_key is v.public_key
+        if v.local is None:
+            assert v.public_key is v._key
+
+    @pytest.mark.parametrize("version", VERSIONS)
+    def test_base_key(self, version):
+        v = PythonVersion(version)
+        assert v.base_key == PythonVersion(v.base_version).base_key
+        assert v.base_key == PythonVersion(v.base_version)._key[:2]
+
+
+# Versions in (and near) their normalized forms, for checking that the fast
+# parser agrees with the regex.
+PARSE_VERSIONS = [
+    epoch + release + pre + post + dev + local
+    for epoch in ["", "1!", "01!", "!", "a!"]
+    for release in ["0", "01.2", "1.2.3.4", "1..2"]
+    for pre in ["", "a1", "b0", "rc12", "a01", "c1", "a", "rc", "alpha1",
+                "-a1", ".b2", "RC1", "pre"]
+    for post in ["", ".post1", ".post0", ".post", "-1", "post2", ".r3",
+                 ".POST1", ".post1a"]
+    for dev in ["", ".dev0", ".dev10", ".dev", "dev1", ".DEV2", "-dev3"]
+    for local in ["", "+abc.5", "+1.2.x0", "+ABC", "+a-b", "+", "+abc..1",
+                  "+a+b"]
+] + ["", " 1.0 ", "v1.0", "1.", "1.0+.a", "1.0+a!b", "1.0+a_b.1", "1!",
+     "1!2!3", "1.0a1.dev0.post1", "1.0\n", "\u0661.0", "1.0\u00b2",
+     "1.0+\u212a", "1.0+abc\u0131", "1.dev0", "dev0", "post1",
+     "1.0.dev0.dev1", "1.0.post1.post2"]
+
+
+def test_parse_normalized():
+    fast = 0
+    for version in PARSE_VERSIONS:
+        try:
+            expected = python._match_version(version)
+        except InvalidVersion:
+            expected = None
+        parsed = python._parse_normalized(version)
+        assert parsed is None or parsed == expected, version
+        fast += parsed is not None
+
+        # The normalized form of any (ASCII) version should take the fast
+        # path.
+        if expected is not None and version.isascii():
+            normalized = str(PythonVersion(version))
+            assert python._parse_normalized(normalized) == expected, version
+
+    assert fast > 0
+
 
 LOOSE_VERSIONS = ["foobar", "a cat is fine too", "lolwut", "1-0", "2.0-a1"]
 LOOSE_CMP_VERSIONS = [
@@ -798,6 +872,13 @@ class TestLooseVersion:
     def test_loose_version_hash(self, version):
         assert hash(LooseVersion(version)) == hash(LooseVersion(version))
 
+    @pytest.mark.parametrize("version", VERSIONS + LOOSE_VERSIONS)
+    def test_loose_version_pickle(self, version):
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            copy = pickle.loads(pickle.dumps(LooseVersion(version), protocol))
+            assert type(copy) is LooseVersion
+            assert str(copy) == version
+
     @pytest.mark.parametrize("version", VERSIONS + LOOSE_VERSIONS)
     def test_loose_version_public(self, version):
         assert LooseVersion(version).public == version
@@ -944,3 +1025,10 @@ class TestLooseVersion:
     def test_compare_with_pythonversion(self, op):
         method = getattr(LooseVersion, "__{0}__".format(op))
         assert method(LooseVersion("0"), PythonVersion("1")) is NotImplemented
+
+    def test_sort_key(self):
+        versions = [LooseVersion(v) for v in
+                    LOOSE_CMP_VERSIONS + LOOSE_VERSIONS + ["a\0b", "a", "a\1"]]
+        for a, b in itertools.product(versions, repeat=2):
+            assert (a.sort_key < b.sort_key) == (a < b), (a, b)
+            assert (a.sort_key == b.sort_key) == (a == b), (a, b)
@@ -1,11 +1,22 @@
 import abc
-from typing import (Callable, Dict, Iterable, Iterator, Optional, Pattern, Set,
-                    Tuple, Union)
+import threading
+import weakref
+from typing import (Any, Callable, Dict, Hashable, Iterable, Iterator,
+                    Optional, Pattern, Set, Tuple, Type, TypeVar, Union)
 
 from .baseversion import BaseVersion, UnparsedVersion
+from .intervals import Intervals, _Exclusions
 
 
-CallableOperator = Callable[[BaseVersion, str], bool]
+CallableOperator = Callable[[BaseVersion, Any], bool]
+Matcher = Callable[[BaseVersion], bool]
+
+# The most results of `contains` that a frozen Specifier remembers.
+_RESULTS_SIZE = 1024
+
+_S = TypeVar("_S", bound="BaseSpecifier")
+_SS = TypeVar("_SS", bound="BaseSpecifierSet")
+_I = TypeVar("_I", bound="IndividualSpecifier")
 
 
 class InvalidSpecifier(ValueError):
@@ -15,6 +26,32 @@ class InvalidSpecifier(ValueError):
 
 
 class BaseSpecifier(metaclass=abc.ABCMeta):
+    # Whether this Specifier is frozen, i.e. its prerelease policy can't be
+    # changed. This is set for the Frozen* subclasses and for shared
+    # instances created by `intern`.
+    _frozen = False
+
+    # The cached results of `contains` for frozen Specifiers, created the
+    # first time they're needed.
+    _results: Optional[Dict[Tuple[str, Optional[bool]], bool]] = None
+
+    # The attributes which are only caches, and so are left out when pickling
+    # and recreated the first time they're needed afterwards. Some of these
+    # hold closures, which can't be pickled, and others depend on the hash
+    # seed of the current process.
+    _cached_attrs: Tuple[str, ...] = ("_results",)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        for name in self._cached_attrs:
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        for name in self._cached_attrs:
+            setattr(self, name, None)
+
     @abc.abstractmethod
     def __str__(self) -> str:
         """
@@ -56,12 +93,40 @@ class BaseSpecifier(metaclass=abc.ABCMeta):
         specifier.
         """
 
-    @abc.abstractmethod
     def contains(self, item: UnparsedVersion,
                  prereleases: Optional[bool] = None) -> bool:
         """
         Determines if the given item is contained within this specifier.
         """
+        # Nothing about a frozen Specifier can change, so remember the results
+        # for version strings to avoid parsing them again. (Version objects
+        # aren't cached, since different strings can parse to equal versions,
+        # and some operators, like ===, tell them apart.)
+        if not self._frozen or not isinstance(item, str):
+            return self._contains(item, prereleases)
+
+        key = (item, prereleases)
+        results = self._results
+        if results is None:
+            results = self._results = {}
+        else:
+            try:
+                return results[key]
+            except KeyError:
+                pass
+
+        result = self._contains(item, prereleases)
+        # Dict operations are atomic, so this is safe to do without a lock;
+        # at worst, a concurrent thread's result is forgotten.
+        if len(results) >= _RESULTS_SIZE:
+            results.clear()
+        results[key] = result
+        return result
+
+    @abc.abstractmethod
+    def _contains(self, item: UnparsedVersion,
+                  prereleases: Optional[bool]) -> bool:
+        pass
 
     @abc.abstractmethod
     def filter(
@@ -77,31 +142,116 @@ class BaseSpecifier(metaclass=abc.ABCMeta):
 class IndividualSpecifier(BaseSpecifier, metaclass=abc.ABCMeta):
     _operators: Dict[str, str] = {}
     _regex: Optional[Pattern] = None
+    _cached_attrs = ("_results", "_matcher", "_intervals", "_hash")
 
     def __init__(self, spec: str = "",
                  prereleases: Optional[bool] = None) -> None:
+        self._spec: Tuple[str, str] = self._split_spec(spec)
+
+        # Store whether or not this Specifier should accept prereleases
+        self._prereleases = prereleases
+
+        # The prerelease policy implied by our operator and version, used when
+        # no explicit policy is set; this is created the first time it's
+        # needed.
+        self._implied_prereleases: Optional[bool] = None
+
+        # The compiled matcher and intervals for this Specifier; these are
+        # created the first time they're needed.
+        self._matcher: Optional[Matcher] = None
+        self._intervals: Optional[Tuple[Intervals, bool]] = None
+
+        # The canonical form of this Specifier and its hash, created the first
+        # time they're needed. These only depend on the operator and version,
+        # which never change; in particular, they don't depend on our
+        # prerelease policy, so setting `prereleases` leaves them alone.
+        self._canonical: Optional[Tuple[str, UnparsedVersion]] = None
+        self._hash: Optional[int] = None
+
+    def _split_spec(self, spec: str) -> Tuple[str, str]:
+        """
+        Splits the specifier string into its operator and version, raising
+        InvalidSpecifier if it's invalid.
+        """
         assert self._regex is not None
         match = self._regex.search(spec)
         if not match:
             raise InvalidSpecifier("Invalid specifier: '{0}'".format(spec))
 
-        self._spec: Tuple[str, str] = (
+        return (
             match.group("operator").strip(),
             match.group("version").strip(),
         )
 
-        # Store whether or not this Specifier should accept prereleases
-        self._prereleases = prereleases
-
     @abc.abstractmethod
     def _coerce_version(self, version: UnparsedVersion) -> BaseVersion:
         pass
 
+    def _parse_operand(self, version: str) -> Any:
+        """
+        Converts the version string of this Specifier into the form expected
+        by its comparison operators. This is only called once per Specifier,
+        so subclasses can do any expensive preprocessing here.
+        """
+        return version
+
+    def _imply_prereleases(self) -> Optional[bool]:
+        """
+        Returns whether this Specifier allows pre-releases when no explicit
+        policy is set. This is only called once per Specifier.
+        """
+        return None
+
+    def _compile(self) -> Matcher:
+        """
+        Returns a callable which determines whether a (parsed) version
+        satisfies the operator and version of this Specifier.
+        """
+        operator_callable = self._get_operator(self.operator)
+        operand = self._parse_operand(self.version)
+
+        def matcher(prospective: BaseVersion) -> bool:
+            return operator_callable(prospective, operand)
+
+        return matcher
+
+    def _match(self, prospective: BaseVersion) -> bool:
+        if self._matcher is None:
+            self._matcher = self._compile()
+        return self._matcher(prospective)
+
+    def _compile_intervals(self) -> Tuple[Intervals, bool]:
+        """
+        Returns the set of points (see `BaseVersion._point`) matched by this
+        Specifier, ignoring its prerelease policy, and whether that set is
+        exact. If it isn't, the set is a superset of the matching points, and
+        any point inside it must also be checked with the compiled matcher.
+        """
+        interval_callable = getattr(
+            self, "_intervals_{0}".format(self._operators[self.operator]), None
+        )
+        if interval_callable is None:
+            return Intervals.everything(), False
+        result: Tuple[Intervals, bool] = interval_callable(
+            self._parse_operand(self.version)
+        )
+        return result
+
+    def _get_intervals(self) -> Tuple[Intervals, bool]:
+        if self._intervals is None:
+            self._intervals = self._compile_intervals()
+        return self._intervals
+
     @property
     @abc.abstractmethod
     def _canonical_spec(self) -> Tuple[str, UnparsedVersion]:
         pass
 
+    def _get_canonical_spec(self) -> Tuple[str, UnparsedVersion]:
+        if self._canonical is None:
+            self._canonical = self._canonical_spec
+        return self._canonical
+
     def __repr__(self) -> str:
         pre = (
             ", prereleases={0!r}".format(self.prereleases)
@@ -115,7 +265,9 @@ class IndividualSpecifier(BaseSpecifier, metaclass=abc.ABCMeta):
         return "{0}{1}".format(*self._spec)
 
     def __hash__(self) -> int:
-        return hash(self._canonical_spec)
+        if self._hash is None:
+            self._hash = hash(self._get_canonical_spec())
+        return self._hash
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, str):
@@ -126,7 +278,7 @@ class IndividualSpecifier(BaseSpecifier, metaclass=abc.ABCMeta):
         elif not isinstance(other, type(self)):
             return NotImplemented
 
-        return self._canonical_spec == other._canonical_spec
+        return self._get_canonical_spec() == other._get_canonical_spec()
 
     def __ne__(self, other: object) -> bool:
         if isinstance(other, str):
@@ -137,7 +289,7 @@ class IndividualSpecifier(BaseSpecifier, metaclass=abc.ABCMeta):
         elif not isinstance(other, type(self)):
             return NotImplemented
 
-        return self._canonical_spec != other._canonical_spec
+        return self._get_canonical_spec() != other._get_canonical_spec()
 
     def _get_operator(self, op: str) -> CallableOperator:
         operator_callable: CallableOperator = getattr(
@@ -155,18 +307,31 @@ class IndividualSpecifier(BaseSpecifier, metaclass=abc.ABCMeta):
 
     @property
     def prereleases(self) -> Optional[bool]:
-        return self._prereleases
+        if self._prereleases is not None:
+            return self._prereleases
+        if self._implied_prereleases is None:
+            self._implied_prereleases = self._imply_prereleases()
+        return self._implied_prereleases
 
     @prereleases.setter
     def prereleases(self, value: bool) -> None:
+        _check_mutable(self)
         self._prereleases = value
 
+    @classmethod
+    def intern(cls: Type[_I], spec: str) -> _I:
+        """
+        Returns a shared, frozen Specifier for the string `spec`, only
+        parsing it if no shared Specifier for it exists already. Shared
+        Specifiers are kept only as long as they're in use elsewhere.
+        """
+        return _intern((cls, spec), lambda: cls(spec))
+
     def __contains__(self, item: UnparsedVersion) -> bool:
         return self.contains(item)
 
-    def contains(self, item: UnparsedVersion,
-                 prereleases: Optional[bool] = None) -> bool:
-
+    def _contains(self, item: UnparsedVersion,
+                  prereleases: Optional[bool]) -> bool:
         # Determine if prereleases are to be allowed or not.
         if prereleases is None:
             prereleases = self.prereleases
@@ -183,8 +348,7 @@ class IndividualSpecifier(BaseSpecifier, metaclass=abc.ABCMeta):
 
         # Actually do the comparison to determine if this item is contained
         # within this Specifier or not.
-        operator_callable = self._get_operator(self.operator)
-        return operator_callable(normalized_item, self.version)
+        return self._match(normalized_item)
 
     def filter(
         self, iterable: Iterable[UnparsedVersion],
@@ -223,6 +387,9 @@ class IndividualSpecifier(BaseSpecifier, metaclass=abc.ABCMeta):
 
 
 class BaseSpecifierSet(BaseSpecifier, metaclass=abc.ABCMeta):
+    _cached_attrs = ("_results", "_compiled")
+    _specifier_type: Type[IndividualSpecifier]
+
     def __init__(self, parsed_specifiers: Set[BaseSpecifier],
                  prereleases: Optional[bool]) -> None:
         # Turn our parsed specifiers into a frozen set and save them for later.
@@ -232,10 +399,126 @@ class BaseSpecifierSet(BaseSpecifier, metaclass=abc.ABCMeta):
         # we accept prereleases or not.
         self._prereleases = prereleases
 
+        # Whether any of our specifiers accept prereleases, used when no
+        # explicit policy is set; this is created the first time it's needed.
+        self._implied_prereleases: Optional[bool] = None
+
+        # The intersection of our specifiers' intervals, along with any
+        # specifiers which must still be checked individually; this is created
+        # the first time it's needed.
+        self._compiled: Optional[
+            Tuple[Intervals, Tuple[BaseSpecifier, ...]]
+        ] = None
+
+        # Whether we've matched a version yet. Compiling only pays off when a
+        # set is reused, so the first version is checked against each
+        # specifier in turn instead.
+        self._used = False
+
+        # The string form of this set, created the first time it's needed.
+        self._str: Optional[str] = None
+
+    @classmethod
+    def _from_specs(cls: Type[_SS], specs: Iterable[BaseSpecifier],
+                    prereleases: Optional[bool]) -> _SS:
+        """
+        Creates a set of this type from already-parsed specifiers. For frozen
+        sets, any specifiers which aren't frozen are copied into frozen ones,
+        so that nothing can change the results we cache.
+        """
+        if cls._frozen:
+            specs = [
+                s if s._frozen or not isinstance(s, IndividualSpecifier)
+                else cls._specifier_type(str(s), s._prereleases)
+                for s in specs
+            ]
+
+        result = cls.__new__(cls)
+        BaseSpecifierSet.__init__(result, set(specs), prereleases)
+        return result
+
     @abc.abstractmethod
     def _coerce_version(self, version: UnparsedVersion) -> BaseVersion:
         pass
 
+    def _compile(self) -> Tuple[Intervals, Tuple[BaseSpecifier, ...]]:
+        """
+        Returns the set of points matched by all of our specifiers, along with
+        the specifiers whose intervals are inexact and which must be checked
+        for each candidate inside that set.
+        """
+        items = []
+        residual = []
+        for spec in self._specs:
+            if isinstance(spec, IndividualSpecifier):
+                spec_intervals, exact = spec._get_intervals()
+                items.append(spec_intervals)
+                if exact:
+                    continue
+            residual.append(spec)
+        return Intervals.intersection(items), tuple(residual)
+
+    def _get_compiled(self) -> Tuple[Intervals, Tuple[BaseSpecifier, ...]]:
+        if self._compiled is None:
+            self._compiled = self._compile()
+        return self._compiled
+
+    def simplify(self: _SS) -> _SS:
+        """
+        Returns an equivalent set without any specifiers which can't affect
+        the result, such as bounds implied by tighter bounds (e.g. `>=1.0`
+        alongside `>=1.2`) or exclusions outside of the range allowed by the
+        other specifiers (e.g. `!=0.9` alongside `>=1.0`).
+        """
+        def intervals(spec: BaseSpecifier) -> Intervals:
+            if isinstance(spec, IndividualSpecifier):
+                return spec._get_intervals()[0]
+            return Intervals.everything()
+
+        def implies_prereleases(spec: BaseSpecifier) -> bool:
+            # The version of an arbitrary equality specifier needn't be valid,
+            # so don't try to get a policy from it; at worst, this keeps a
+            # specifier we could have dropped.
+            if (isinstance(spec, IndividualSpecifier) and
+                    spec._prereleases is None and spec.operator == "==="):
+                return False
+            return bool(spec.prereleases)
+
+        # Try dropping each specifier in turn (in a fixed order, so that the
+        # result is deterministic): a specifier is redundant if the others
+        # only allow versions it allows too, i.e. if everything it excludes
+        # is also excluded by another specifier we've kept. Since the
+        # intervals of inexact specifiers are a superset of what they match,
+        # we can still use them to check the others, but we can't drop them.
+        specs = sorted(self._specs, key=str)
+        exclusions = _Exclusions([intervals(s) for s in specs])
+        kept = [True] * len(specs)
+        remaining = len(specs)
+        implying: Optional[int] = None
+        for i, spec in enumerate(specs):
+            if not isinstance(spec, IndividualSpecifier):
+                continue
+            # Never drop our last specifier, since empty sets handle
+            # pre-releases differently.
+            if ( not spec._get_intervals()[1] or remaining == 1 or
+                 exclusions.only_excluded_by(i) ):
+                continue
+            # Likewise, don't drop the only specifier that implies we allow
+            # pre-releases.
+            if self._prereleases is None and implies_prereleases(spec):
+                if implying is None:
+                    implying = sum(implies_prereleases(s)
+                                   for s, k in zip(specs, kept) if k)
+                if implying == 1:
+                    continue
+                implying -= 1
+            exclusions.remove(i)
+            kept[i] = False
+            remaining -= 1
+
+        return self._from_specs((s for s, k in zip(specs, kept) if k),
+                                self._prereleases)
+
     @abc.abstractmethod
     def _filter_prereleases(
         self, iterable: Iterable[UnparsedVersion],
@@ -243,6 +526,116 @@ class BaseSpecifierSet(BaseSpecifier, metaclass=abc.ABCMeta):
     ) -> Iterable[UnparsedVersion]:
         pass
 
+    def _matched_intervals(self, prereleases: bool) -> Intervals:
+        """
+        Returns the set of points matched by all of our exact specifiers,
+        limited to final releases unless `prereleases` is True.
+        """
+        return self._get_compiled()[0]
+
+    def _any_version(self, intervals: Intervals,
+                     inexact: Iterable[BaseSpecifier], prereleases: bool,
+                     predicate: Callable[[UnparsedVersion], bool]) -> bool:
+        """
+        Returns whether any version inside `intervals` satisfies `predicate`,
+        which may also check the specifiers in `inexact`. Subclasses should
+        override this if there are points which no version can have; by
+        default, any non-empty set of intervals is assumed to contain a
+        version, so this is only correct when `inexact` is empty.
+        """
+        return bool(intervals.bounds)
+
+    def _accepts_prereleases(self, prereleases: Optional[bool]) -> bool:
+        if prereleases is None:
+            prereleases = self.prereleases
+        return bool(prereleases)
+
+    def _coerce_set(
+        self, other: Union["BaseSpecifierSet", IndividualSpecifier, str]
+    ) -> "BaseSpecifierSet":
+        if isinstance(other, (str, IndividualSpecifier)):
+            return type(self)(str(other))  # type: ignore
+        if not (isinstance(other, type(self)) or
+                isinstance(self, type(other))):
+            raise TypeError("can't compare {} with {}".format(
+                type(self).__name__, type(other).__name__
+            ))
+        return other
+
+    def is_satisfiable(self, prereleases: Optional[bool] = None) -> bool:
+        """
+        Returns whether any version at all is contained in this set (using the
+        same rules for pre-releases as `contains`). This is determined from
+        the specifiers themselves, without needing any candidate versions.
+        """
+        accept = self._accepts_prereleases(prereleases)
+        return self._any_version(
+            self._matched_intervals(accept), self._get_compiled()[1], accept,
+            lambda v: self.contains(v, prereleases)
+        )
+
+    def is_empty(self, prereleases: Optional[bool] = None) -> bool:
+        """
+        Returns whether no versions are contained in this set; this is the
+        opposite of `is_satisfiable`.
+        """
+        return not self.is_satisfiable(prereleases)
+
+    def issubset(self, other: Union["BaseSpecifierSet", str],
+                 prereleases: Optional[bool] = None) -> bool:
+        """
+        Returns whether every version contained in this set is also contained
+        in `other`. Like `is_satisfiable`, this is determined from the
+        specifiers themselves.
+        """
+        other_set = self._coerce_set(other)
+        accept = self._accepts_prereleases(prereleases)
+        intervals = self._matched_intervals(accept)
+        other_intervals = other_set._matched_intervals(
+            other_set._accepts_prereleases(prereleases)
+        )
+        inexact = self._get_compiled()[1] + other_set._get_compiled()[1]
+
+        def outside(v: UnparsedVersion) -> bool:
+            return (self.contains(v, prereleases) and
+                    not other_set.contains(v, prereleases))
+
+        # Look for versions of ours outside of the other set's intervals, and
+        # if the other set has inexact specifiers, for versions they reject
+        # inside its intervals.
+        return not (
+            self._any_version(intervals - other_intervals, inexact, accept,
+                              outside) or
+            bool(other_set._get_compiled()[1]) and self._any_version(
+                intervals & other_intervals, inexact, accept, outside
+            )
+        )
+
+    def issuperset(self, other: Union["BaseSpecifierSet", str],
+                   prereleases: Optional[bool] = None) -> bool:
+        """
+        Returns whether every version contained in `other` is also contained
+        in this set.
+        """
+        return self._coerce_set(other).issubset(self, prereleases)
+
+    def overlaps(self, other: Union["BaseSpecifierSet", str],
+                 prereleases: Optional[bool] = None) -> bool:
+        """
+        Returns whether any version is contained in both this set and
+        `other`.
+        """
+        other_set = self._coerce_set(other)
+        accept = (self._accepts_prereleases(prereleases) and
+                  other_set._accepts_prereleases(prereleases))
+        return self._any_version(
+            self._matched_intervals(accept) &
+            other_set._matched_intervals(accept),
+            self._get_compiled()[1] + other_set._get_compiled()[1], accept,
+            lambda v: (self.contains(v, prereleases) and
+                       other_set.contains(v, prereleases))
+        )
+
     def __repr__(self) -> str:
         pre = (
             ", prereleases={0!r}".format(self.prereleases)
@@ -253,7 +646,9 @@ class BaseSpecifierSet(BaseSpecifier, metaclass=abc.ABCMeta):
         return "<{0}({1!r}{2})>".format(type(self).__name__, str(self), pre)
 
     def __str__(self) -> str:
-        return ",".join(sorted(str(s) for s in self._specs))
+        if self._str is None:
+            self._str = ",".join(sorted(str(s) for s in self._specs))
+        return self._str
 
     def __hash__(self) -> int:
         return hash(self._specs)
@@ -263,27 +658,58 @@ class BaseSpecifierSet(BaseSpecifier, metaclass=abc.ABCMeta):
     ) -> "BaseSpecifierSet":
         if isinstance(other, str):
             other = type(self)(other)  # type: ignore
-        elif not isinstance(other, type(self)):
+        elif not (isinstance(other, type(self)) or
+                  isinstance(self, type(other))):
             # Currently, SpecifierSets and LooseSpecifierSets can't be
-            # combined.
+            # combined. (Frozen and non-frozen sets can, though; the result
+            # has the same type as `self`.)
             return NotImplemented
 
-        specifier = type(self)()  # type: ignore
-        specifier._specs = frozenset(self._specs | other._specs)
-
-        if self._prereleases is None and other._prereleases is not None:
-            specifier._prereleases = other._prereleases
-        elif self._prereleases is not None and other._prereleases is None:
-            specifier._prereleases = self._prereleases
-        elif self._prereleases == other._prereleases:
-            specifier._prereleases = self._prereleases
+        if self._prereleases is None:
+            prereleases = other._prereleases
+        elif (other._prereleases is None or
+              self._prereleases == other._prereleases):
+            prereleases = self._prereleases
         else:
             raise ValueError(
                 "Cannot combine {}s with True and False prerelease "
                 "overrides.".format(type(self).__name__)
             )
 
-        return specifier
+        return self._from_specs(self._specs | other._specs, prereleases)
+
+    @classmethod
+    def intersect_all(
+        cls: Type[_SS], specifiers: Iterable[Union["BaseSpecifierSet", str]],
+    ) -> _SS:
+        """
+        Returns the intersection of all of the given sets (or strings), like
+        combining them one at a time with `&`, but in a single pass. Equal
+        specifiers are only kept once, and the prerelease overrides of the
+        sets are combined the same way as `&`, raising ValueError if some are
+        True and others are False.
+        """
+        specs: Set[BaseSpecifier] = set()
+        prereleases: Optional[bool] = None
+        for i in specifiers:
+            if isinstance(i, str):
+                i = cls(i)  # type: ignore
+            elif not (isinstance(i, cls) or issubclass(cls, type(i))):
+                raise TypeError("can't intersect {} with {}".format(
+                    cls.__name__, type(i).__name__
+                ))
+
+            specs.update(i._specs)
+            if i._prereleases is not None:
+                if prereleases is None:
+                    prereleases = i._prereleases
+                elif prereleases != i._prereleases:
+                    raise ValueError(
+                        "Cannot combine {}s with True and False prerelease "
+                        "overrides.".format(cls.__name__)
+                    )
+
+        return cls._from_specs(specs, prereleases)
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, (str, IndividualSpecifier)):
@@ -322,17 +748,24 @@ class BaseSpecifierSet(BaseSpecifier, metaclass=abc.ABCMeta):
 
         # Otherwise we'll see if any of the given specifiers accept
         # prereleases, if any of them do we'll return True, otherwise False.
-        return any(s.prereleases for s in self._specs)
+        # If none of our specifiers' policies can change, remember the result.
+        if self._implied_prereleases is not None:
+            return self._implied_prereleases
+        implied = any(s.prereleases for s in self._specs)
+        if all(s._frozen for s in self._specs):
+            self._implied_prereleases = implied
+        return implied
 
     @prereleases.setter
     def prereleases(self, value: bool) -> None:
+        _check_mutable(self)
         self._prereleases = value
 
     def __contains__(self, item: UnparsedVersion) -> bool:
         return self.contains(item)
 
-    def contains(self, item: UnparsedVersion,
-                 prereleases: Optional[bool] = None) -> bool:
+    def _contains(self, item: UnparsedVersion,
+                  prereleases: Optional[bool]) -> bool:
         # Ensure that our item is a PythonVersion or LooseVersion instance.
         parsed_item = self._coerce_version(item)
 
@@ -351,13 +784,24 @@ class BaseSpecifierSet(BaseSpecifier, metaclass=abc.ABCMeta):
         if not prereleases and parsed_item.is_prerelease:
             return False
 
-        # We simply dispatch to the underlying specs here to make sure that the
-        # given version is contained within all of them.
-        # Note: This use of all() here means that an empty set of specifiers
-        #       will always return True, this is an explicit design decision.
-        return all(
+        return self._contains_parsed(parsed_item, bool(prereleases))
+
+    def _contains_parsed(self, parsed_item: BaseVersion,
+                         prereleases: bool) -> bool:
+        # Check that the given version lies within the intersection of all of
+        # our specifiers, and then dispatch to any specifiers that couldn't be
+        # represented exactly.
+        # Note: An empty set of specifiers will always return True, this is an
+        #       explicit design decision.
+        if self._compiled is None and not self._used:
+            self._used = True
+            return all(s.contains(parsed_item, prereleases=prereleases)
+                       for s in self._specs)
+
+        intervals, residual = self._get_compiled()
+        return parsed_item._point in intervals and all(
             s.contains(parsed_item, prereleases=prereleases)
-            for s in self._specs
+            for s in residual
         )
 
     def filter(
@@ -370,15 +814,55 @@ class BaseSpecifierSet(BaseSpecifier, metaclass=abc.ABCMeta):
         if prereleases is None:
             prereleases = self.prereleases
 
-        # If we have any specifiers, then we want to wrap our iterable in the
-        # filter method for each one, this will act as a logical AND amongst
-        # each specifier.
+        # If we have any specifiers, then we want to yield only the items
+        # matched by every one of them. Since we pass an explicit prerelease
+        # value, this is the same as chaining each specifier's `filter`, but
+        # we only need to parse each item once.
         if self._specs:
-            for spec in self._specs:
-                iterable = spec.filter(iterable, prereleases=bool(prereleases))
-            return iterable
+            return self._filter_parsed(iterable, bool(prereleases))
         # If we do not have any specifiers, then we need to have a rough filter
         # which will filter out any pre-releases, unless there are no final
         # releases, and which will filter out LooseVersion in general.
         else:
             return self._filter_prereleases(iterable, prereleases)
+
+    def _filter_parsed(self, iterable: Iterable[UnparsedVersion],
+                       prereleases: bool) -> Iterator[UnparsedVersion]:
+        for item in iterable:
+            parsed_item = self._coerce_version(item)
+            if not prereleases and parsed_item.is_prerelease:
+                continue
+            if self._contains_parsed(parsed_item, prereleases):
+                yield item
+
+
+# The shared Specifiers (and specifier sets) created by `intern`, keyed by
+# their type and the arguments used to create them.
+_intern_table: "weakref.WeakValueDictionary[Hashable, BaseSpecifier]" = \
+    weakref.WeakValueDictionary()
+_intern_lock = threading.Lock()
+
+
+def _intern(key: Hashable, create: Callable[[], _S]) -> _S:
+    """
+    Returns the shared Specifier for `key`, calling `create()` to make it if
+    there isn't one already.
+    """
+    with _intern_lock:
+        result = _intern_table.get(key)
+    if result is None:
+        # Create the Specifier outside of the lock so that slow parses don't
+        # serialize other threads. If two threads race on the same key, the
+        # first one to finish wins.
+        created = create()
+        created._frozen = True
+        with _intern_lock:
+            result = _intern_table.setdefault(key, created)
+    return result  # type: ignore
+
+
+def _check_mutable(spec: BaseSpecifier) -> None:
+    if spec._frozen:
+        raise AttributeError("can't modify a frozen {}".format(
+            type(spec).__name__
+        ))
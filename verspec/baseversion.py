@@ -13,11 +13,22 @@ class InvalidVersion(ValueError):
 
 
 class BaseVersion(metaclass=abc.ABCMeta):
-    _key = None  # type: CmpKey
+    # Versions are often created in very large numbers, so keep them small.
+    # Subclasses should define `__slots__` for any attributes they add.
+    __slots__ = ("_key", "_sort_key")
+
+    _key: CmpKey
+    _sort_key: bytes
 
     def __hash__(self) -> int:
         return hash(self._key)
 
+    def __reduce__(self) -> Tuple[Any, Tuple[str]]:
+        # Slotted objects can't be pickled with protocols 0 and 1 by default,
+        # so recreate the version from its string form instead. This also
+        # keeps cached attributes out of the pickle.
+        return type(self), (str(self),)
+
     def __repr__(self) -> str:
         return "<{}({})>".format(type(self).__name__, repr(str(self)))
 
@@ -57,6 +68,35 @@ class BaseVersion(metaclass=abc.ABCMeta):
 
         return self._key != other._key
 
+    @property
+    def _point(self) -> Any:
+        """
+        The point representing this version when matching it against compiled
+        Intervals. Points are pairs of `(class, key)`: versions are first
+        grouped into classes which specifiers may treat differently, and then
+        ordered by their comparison key within each class. By default, every
+        version is in class 0.
+        """
+        return (0, self._key)
+
+    @property
+    def sort_key(self) -> bytes:
+        """
+        A byte string which compares the same way as this version: for two
+        versions `a` and `b`, `a < b` if and only if `a.sort_key < b.sort_key`.
+        Since bytes are compared in C, this makes sorting faster, and it lets
+        versions be stored and range-scanned in order in databases.
+        """
+        try:
+            return self._sort_key
+        except AttributeError:
+            self._sort_key = self._encode_sort_key()
+            return self._sort_key
+
+    @abc.abstractmethod
+    def _encode_sort_key(self) -> bytes:
+        pass
+
     @property
     @abc.abstractmethod
     def public(self) -> str:
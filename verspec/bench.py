@@ -0,0 +1,525 @@
+import argparse
+import fnmatch
+import json
+import platform
+import random
+import sys
+import time
+import timeit
+from contextlib import contextmanager
+from typing import (Any, Callable, Dict, Iterator, List, NamedTuple, Optional,
+                    Sequence, Tuple, Type)
+
+from . import __version__
+from .baseversion import BaseVersion
+from .cache import ParseCache
+from .index import SpecifierIndex, VersionIndex
+from .loose import LooseSpecifierSet, LooseVersion
+from .python import PythonSpecifier, PythonSpecifierSet, PythonVersion
+from .ranges import VersionRange
+
+__all__ = ["BENCHMARKS", "Benchmark", "Corpus", "main", "run"]
+
+# Run with `python -m verspec.bench`. Each benchmark times a single operation
+# over a fixed corpus of versions and specifiers, generated from a fixed seed
+# so that results are comparable from one run (and release) to the next.
+
+SEED = 440
+
+# A benchmark's setup function takes the corpus and returns a function to
+# time, along with the number of operations that function performs.
+Setup = Callable[["Corpus"], Tuple[Callable[[], Any], int]]
+
+
+class Benchmark(NamedTuple):
+    name: str
+    setup: Setup
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    def decorator(setup: Setup) -> Setup:
+        BENCHMARKS.append(Benchmark(name, setup))
+        return setup
+
+    return decorator
+
+
+def _python_version(rng: random.Random) -> str:
+    # Most versions are plain X.Y.Z releases, but include a realistic share of
+    # the other PEP 440 segments.
+    release = [rng.choice([0, 0, 1, 1, 2, 3]) for _ in range(rng.choice([
+        1, 2, 2, 3, 3, 3, 3, 4
+    ]))]
+    release[0] = rng.randint(0, 30)
+    result = ".".join(str(i) for i in release)
+
+    if rng.random() < 0.02:
+        result = "{}!{}".format(rng.randint(1, 2), result)
+    if rng.random() < 0.15:
+        result += "{}{}".format(rng.choice(["a", "b", "rc"]),
+                                rng.randint(0, 3))
+    if rng.random() < 0.08:
+        result += ".post{}".format(rng.randint(0, 3))
+    if rng.random() < 0.08:
+        result += ".dev{}".format(rng.randint(0, 3))
+    if rng.random() < 0.03:
+        result += "+{}.{}".format(rng.choice(["ubuntu", "cpu", "cu118"]),
+                                  rng.randint(0, 9))
+    return result
+
+
+def _python_specifier(rng: random.Random) -> str:
+    major, minor = rng.randint(0, 30), rng.randint(0, 5)
+    return rng.choice([
+        ">={}.{}".format(major, minor),
+        "<{}".format(major + 1),
+        "<={}.{}.{}".format(major, minor, rng.randint(0, 3)),
+        ">{}.{}".format(major, minor),
+        "=={}.{}.*".format(major, minor),
+        "!={}.{}.{}".format(major, minor, rng.randint(0, 3)),
+        "~={}.{}".format(major, minor),
+        "~={}.{}.{}".format(major, minor, rng.randint(0, 3)),
+        "=={}.{}".format(major, minor),
+        "==={}.{}".format(major, minor),
+    ])
+
+
+def _python_specifier_set(rng: random.Random) -> str:
+    major = rng.randint(0, 25)
+    clauses = [">={}.{}".format(major, rng.randint(0, 5)),
+               "<{}".format(major + rng.randint(1, 5))]
+    clauses.extend(_python_specifier(rng) for _ in range(rng.randint(0, 3))
+                   if rng.random() < 0.5)
+    clauses.extend("!={}.{}.{}".format(major, rng.randint(0, 5),
+                                       rng.randint(0, 3))
+                   for _ in range(rng.randint(0, 3)))
+    return ",".join(clauses)
+
+
+def _python_requirement(rng: random.Random) -> str:
+    # The specifiers from a typical requirements file or lock file: mostly
+    # exact pins and lower bounds, occasionally written with extra spaces.
+    major, minor = rng.randint(0, 30), rng.randint(0, 20)
+    pin = ["=={}.{}.{}".format(major, minor, rng.randint(0, 10))]
+    clauses = rng.choice([
+        pin, pin, pin, pin,
+        [">={}.{}".format(major, minor)],
+        [">={}.{}".format(major, minor), "<{}".format(major + 1)],
+        ["~={}.{}".format(major, minor)],
+        [">={}.{}".format(major, minor),
+         "!={}.{}.*".format(major, minor + 1)],
+        ["=={}.{}rc{}".format(major, minor, rng.randint(1, 3))],
+    ])
+    separator = ", " if rng.random() < 0.1 else ","
+    return separator.join(clauses)
+
+
+def _loose_version(rng: random.Random) -> str:
+    result = ".".join(str(rng.randint(0, 20))
+                      for _ in range(rng.randint(1, 4)))
+    if rng.random() < 0.2:
+        result += rng.choice(["a", "b", "rc", "-beta", "-final", "pre"])
+    if rng.random() < 0.1:
+        result += "-{}".format(rng.randint(1, 9))
+    return result
+
+
+def _loose_specifier_set(rng: random.Random) -> str:
+    major = rng.randint(0, 15)
+    return ">={}.{},<{},!={}.{}".format(
+        major, rng.randint(0, 5), major + rng.randint(1, 5), major,
+        rng.randint(0, 5)
+    )
+
+
+class Corpus:
+    """
+    The inputs for the benchmarks. `scale` multiplies the size of each part
+    of the corpus (e.g. to make test runs quicker).
+    """
+
+    def __init__(self, scale: float = 1.0, seed: int = SEED) -> None:
+        def count(n: int) -> int:
+            return max(1, int(n * scale))
+
+        rng = random.Random(seed)
+        self.python_versions = [_python_version(rng)
+                                for _ in range(count(10000))]
+        self.python_specifiers = [_python_specifier(rng)
+                                  for _ in range(count(200))]
+        self.python_specifier_sets = [_python_specifier_set(rng)
+                                      for _ in range(count(200))]
+        self.loose_versions = [_loose_version(rng)
+                               for _ in range(count(10000))]
+        self.loose_specifier_sets = [_loose_specifier_set(rng)
+                                     for _ in range(count(200))]
+
+        # Queries compare a subset of the versions against each specifier,
+        # since comparing all of them would take too long.
+        self.python_queries = self.python_versions[:count(500)]
+        self.loose_queries = self.loose_versions[:count(500)]
+
+        # Generated last so that adding it didn't change the rest.
+        self.python_requirements = [_python_requirement(rng)
+                                    for _ in range(count(2000))]
+
+
+@contextmanager
+def _uncached(version_type: Type[BaseVersion]) -> Iterator[None]:
+    old = version_type.parse_cache  # type: ignore
+    version_type.parse_cache = ParseCache(maxsize=0)  # type: ignore
+    try:
+        yield
+    finally:
+        version_type.parse_cache = old  # type: ignore
+
+
+def _parse(version_type: Type[BaseVersion], strings: Sequence[str],
+           cached: bool) -> Tuple[Callable[[], Any], int]:
+    if cached:
+        for s in strings:
+            version_type(s)  # type: ignore
+
+        def run() -> None:
+            for s in strings:
+                version_type(s)  # type: ignore
+    else:
+        def run() -> None:
+            with _uncached(version_type):
+                for s in strings:
+                    version_type(s)  # type: ignore
+
+    return run, len(strings)
+
+
+def _contains(specs: Sequence[Any],
+              versions: Sequence[BaseVersion]) -> Tuple[Callable[[], Any],
+                                                        int]:
+    def run() -> None:
+        for spec in specs:
+            contains = spec.contains
+            for v in versions:
+                contains(v)
+
+    # Compile each specifier before timing.
+    run()
+    return run, len(specs) * len(versions)
+
+
+def _filter(specs: Sequence[Any],
+            versions: Sequence[Any]) -> Tuple[Callable[[], Any], int]:
+    def run() -> None:
+        for spec in specs:
+            list(spec.filter(versions))
+
+    run()
+    return run, len(specs) * len(versions)
+
+
+@benchmark("python.version.parse")
+def bench_python_parse(corpus: Corpus) -> Tuple[Callable[[], Any], int]:
+    return _parse(PythonVersion, corpus.python_versions, cached=False)
+
+
+@benchmark("python.version.parse_cached")
+def bench_python_parse_cached(corpus: Corpus
+                              ) -> Tuple[Callable[[], Any], int]:
+    return _parse(PythonVersion, corpus.python_versions, cached=True)
+
+
+@benchmark("python.version.sort")
+def bench_python_sort(corpus: Corpus) -> Tuple[Callable[[], Any], int]:
+    versions = [PythonVersion(v) for v in corpus.python_versions]
+    return lambda: sorted(versions), len(versions)
+
+
+@benchmark("python.version.sort_key")
+def bench_python_sort_key(corpus: Corpus) -> Tuple[Callable[[], Any], int]:
+    versions = [PythonVersion(v) for v in corpus.python_versions]
+
+    def run() -> None:
+        sorted(versions, key=lambda v: v.sort_key)
+
+    run()
+    return run, len(versions)
+
+
+@benchmark("python.specifier.parse")
+def bench_python_specifier_parse(corpus: Corpus
+                                 ) -> Tuple[Callable[[], Any], int]:
+    specs = corpus.python_specifiers
+
+    def run() -> None:
+        for s in specs:
+            PythonSpecifier(s)
+
+    return run, len(specs)
+
+
+@benchmark("python.specifier.contains")
+def bench_python_specifier_contains(corpus: Corpus
+                                    ) -> Tuple[Callable[[], Any], int]:
+    return _contains([PythonSpecifier(s) for s in corpus.python_specifiers],
+                     [PythonVersion(v) for v in corpus.python_queries])
+
+
+@benchmark("python.specifier_set.parse")
+def bench_python_specifier_set_parse(corpus: Corpus
+                                     ) -> Tuple[Callable[[], Any], int]:
+    specs = corpus.python_specifier_sets
+
+    def run() -> None:
+        for s in specs:
+            PythonSpecifierSet(s)
+
+    return run, len(specs)
+
+
+@benchmark("python.specifier_set.parse_requirements")
+def bench_python_specifier_set_parse_requirements(
+    corpus: Corpus
+) -> Tuple[Callable[[], Any], int]:
+    specs = corpus.python_requirements
+
+    def run() -> None:
+        for s in specs:
+            PythonSpecifierSet(s)
+
+    return run, len(specs)
+
+
+@benchmark("python.specifier_set.contains")
+def bench_python_specifier_set_contains(corpus: Corpus
+                                        ) -> Tuple[Callable[[], Any], int]:
+    return _contains(
+        [PythonSpecifierSet(s) for s in corpus.python_specifier_sets],
+        [PythonVersion(v) for v in corpus.python_queries]
+    )
+
+
+@benchmark("python.specifier_set.filter")
+def bench_python_specifier_set_filter(corpus: Corpus
+                                      ) -> Tuple[Callable[[], Any], int]:
+    return _filter(
+        [PythonSpecifierSet(s) for s in corpus.python_specifier_sets],
+        corpus.python_queries
+    )
+
+
+@benchmark("python.specifier_set.intersection")
+def bench_python_specifier_set_intersection(
+    corpus: Corpus
+) -> Tuple[Callable[[], Any], int]:
+    specs = [PythonSpecifierSet(s) for s in corpus.python_specifier_sets]
+    pairs = list(zip(specs, specs[1:]))
+
+    def run() -> None:
+        for a, b in pairs:
+            (a & b).contains("1.0")
+
+    return run, len(pairs)
+
+
+@benchmark("python.specifier_set.intersect_all")
+def bench_python_specifier_set_intersect_all(
+    corpus: Corpus
+) -> Tuple[Callable[[], Any], int]:
+    specs = [PythonSpecifierSet(s) for s in corpus.python_specifier_sets]
+
+    def run() -> None:
+        PythonSpecifierSet.intersect_all(specs).contains("1.0")
+
+    return run, len(specs)
+
+
+@benchmark("python.range.contains")
+def bench_python_range_contains(corpus: Corpus
+                                ) -> Tuple[Callable[[], Any], int]:
+    specs = [PythonSpecifierSet(s) for s in corpus.python_specifier_sets]
+    return _contains(
+        [VersionRange(a) | VersionRange(b) for a, b in zip(specs, specs[1:])],
+        [PythonVersion(v) for v in corpus.python_queries]
+    )
+
+
+@benchmark("python.index.filter")
+def bench_python_index_filter(corpus: Corpus
+                              ) -> Tuple[Callable[[], Any], int]:
+    index: VersionIndex[PythonVersion] = VersionIndex(corpus.python_versions)
+    specs = [PythonSpecifierSet(s) for s in corpus.python_specifier_sets]
+
+    def run() -> None:
+        for spec in specs:
+            index.filter(spec)
+
+    run()
+    return run, len(specs)
+
+
+@benchmark("python.index.match_matrix")
+def bench_python_index_match_matrix(corpus: Corpus
+                                    ) -> Tuple[Callable[[], Any], int]:
+    index: VersionIndex[PythonVersion] = VersionIndex(corpus.python_versions)
+    specs = [PythonSpecifierSet(s) for s in corpus.python_specifier_sets]
+
+    def run() -> None:
+        index.match_matrix(specs)
+
+    run()
+    return run, len(specs)
+
+
+@benchmark("python.index.match")
+def bench_python_index_match(corpus: Corpus
+                             ) -> Tuple[Callable[[], Any], int]:
+    index: SpecifierIndex[PythonVersion] = SpecifierIndex(
+        PythonSpecifierSet(s) for s in corpus.python_specifier_sets
+    )
+    versions = [PythonVersion(v) for v in corpus.python_queries]
+
+    def run() -> None:
+        for v in versions:
+            index.match(v)
+
+    return run, len(versions)
+
+
+@benchmark("loose.version.parse")
+def bench_loose_parse(corpus: Corpus) -> Tuple[Callable[[], Any], int]:
+    return _parse(LooseVersion, corpus.loose_versions, cached=False)
+
+
+@benchmark("loose.version.sort")
+def bench_loose_sort(corpus: Corpus) -> Tuple[Callable[[], Any], int]:
+    versions = [LooseVersion(v) for v in corpus.loose_versions]
+    return lambda: sorted(versions), len(versions)
+
+
+@benchmark("loose.specifier_set.contains")
+def bench_loose_specifier_set_contains(corpus: Corpus
+                                       ) -> Tuple[Callable[[], Any], int]:
+    return _contains(
+        [LooseSpecifierSet(s) for s in corpus.loose_specifier_sets],
+        [LooseVersion(v) for v in corpus.loose_queries]
+    )
+
+
+@benchmark("loose.specifier_set.filter")
+def bench_loose_specifier_set_filter(corpus: Corpus
+                                     ) -> Tuple[Callable[[], Any], int]:
+    return _filter(
+        [LooseSpecifierSet(s) for s in corpus.loose_specifier_sets],
+        corpus.loose_queries
+    )
+
+
+def run(patterns: Optional[Sequence[str]] = None, repeat: int = 5,
+        scale: float = 1.0, min_time: float = 0.2) -> Dict[str, Any]:
+    """
+    Run the benchmarks whose names match any of the glob `patterns` (or all
+    of them), returning the results as a JSON-compatible dict. Each benchmark
+    is timed `repeat` times, and each timing runs the benchmark enough times
+    to take at least `min_time` seconds.
+    """
+    corpus = Corpus(scale)
+    results = []
+    for bench in BENCHMARKS:
+        if patterns and not any(fnmatch.fnmatchcase(bench.name, p)
+                                for p in patterns):
+            continue
+
+        func, ops = bench.setup(corpus)
+        timer = timeit.Timer(func)
+        number = 1
+        while True:
+            elapsed = timer.timeit(number)
+            if elapsed >= min_time:
+                break
+            number *= 2 if elapsed == 0 else max(
+                2, int(min_time / elapsed * 1.2)
+            )
+
+        times = [elapsed / number] + [
+            t / number for t in timer.repeat(repeat - 1, number)
+        ]
+        best = min(times)
+        results.append({
+            "name": bench.name,
+            "ops": ops,
+            "loops": number,
+            "times": times,
+            "best": best,
+            "best_per_op": best / ops,
+        })
+
+    return {
+        "verspec": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "seed": SEED,
+        "scale": scale,
+        "results": results,
+    }
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in [("s", 1), ("ms", 1e3), ("us", 1e6)]:
+        if seconds * scale >= 1:
+            return "{:.3g} {}".format(seconds * scale, unit)
+    return "{:.3g} ns".format(seconds * 1e9)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m verspec.bench",
+        description="Run the verspec benchmark suite."
+    )
+    parser.add_argument("patterns", metavar="PATTERN", nargs="*",
+                        help="only run benchmarks matching these globs")
+    parser.add_argument("-o", "--output", metavar="FILE",
+                        help="write the results as JSON to FILE (or - for "
+                             "stdout)")
+    parser.add_argument("-r", "--repeat", type=int, default=5,
+                        help="number of timings for each benchmark "
+                             "(default: %(default)s)")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiply the size of the corpus by this "
+                             "(default: %(default)s)")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="minimum seconds for each timing "
+                             "(default: %(default)s)")
+    parser.add_argument("-l", "--list", action="store_true",
+                        help="list the benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for bench in BENCHMARKS:
+            print(bench.name)
+        return 0
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    results = run(args.patterns, args.repeat, args.scale, args.min_time)
+    if args.output == "-":
+        json.dump(results, sys.stdout, indent=2)
+        print()
+        return 0
+
+    for r in results["results"]:
+        print("{:<40} {:>12} {:>12}/op".format(
+            r["name"], _format_time(r["best"]),
+            _format_time(r["best_per_op"])
+        ))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
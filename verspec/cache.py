@@ -0,0 +1,100 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, NamedTuple, Optional, TypeVar
+
+__all__ = ["CacheInfo", "ParseCache"]
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class ParseCache(Generic[K, V]):
+    """
+    A thread-safe, bounded LRU cache mapping raw inputs (e.g. version strings)
+    to the result of parsing them. A `maxsize` of None means the cache is
+    unbounded, and a `maxsize` of 0 disables caching entirely.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 4096) -> None:
+        self._check_maxsize(maxsize)
+        self._maxsize = maxsize
+        self._data: "OrderedDict[K, V]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _check_maxsize(maxsize: Optional[int]) -> None:
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("maxsize must be non-negative or None")
+
+    def __repr__(self) -> str:
+        return "<{}(maxsize={!r})>".format(type(self).__name__, self._maxsize)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def maxsize(self) -> Optional[int]:
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value: Optional[int]) -> None:
+        self._check_maxsize(value)
+        with self._lock:
+            self._maxsize = value
+            self._evict()
+
+    def _evict(self) -> None:
+        # Must be called with the lock held.
+        if self._maxsize is not None:
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def get(self, key: K, parse: Callable[[K], V]) -> V:
+        """
+        Return the cached result for `key`, calling `parse(key)` and storing
+        its result if it's not already present. Exceptions raised by `parse`
+        propagate to the caller and nothing is cached.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self._misses += 1
+            else:
+                self._data.move_to_end(key)
+                self._hits += 1
+                return value
+
+        # Parse outside of the lock so that slow parses don't serialize other
+        # threads. If two threads race on the same key, they'll both compute
+        # an equal result and the last one wins, which is harmless.
+        value = parse(key)
+
+        with self._lock:
+            if self._maxsize != 0:
+                self._data[key] = value
+                self._data.move_to_end(key)
+                self._evict()
+        return value
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize,
+                             len(self._data))
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache and reset its statistics.
+        """
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = 0
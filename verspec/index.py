@@ -0,0 +1,629 @@
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from typing import (Any, Callable, Dict, Generic, Iterable, Iterator, List,
+                    Optional, Sequence, Tuple, Type, TypeVar, Union)
+
+from .basespecifier import BaseSpecifierSet, IndividualSpecifier
+from .baseversion import BaseVersion, UnparsedVersion
+from .intervals import AT, Cut, Intervals
+from .python import PythonVersion
+
+__all__ = ["MatchMatrix", "SpecifierIndex", "VersionIndex", "match_matrix"]
+
+V = TypeVar("V", bound=BaseVersion)
+Specifier = Union[IndividualSpecifier, BaseSpecifierSet]
+
+# How a query treats pre-releases: accept them along with final releases,
+# reject them entirely, or only fall back to them if no final releases match.
+_ALL = "all"
+_FINALS = "finals"
+_FALLBACK = "fallback"
+
+
+def _compiled(
+    spec: Specifier
+) -> Tuple[Intervals, Tuple[IndividualSpecifier, ...]]:
+    """
+    Returns the compiled intervals of `spec`, along with the specifiers which
+    must be checked individually for each version inside them.
+    """
+    if isinstance(spec, IndividualSpecifier):
+        intervals, exact = spec._get_intervals()
+        return intervals, () if exact else (spec,)
+    return spec._get_compiled()  # type: ignore
+
+
+def _prerelease_mode(spec: Specifier, prereleases: Optional[bool],
+                     any_prereleases: Callable[[], bool]) -> str:
+    """
+    Returns how filtering with `spec` should treat pre-releases. The callable
+    `any_prereleases` reports whether any pre-releases match `spec` at all.
+    """
+    if isinstance(spec, IndividualSpecifier):
+        # IndividualSpecifier.filter only falls back to pre-releases if
+        # neither we nor the specifier explicitly allow them. Like it, we only
+        # consult the specifier's policy once a pre-release matches, since
+        # determining it may raise for some specifiers.
+        if prereleases is False:
+            return _FINALS
+        if prereleases or not any_prereleases():
+            return _ALL
+        return _ALL if spec.prereleases else _FALLBACK
+
+    if prereleases is None:
+        prereleases = spec.prereleases
+    if prereleases:
+        return _ALL
+    # An empty specifier set falls back to pre-releases when we don't know
+    # whether to allow them; a non-empty one never does.
+    if prereleases is None and not len(spec):
+        return _FALLBACK
+    return _FINALS
+
+
+class _Group:
+    """
+    A set of versions sorted by their points (see `BaseVersion._point`),
+    along with the rank of each version in the full index.
+    """
+
+    __slots__ = ("probes", "ranks", "classes", "size", "_masks")
+
+    def __init__(self, points: Sequence[Any], ranks: List[int]) -> None:
+        order = sorted(ranks, key=lambda r: points[r])
+        self.ranks = order
+        self.probes: List[Cut] = [(points[r], AT) for r in order]
+        # The positions where the class of the points changes. Within a
+        # class, points are ordered by their comparison key, so each run of
+        # ranks between these positions is increasing.
+        self.classes = [i for i in range(1, len(order))
+                        if points[order[i]][0] != points[order[i - 1]][0]]
+        self.size = len(points)
+        self._masks: Optional[List[int]] = None
+
+    def _class_masks(self) -> List[int]:
+        # Returns a bitset of the ranks in each class.
+        if self._masks is None:
+            bounds = [0, *self.classes, len(self.ranks)]
+            self._masks = []
+            for lo, hi in zip(bounds, bounds[1:]):
+                digits = bytearray(b"0" * (self.size + 1))
+                for r in self.ranks[lo:hi]:
+                    digits[-1 - r] = ord("1")
+                self._masks.append(int(digits, 2))
+        return self._masks
+
+    def runs(self, intervals: Intervals) -> Iterator[Tuple[int, int]]:
+        """
+        Yields the (start, end) positions of the versions inside `intervals`,
+        split so that the ranks in each run are increasing.
+        """
+        probes, classes = self.probes, self.classes
+        for start, end in intervals:
+            lo = bisect_right(probes, start)
+            hi = bisect_left(probes, end)
+            if lo >= hi:
+                continue
+            for split in classes[bisect_right(classes, lo):
+                                 bisect_left(classes, hi)]:
+                yield lo, split
+                lo = split
+            yield lo, hi
+
+    def mask(self, intervals: Intervals) -> int:
+        """
+        Returns a bitset of the ranks of the versions inside `intervals`.
+        """
+        ranks, classes = self.ranks, self.classes
+        class_masks = self._class_masks()
+        result = 0
+        for lo, hi in self.runs(intervals):
+            # Each run is within one class and its ranks are increasing, so
+            # it's every rank of that class from the first to the last.
+            span = (1 << (ranks[hi - 1] + 1)) - (1 << ranks[lo])
+            result |= span & class_masks[bisect_right(classes, lo)]
+        return result
+
+
+def _bit_ranges(bits: int) -> Iterator[Tuple[int, int]]:
+    """
+    Yields the (start, end) positions of each run of set bits in `bits`.
+    """
+    position = 0
+    while bits:
+        # Skip past the zeros, and then count the ones.
+        zeros = (bits & -bits).bit_length() - 1
+        bits >>= zeros
+        ones = (bits ^ (bits + 1)).bit_length() - 1
+        bits >>= ones
+        yield position + zeros, position + zeros + ones
+        position += zeros + ones
+
+
+class MatchMatrix(Generic[V]):
+    """
+    The results of matching many specifiers against the versions in a
+    `VersionIndex`. Each row is a bitset (an int) whose bit `i` is set if the
+    row's specifier matches `versions[i]`, where `versions` are the index's
+    items in ascending version order.
+    """
+
+    def __init__(self, index: "VersionIndex[V]", rows: List[int]) -> None:
+        self.versions: List[UnparsedVersion] = list(index)
+        self.rows = rows
+
+    def __repr__(self) -> str:
+        return "<{}({} x {})>".format(type(self).__name__, len(self.rows),
+                                      len(self.versions))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.rows)
+
+    def __getitem__(self, row: int) -> int:
+        return self.rows[row]
+
+    def ranges(self, row: int) -> List[Tuple[int, int]]:
+        """
+        Returns the (start, end) positions in `versions` of each run of
+        versions matched by the specifier for `row`.
+        """
+        return list(_bit_ranges(self.rows[row]))
+
+    def filter(self, row: int) -> List[UnparsedVersion]:
+        """
+        Returns the versions matched by the specifier for `row`, sorted by
+        version.
+        """
+        versions = self.versions
+        return [v for lo, hi in _bit_ranges(self.rows[row])
+                for v in versions[lo:hi]]
+
+    def count(self, row: int) -> int:
+        """
+        Returns the number of versions matched by the specifier for `row`.
+        """
+        return bin(self.rows[row]).count("1")
+
+
+class VersionIndex(Generic[V]):
+    """
+    A sorted, immutable collection of versions which can be queried with
+    specifiers. The versions are parsed and sorted once up front; each query
+    then looks up the ranges of versions matched by the specifier's compiled
+    intervals, taking O(log n + k) time to produce k results.
+
+    Queries follow the same rules for pre-releases as the specifier's own
+    `filter` method, but return the original items in ascending version order
+    rather than in the order they were given.
+    """
+
+    def __init__(self, versions: Iterable[UnparsedVersion],
+                 version_type: Type[V] = PythonVersion  # type: ignore
+                 ) -> None:
+        items = list(versions)
+        parsed = [v if isinstance(v, version_type)
+                  else version_type(str(v))  # type: ignore
+                  for v in items]
+
+        # Sort by version; ties keep the order they were given in.
+        order = sorted(range(len(items)), key=lambda i: parsed[i]._key)
+        self._items = [items[i] for i in order]
+        self._versions: List[V] = [parsed[i] for i in order]
+
+        points = [v._point for v in self._versions]
+        self._finals = _Group(points, [
+            r for r, v in enumerate(self._versions) if not v.is_prerelease
+        ])
+        self._prereleases = _Group(points, [
+            r for r, v in enumerate(self._versions) if v.is_prerelease
+        ])
+
+    def __repr__(self) -> str:
+        return "<{}({!r})>".format(
+            type(self).__name__, [str(v) for v in self._versions]
+        )
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[UnparsedVersion]:
+        return iter(self._items)
+
+    def _ranks(self, group: _Group, intervals: Intervals,
+               residual: Sequence[IndividualSpecifier],
+               reverse: bool) -> Iterator[int]:
+        ranks = group.ranks
+        runs = [ranks[lo:hi] for lo, hi in group.runs(intervals)]
+        if reverse:
+            runs = [r[::-1] for r in runs]
+        merged = heapq.merge(*runs, reverse=reverse)
+        if not residual:
+            return merged
+
+        versions = self._versions
+        return (r for r in merged if all(
+            s.contains(versions[r], prereleases=True) for s in residual
+        ))
+
+    def _query(self, spec: Specifier, prereleases: Optional[bool],
+               reverse: bool = False) -> Iterator[int]:
+        """
+        Yields the ranks of the versions matching `spec`, in ascending order
+        (or descending if `reverse` is true).
+        """
+        intervals, residual = _compiled(spec)
+        mode = _prerelease_mode(
+            spec, prereleases,
+            lambda: any(self._prereleases.runs(intervals))
+        )
+        finals = self._ranks(self._finals, intervals, residual, reverse)
+        if mode == _FINALS:
+            yield from finals
+            return
+
+        prereleases_ = self._ranks(self._prereleases, intervals, residual,
+                                   reverse)
+        if mode == _ALL:
+            yield from heapq.merge(finals, prereleases_, reverse=reverse)
+            return
+
+        # Fall back to pre-releases only if there are no matching finals.
+        found = False
+        for r in finals:
+            found = True
+            yield r
+        if not found:
+            yield from prereleases_
+
+    def filter(self, spec: Specifier,
+               prereleases: Optional[bool] = None) -> List[UnparsedVersion]:
+        """
+        Returns the items matching `spec`, sorted by version.
+        """
+        items = self._items
+        return [items[r] for r in self._query(spec, prereleases)]
+
+    def best_match(self, spec: Specifier,
+                   prereleases: Optional[bool] = None
+                   ) -> Optional[UnparsedVersion]:
+        """
+        Returns the highest item matching `spec`, or None if nothing matches.
+        """
+        for r in self._query(spec, prereleases, reverse=True):
+            return self._items[r]
+        return None
+
+    def _mask(self, spec: Specifier, prereleases: Optional[bool]) -> int:
+        """
+        Returns a bitset of the ranks of the versions matching `spec`.
+        """
+        intervals, residual = _compiled(spec)
+
+        def mask(group: _Group) -> int:
+            result = group.mask(intervals)
+            if residual:
+                versions = self._versions
+                for lo, hi in list(_bit_ranges(result)):
+                    for r in range(lo, hi):
+                        if not all(s.contains(versions[r], prereleases=True)
+                                   for s in residual):
+                            result ^= 1 << r
+            return result
+
+        mode = _prerelease_mode(
+            spec, prereleases,
+            lambda: any(self._prereleases.runs(intervals))
+        )
+        finals = mask(self._finals)
+        if mode == _FINALS or (mode == _FALLBACK and finals):
+            return finals
+        return finals | mask(self._prereleases)
+
+    def match_matrix(self, specs: Iterable[Specifier],
+                     prereleases: Optional[bool] = None) -> MatchMatrix[V]:
+        """
+        Matches each of `specs` against the items in this index, following the
+        same rules as `filter`. Rather than a list of items for each
+        specifier, this returns a `MatchMatrix` holding a bitset of the
+        matching items for each one.
+        """
+        return MatchMatrix(self, [self._mask(s, prereleases) for s in specs])
+
+    def count(self, spec: Specifier,
+              prereleases: Optional[bool] = None) -> int:
+        """
+        Returns the number of items matching `spec`. If `spec` can be
+        represented exactly by its intervals, this takes O(log n) time.
+        """
+        intervals, residual = _compiled(spec)
+        if residual:
+            return sum(1 for _ in self._query(spec, prereleases))
+
+        mode = _prerelease_mode(
+            spec, prereleases,
+            lambda: any(self._prereleases.runs(intervals))
+        )
+        result = sum(hi - lo for lo, hi in self._finals.runs(intervals))
+        if mode == _ALL or (mode == _FALLBACK and result == 0):
+            result += sum(hi - lo for lo, hi in
+                          self._prereleases.runs(intervals))
+        return result
+
+
+def match_matrix(specs: Iterable[Specifier],
+                 versions: Iterable[UnparsedVersion],
+                 version_type: Type[V] = PythonVersion,  # type: ignore
+                 prereleases: Optional[bool] = None) -> MatchMatrix[V]:
+    """
+    Matches each of `specs` against `versions`, parsing and sorting the
+    versions only once. See `VersionIndex.match_matrix`.
+    """
+    index: VersionIndex[V] = VersionIndex(versions, version_type)
+    return index.match_matrix(specs, prereleases)
+
+
+class _Node:
+    """
+    A node in an `_IntervalTree`, holding the intervals which contain its
+    center, sorted both by where they start and by where they end.
+    """
+
+    __slots__ = ("center", "starts", "ends", "left", "right")
+
+    def __init__(self, center: Cut) -> None:
+        self.center = center
+        self.starts: List[Tuple[Cut, int]] = []
+        self.ends: List[Tuple[Cut, int]] = []
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+
+
+class _IntervalTree:
+    """
+    A centered interval tree mapping half-open intervals of cuts to integer
+    keys. Each interval is stored in the highest node whose center it
+    contains; intervals entirely below or above the center go to the left or
+    right subtree, respectively.
+    """
+
+    def __init__(self) -> None:
+        self.root: Optional[_Node] = None
+        self.entries: Dict[int, List[Tuple[Cut, Cut]]] = {}
+        self.changes = 0
+
+    def build(self) -> None:
+        # Comparing (and hashing) cuts is fairly slow, so sort them once and
+        # build the tree from their ranks instead.
+        keys = [key for key, spans in self.entries.items() for _ in spans]
+        bounds = [cut for spans in self.entries.values()
+                  for span in spans for cut in span]
+        ranks = [0] * len(bounds)
+        cuts: List[Cut] = []
+        for i in sorted(range(len(bounds)), key=bounds.__getitem__):
+            if not cuts or cuts[-1] != bounds[i]:
+                cuts.append(bounds[i])
+            ranks[i] = len(cuts) - 1
+
+        # Pick the median start as the center, so that at most half of the
+        # intervals end up in each subtree. The spans are sorted once up
+        # front; splitting them keeps each subtree's spans in order.
+        def build(spans: List[Tuple[int, int, int]]) -> Optional[_Node]:
+            if not spans:
+                return None
+            center = spans[len(spans) // 2][0]
+            split = bisect_left(spans, (center + 1,))
+            left = []
+            starts, ends = [], []
+            for span in spans[:split]:
+                start, end, key = span
+                if end <= center:
+                    left.append(span)
+                else:
+                    starts.append((start, key))
+                    ends.append((end, key))
+            starts.sort()
+            ends.sort()
+
+            node = _Node(cuts[center])
+            node.starts = [(cuts[i], key) for i, key in starts]
+            node.ends = [(cuts[i], key) for i, key in ends]
+            node.left, node.right = build(left), build(spans[split:])
+            return node
+
+        self.root = build(sorted(zip(ranks[::2], ranks[1::2], keys)))
+        self.changes = 0
+
+    def _rebalance(self) -> None:
+        # Inserting and removing intervals can unbalance the tree, so rebuild
+        # it once the number of changes since it was built catches up to the
+        # number of entries.
+        self.changes += 1
+        if self.changes > max(len(self.entries), 64):
+            self.build()
+
+    def insert(self, key: int, spans: List[Tuple[Cut, Cut]]) -> None:
+        self.entries[key] = spans
+        for start, end in spans:
+            if self.root is None:
+                self.root = _Node(start)
+            node = self.root
+            while not (start <= node.center < end):
+                if end <= node.center:
+                    if node.left is None:
+                        node.left = _Node(start)
+                    node = node.left
+                else:
+                    if node.right is None:
+                        node.right = _Node(start)
+                    node = node.right
+            insort(node.starts, (start, key))
+            insort(node.ends, (end, key))
+        self._rebalance()
+
+    def remove(self, key: int) -> None:
+        for start, end in self.entries.pop(key):
+            node = self.root
+            while node is not None and not (start <= node.center < end):
+                node = node.left if end <= node.center else node.right
+            assert node is not None
+            del node.starts[bisect_left(node.starts, (start, key))]
+            del node.ends[bisect_left(node.ends, (end, key))]
+        self._rebalance()
+
+    def stab(self, probe: Cut) -> Iterator[int]:
+        """
+        Yields the keys of the intervals containing `probe`.
+        """
+        node = self.root
+        while node is not None:
+            # Every interval in this node contains the center, so if the
+            # probe is below it, the intervals starting below the probe
+            # contain it too (and similarly for the ends above the center).
+            if probe < node.center:
+                for start, key in node.starts:
+                    if start > probe:
+                        break
+                    yield key
+                node = node.left
+            else:
+                for end, key in reversed(node.ends):
+                    if end < probe:
+                        break
+                    yield key
+                node = node.right
+
+
+class SpecifierIndex(Generic[V]):
+    """
+    A collection of specifiers which can be queried with a version to find
+    the specifiers which contain it. The compiled intervals of each specifier
+    are stored in an interval tree, so each query takes O(log n + k) time to
+    find k matching specifiers (plus the time to check any specifiers which
+    can't be represented exactly by their intervals).
+
+    Like `contains`, queries use each specifier's own pre-release policy
+    (as of when it was added to the index) unless `prereleases` is given.
+    """
+
+    def __init__(self, specifiers: Iterable[Specifier] = (),
+                 version_type: Type[V] = PythonVersion  # type: ignore
+                 ) -> None:
+        self._version_type = version_type
+        self._specs: Dict[int, Specifier] = {}
+        self._residual: Dict[int, Tuple[IndividualSpecifier, ...]] = {}
+        self._keys: Dict[Specifier, List[int]] = {}
+        self._next_key = 0
+
+        # Every specifier can match final releases, but only some of them
+        # match pre-releases by default.
+        self._all = _IntervalTree()
+        self._prereleases = _IntervalTree()
+        for spec in specifiers:
+            key, spans = self._register(spec)
+            self._all.entries[key] = spans
+            if spec.prereleases:
+                self._prereleases.entries[key] = spans
+        self._all.build()
+        self._prereleases.build()
+
+    def __repr__(self) -> str:
+        return "<{}({!r})>".format(
+            type(self).__name__, [str(s) for s in self._specs.values()]
+        )
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def __iter__(self) -> Iterator[Specifier]:
+        return iter(self._specs.values())
+
+    def __contains__(self, spec: object) -> bool:
+        return (isinstance(spec, (IndividualSpecifier, BaseSpecifierSet)) and
+                self._find(spec) is not None)
+
+    def _find(self, spec: Specifier) -> Optional[int]:
+        """
+        Returns the key of `spec` in this index, or None if it's not here. If
+        `spec` itself was never added, the key of an equal specifier which
+        matches the same versions is returned instead.
+        """
+        keys = self._keys.get(spec, ())
+        for key in reversed(keys):
+            if self._specs[key] is spec:
+                return key
+        # Equality ignores the pre-release policy, so only accept specifiers
+        # whose policy agrees with the one they were added with.
+        prereleases = bool(spec.prereleases)
+        for key in reversed(keys):
+            if (key in self._prereleases.entries) == prereleases:
+                return key
+        return None
+
+    def _register(self, spec: Specifier) -> Tuple[int, List[Tuple[Cut, Cut]]]:
+        """
+        Assigns a key to `spec`, returning it along with the spans of the
+        specifier's intervals.
+        """
+        intervals, residual = _compiled(spec)
+        key = self._next_key
+        self._next_key += 1
+        self._specs[key] = spec
+        if residual:
+            self._residual[key] = residual
+        self._keys.setdefault(spec, []).append(key)
+        return key, list(intervals)
+
+    def add(self, spec: Specifier) -> None:
+        """
+        Adds `spec` to this index.
+        """
+        key, spans = self._register(spec)
+        self._all.insert(key, spans)
+        if spec.prereleases:
+            self._prereleases.insert(key, spans)
+
+    def remove(self, spec: Specifier) -> None:
+        """
+        Removes `spec` (or a specifier equal to it with the same pre-release
+        policy) from this index. Raises ValueError if there's no such
+        specifier.
+        """
+        key = self._find(spec)
+        if key is None:
+            raise ValueError("{!r} not in index".format(spec))
+        keys = self._keys[spec]
+        keys.remove(key)
+        if not keys:
+            del self._keys[spec]
+
+        del self._specs[key]
+        self._residual.pop(key, None)
+        self._all.remove(key)
+        if key in self._prereleases.entries:
+            self._prereleases.remove(key)
+
+    def match(self, version: UnparsedVersion,
+              prereleases: Optional[bool] = None) -> List[Specifier]:
+        """
+        Returns the specifiers containing `version`, in no particular order.
+        """
+        parsed = (version if isinstance(version, self._version_type)
+                  else self._version_type(str(version)))  # type: ignore
+        if not parsed.is_prerelease or prereleases:
+            tree = self._all
+        elif prereleases is None:
+            tree = self._prereleases
+        else:
+            return []
+
+        specs, residual = self._specs, self._residual
+        result = []
+        for key in tree.stab((parsed._point, AT)):
+            checks = residual.get(key)
+            if checks is None or all(s.contains(parsed, prereleases=True)
+                                     for s in checks):
+                result.append(specs[key])
+        return result
@@ -0,0 +1,271 @@
+import itertools
+from bisect import bisect_left, bisect_right
+from typing import (Any, Callable, Iterable, Iterator, List, Optional,
+                    Sequence, Tuple)
+
+from .infinity import Infinity, NegativeInfinity
+
+__all__ = ["Intervals"]
+
+# A cut is a position in between points (e.g. version comparison keys). It's
+# represented as a point paired with a side: BEFORE sorts below the point
+# itself and AFTER sorts above it. To find where a point lies relative to a
+# list of cuts, we compare against the probe `(point, AT)`.
+Cut = Tuple[Any, int]
+
+BEFORE = 0
+AT = 1
+AFTER = 2
+
+MIN: Cut = (NegativeInfinity, BEFORE)
+MAX: Cut = (Infinity, AFTER)
+
+
+def before(point: Any) -> Cut:
+    return (point, BEFORE)
+
+
+def after(point: Any) -> Cut:
+    return (point, AFTER)
+
+
+class Intervals:
+    """
+    An immutable set of points stored as a sorted sequence of disjoint
+    half-open intervals. The intervals are represented as a flat tuple of
+    cuts, `(start_0, end_0, start_1, end_1, ...)`, so a point is in the set if
+    and only if an odd number of cuts lie below it.
+    """
+
+    __slots__ = ("bounds",)
+
+    def __init__(self, bounds: Iterable[Cut] = ()) -> None:
+        self.bounds: Tuple[Cut, ...] = tuple(bounds)
+
+    @classmethod
+    def everything(cls) -> "Intervals":
+        return cls((MIN, MAX))
+
+    @classmethod
+    def span(cls, start: Optional[Cut], end: Optional[Cut]) -> "Intervals":
+        """
+        Returns the set of points between the cuts `start` and `end`; either
+        may be None to indicate that side is unbounded.
+        """
+        if start is None:
+            start = MIN
+        if end is None:
+            end = MAX
+        if not start < end:
+            return cls()
+        return cls((start, end))
+
+    def __repr__(self) -> str:
+        return "<{}({!r})>".format(type(self).__name__, self.bounds)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Intervals):
+            return NotImplemented
+        return self.bounds == other.bounds
+
+    def __ne__(self, other: object) -> bool:
+        if not isinstance(other, Intervals):
+            return NotImplemented
+        return self.bounds != other.bounds
+
+    def __hash__(self) -> int:
+        return hash(self.bounds)
+
+    def __iter__(self) -> Iterator[Tuple[Cut, Cut]]:
+        bounds = self.bounds
+        return iter(zip(bounds[::2], bounds[1::2]))
+
+    def __len__(self) -> int:
+        return len(self.bounds) // 2
+
+    def __contains__(self, point: Any) -> bool:
+        return bisect_right(self.bounds, (point, AT)) % 2 == 1
+
+    def _combine(self, other: "Intervals",
+                 op: Callable[[bool, bool], bool]) -> "Intervals":
+        # Sweep over the cuts of both sets in order, tracking whether we're
+        # inside each one and emitting a cut whenever the result of `op`
+        # changes.
+        a, b = self.bounds, other.bounds
+        na, nb = len(a), len(b)
+        i = j = 0
+        in_a = in_b = inside = False
+        result: List[Cut] = []
+
+        while i < na or j < nb:
+            if j == nb or (i < na and a[i] < b[j]):
+                cut = a[i]
+                i += 1
+                in_a = not in_a
+            elif i == na or b[j] < a[i]:
+                cut = b[j]
+                j += 1
+                in_b = not in_b
+            else:
+                cut = a[i]
+                i += 1
+                j += 1
+                in_a = not in_a
+                in_b = not in_b
+
+            now = op(in_a, in_b)
+            if now != inside:
+                result.append(cut)
+                inside = now
+
+        return type(self)(result)
+
+    def __and__(self, other: "Intervals") -> "Intervals":
+        return self._combine(other, lambda a, b: a and b)
+
+    def __or__(self, other: "Intervals") -> "Intervals":
+        return self._combine(other, lambda a, b: a or b)
+
+    def __sub__(self, other: "Intervals") -> "Intervals":
+        return self._combine(other, lambda a, b: a and not b)
+
+    def __xor__(self, other: "Intervals") -> "Intervals":
+        return self._combine(other, lambda a, b: a != b)
+
+    def __invert__(self) -> "Intervals":
+        bounds = list(self.bounds)
+        if bounds and bounds[0] == MIN:
+            del bounds[0]
+        else:
+            bounds.insert(0, MIN)
+        if bounds and bounds[-1] == MAX:
+            del bounds[-1]
+        else:
+            bounds.append(MAX)
+        return type(self)(bounds)
+
+    def issubset(self, other: "Intervals") -> bool:
+        return not (self - other).bounds
+
+    @classmethod
+    def intersection(cls, items: Iterable["Intervals"]) -> "Intervals":
+        # Sort the cuts of all the sets together and sweep over them once,
+        # tracking how many of the sets we're inside; we're in the
+        # intersection whenever we're inside all of them. (Combining the sets
+        # one at a time instead would take quadratic time.)
+        events: List[Tuple[Cut, int]] = []
+        count = 0
+        for i in items:
+            if not i.bounds:
+                return cls()
+            count += 1
+            events.extend(zip(i.bounds, itertools.cycle((1, -1))))
+        if not count:
+            return cls.everything()
+        events.sort()
+
+        n = len(events)
+        k = depth = 0
+        inside = False
+        result: List[Cut] = []
+        while k < n:
+            cut = events[k][0]
+            while k < n and events[k][0] == cut:
+                depth += events[k][1]
+                k += 1
+            now = depth == count
+            if now != inside:
+                result.append(cut)
+                inside = now
+
+        return cls(result)
+
+
+class _Exclusions:
+    """
+    Counts how many of a list of Intervals exclude each point, so that sets
+    can be removed from the list and checked for points that no other set in
+    the list excludes, each in logarithmic time (in the number of cuts).
+    """
+
+    def __init__(self, items: Sequence[Intervals]) -> None:
+        # Split everything into segments between each of the distinct cuts of
+        # all the sets.
+        cuts = sorted(itertools.chain([MIN, MAX],
+                                      *(i.bounds for i in items)))
+        self._cuts = [c for n, c in enumerate(cuts)
+                      if not n or c != cuts[n - 1]]
+
+        # The ranges of segments excluded by each set, and the number of sets
+        # excluding each segment.
+        self._ranges: List[List[Tuple[int, int]]] = []
+        counts = [0] * len(self._cuts)
+        for i in items:
+            bounds = [MIN, *i.bounds, MAX]
+            ranges = []
+            for start, end in zip(bounds[::2], bounds[1::2]):
+                lo = bisect_left(self._cuts, start)
+                hi = bisect_left(self._cuts, end)
+                if lo < hi:
+                    ranges.append((lo, hi))
+                    counts[lo] += 1
+                    counts[hi] -= 1
+            self._ranges.append(ranges)
+        counts = list(itertools.accumulate(counts))[:-1]
+
+        # A segment tree of the counts, where each node holds the smallest
+        # count below it (including any amount added to the whole node).
+        self._size = len(counts)
+        self._min = [0] * (4 * self._size)
+        self._add = [0] * (4 * self._size)
+        self._build(1, 0, self._size, counts)
+
+    def _build(self, node: int, lo: int, hi: int, counts: List[int]) -> None:
+        if hi - lo == 1:
+            self._min[node] = counts[lo]
+            return
+        mid = (lo + hi) // 2
+        self._build(2 * node, lo, mid, counts)
+        self._build(2 * node + 1, mid, hi, counts)
+        self._min[node] = min(self._min[2 * node], self._min[2 * node + 1])
+
+    def _update(self, node: int, lo: int, hi: int, start: int, end: int,
+                value: int) -> None:
+        if end <= lo or hi <= start:
+            return
+        if start <= lo and hi <= end:
+            self._min[node] += value
+            self._add[node] += value
+            return
+        mid = (lo + hi) // 2
+        self._update(2 * node, lo, mid, start, end, value)
+        self._update(2 * node + 1, mid, hi, start, end, value)
+        self._min[node] = (min(self._min[2 * node], self._min[2 * node + 1]) +
+                           self._add[node])
+
+    def _query(self, node: int, lo: int, hi: int, start: int,
+               end: int) -> float:
+        if end <= lo or hi <= start:
+            return float("inf")
+        if start <= lo and hi <= end:
+            return self._min[node]
+        mid = (lo + hi) // 2
+        return min(self._query(2 * node, lo, mid, start, end),
+                   self._query(2 * node + 1, mid, hi, start, end)) + \
+            self._add[node]
+
+    def only_excluded_by(self, index: int) -> bool:
+        """
+        Returns whether any point is excluded by the set at `index` and by no
+        other set still in the list.
+        """
+        return any(self._query(1, 0, self._size, lo, hi) == 1
+                   for lo, hi in self._ranges[index])
+
+    def remove(self, index: int) -> None:
+        """
+        Removes the set at `index` from the list.
+        """
+        for lo, hi in self._ranges[index]:
+            self._update(1, 0, self._size, lo, hi, -1)
+        self._ranges[index] = []
@@ -1,23 +1,39 @@
 import re
+import sys
 from typing import Iterator, List, Tuple
 
 from .baseversion import *
 from .basespecifier import *
+from .cache import ParseCache
+from .intervals import Intervals, after, before
+from .sortkey import encode_str
 
-__all__ = ["InvalidVersion", "InvalidSpecifier", "LooseSpecifier",
+__all__ = ["FrozenLooseSpecifier", "FrozenLooseSpecifierSet",
+           "InvalidVersion", "InvalidSpecifier", "LooseSpecifier",
            "LooseSpecifierSet", "LooseVersion"]
 
 LooseCmpKey = Tuple[str, ...]
 
 
 class LooseVersion(BaseVersion):
+    __slots__ = ("_version",)
+
+    # Computing the key is fairly expensive, so remember the results for
+    # recently-seen version strings.
+    parse_cache: ParseCache[str, LooseCmpKey] = ParseCache()
+
     def __init__(self, version: str) -> None:
         self._version = str(version)
-        self._key = _loose_cmpkey(self._version)
+        self._key = self.parse_cache.get(self._version, _loose_cmpkey)
 
     def __str__(self) -> str:
         return self._version
 
+    def _encode_sort_key(self) -> bytes:
+        parts = [b"\x01" + encode_str(i) for i in self._key]
+        parts.append(b"\x00")
+        return b"".join(parts)
+
     @property
     def public(self) -> str:
         return self._version
@@ -81,11 +97,13 @@ def _parse_version_parts(s: str) -> Iterator[str]:
         if not part or part == ".":
             continue
 
+        # The same parts show up in many versions, so intern them to save
+        # memory.
         if part[:1] in "0123456789":
             # pad for numeric comparison
-            yield part.zfill(8)
+            yield sys.intern(part.zfill(8))
         else:
-            yield "*" + part
+            yield sys.intern("*" + part)
 
     # ensure that alpha/beta/candidate are before final
     yield "*final"
@@ -145,29 +163,63 @@ class LooseSpecifier(IndividualSpecifier):
     def _canonical_spec(self) -> Tuple[str, str]:
         return self._spec
 
-    def _compare_equal(self, prospective: LooseVersion, spec: str) -> bool:
-        return prospective == self._coerce_version(spec)
+    def _parse_operand(self, version: str) -> LooseVersion:
+        return self._coerce_version(version)
+
+    def _compare_equal(self, prospective: LooseVersion,
+                       spec: LooseVersion) -> bool:
+        return prospective == spec
 
-    def _compare_not_equal(self, prospective: LooseVersion, spec: str) -> bool:
-        return prospective != self._coerce_version(spec)
+    def _compare_not_equal(self, prospective: LooseVersion,
+                           spec: LooseVersion) -> bool:
+        return prospective != spec
 
     def _compare_less_than_equal(self, prospective: LooseVersion,
-                                 spec: str) -> bool:
-        return prospective <= self._coerce_version(spec)
+                                 spec: LooseVersion) -> bool:
+        return prospective <= spec
 
     def _compare_greater_than_equal(self, prospective: LooseVersion,
-                                    spec: str) -> bool:
-        return prospective >= self._coerce_version(spec)
+                                    spec: LooseVersion) -> bool:
+        return prospective >= spec
 
-    def _compare_less_than(self, prospective: LooseVersion, spec: str) -> bool:
-        return prospective < self._coerce_version(spec)
+    def _compare_less_than(self, prospective: LooseVersion,
+                           spec: LooseVersion) -> bool:
+        return prospective < spec
 
     def _compare_greater_than(self, prospective: LooseVersion,
-                              spec: str) -> bool:
-        return prospective > self._coerce_version(spec)
+                              spec: LooseVersion) -> bool:
+        return prospective > spec
+
+    def _intervals_equal(self, spec: LooseVersion) -> Tuple[Intervals, bool]:
+        point = spec._point
+        return Intervals((before(point), after(point))), True
+
+    def _intervals_not_equal(self,
+                             spec: LooseVersion) -> Tuple[Intervals, bool]:
+        return ~self._intervals_equal(spec)[0], True
+
+    def _intervals_less_than_equal(
+        self, spec: LooseVersion
+    ) -> Tuple[Intervals, bool]:
+        return Intervals.span(None, after(spec._point)), True
+
+    def _intervals_greater_than_equal(
+        self, spec: LooseVersion
+    ) -> Tuple[Intervals, bool]:
+        return Intervals.span(before(spec._point), None), True
+
+    def _intervals_less_than(self,
+                             spec: LooseVersion) -> Tuple[Intervals, bool]:
+        return Intervals.span(None, before(spec._point)), True
+
+    def _intervals_greater_than(self,
+                                spec: LooseVersion) -> Tuple[Intervals, bool]:
+        return Intervals.span(after(spec._point), None), True
 
 
 class LooseSpecifierSet(BaseSpecifierSet):
+    _specifier_type = LooseSpecifier
+
     def __init__(self, specifiers: str = "") -> None:
         # Split on , to break each individual specifier into its own item, and
         # strip each item to remove leading/trailing whitespace.
@@ -175,7 +227,7 @@ class LooseSpecifierSet(BaseSpecifierSet):
                             if s.strip()]
 
         # Parse each individual specifier as a LooseSpecifier.
-        parsed: Set[BaseSpecifier] = set(LooseSpecifier(specifier)
+        parsed: Set[BaseSpecifier] = set(self._specifier_type(specifier)
                                          for specifier in split_specifiers)
 
         super().__init__(parsed, None)
@@ -194,6 +246,25 @@ class LooseSpecifierSet(BaseSpecifierSet):
         return iterable
 
 
+class FrozenLooseSpecifier(LooseSpecifier):
+    """
+    A LooseSpecifier which can't be modified once it's created. Since nothing
+    about it can change, the results of `contains` are cached for its
+    lifetime.
+    """
+    _frozen = True
+
+
+class FrozenLooseSpecifierSet(LooseSpecifierSet):
+    """
+    A LooseSpecifierSet made up of FrozenLooseSpecifiers, which can't be
+    modified once it's created. Since nothing about it can change, the results
+    of `contains` are cached for its lifetime.
+    """
+    _frozen = True
+    _specifier_type = FrozenLooseSpecifier
+
+
 Version = LooseVersion
 Specifier = LooseSpecifier
 SpecifierSet = LooseSpecifierSet
@@ -1,12 +1,18 @@
 import itertools
 import re
-from typing import List, NamedTuple, Optional, SupportsInt, Tuple
+from typing import (Callable, Iterable, Iterator, List, NamedTuple,
+                    Optional, Set, SupportsInt, Tuple)
 
 from .baseversion import *
 from .basespecifier import *
+from .basespecifier import _intern
+from .cache import ParseCache
 from .infinity import *
+from .intervals import AT, MAX, MIN, Cut, Intervals, after, before
+from .sortkey import encode_int, encode_str
 
-__all__ = ["InvalidVersion", "InvalidSpecifier", "PythonSpecifier",
+__all__ = ["FrozenPythonSpecifier", "FrozenPythonSpecifierSet",
+           "InvalidVersion", "InvalidSpecifier", "PythonSpecifier",
            "PythonSpecifierSet", "PythonVersion"]
 
 LocalType = Tuple[Union[int, str], ...]
@@ -22,6 +28,7 @@ LocalCmpType = Union[
 ]
 PythonCmpKey = Tuple[int, Tuple[int, ...], PrePostDevType, PrePostDevType,
                      PrePostDevType, LocalCmpType]
+PythonPoint = Tuple[int, PythonCmpKey]
 
 
 class _Version(NamedTuple):
@@ -68,39 +75,26 @@ VERSION_PATTERN = r"""
 
 
 class PythonVersion(BaseVersion):
+    # Everything but the release segment as written (which may have trailing
+    # zeros) can be recovered from the comparison key, so that's all we store.
+    # When the release has no trailing zeros, it's shared with the key. The
+    # key of the public version is cached the first time it's needed.
+    __slots__ = ("_release", "_public_key")
+
+    _public_key: PythonCmpKey
+
     _regex = re.compile(r"^\s*" + VERSION_PATTERN + r"\s*$",
                         re.VERBOSE | re.IGNORECASE)
 
-    def __init__(self, version: str) -> None:
-        # Validate the version and parse it into pieces
-        match = self._regex.search(version)
-        if not match:
-            raise InvalidVersion("Invalid version: '{0}'".format(version))
-
-        # Store the parsed out pieces of the version
-        self._version = _Version(
-            epoch=int(match.group("epoch")) if match.group("epoch") else 0,
-            release=tuple(int(i) for i in match.group("release").split(".")),
-            pre=_parse_letter_version(match.group("pre_l"),
-                                      match.group("pre_n")),
-            post=_parse_letter_version(
-                match.group("post_l"),
-                match.group("post_n1") or match.group("post_n2")
-            ),
-            dev=_parse_letter_version(match.group("dev_l"),
-                                      match.group("dev_n")),
-            local=_parse_local_version(match.group("local")),
-        )
+    # Parsing is fairly expensive, so remember the results for recently-seen
+    # version strings.
+    parse_cache: ParseCache[
+        str, Tuple[Tuple[int, ...], PythonCmpKey]
+    ] = ParseCache()
 
-        # Generate a key which will be used for sorting
-        self._key = _cmpkey(
-            self._version.epoch,
-            self._version.release,
-            self._version.pre,
-            self._version.post,
-            self._version.dev,
-            self._version.local,
-        )
+    def __init__(self, version: str) -> None:
+        self._release, self._key = self.parse_cache.get(version,
+                                                        _parse_version)
 
     def __str__(self) -> str:
         parts = []
@@ -132,28 +126,33 @@ class PythonVersion(BaseVersion):
 
     @property
     def epoch(self) -> int:
-        return self._version.epoch
+        return self._key[0]
 
     @property
     def release(self) -> Tuple[int, ...]:
-        return self._version.release
+        return self._release
 
     @property
     def pre(self) -> Optional[LetterVersion]:
-        return self._version.pre
+        pre = self._key[2]
+        return pre if isinstance(pre, tuple) else None
 
     @property
     def post(self) -> Optional[int]:
-        return self._version.post[1] if self._version.post else None
+        post = self._key[3]
+        return post[1] if isinstance(post, tuple) else None
 
     @property
     def dev(self) -> Optional[int]:
-        return self._version.dev[1] if self._version.dev else None
+        dev = self._key[4]
+        return dev[1] if isinstance(dev, tuple) else None
 
     @property
     def local(self) -> Optional[str]:
-        if self._version.local:
-            return ".".join(str(x) for x in self._version.local)
+        local = self._key[5]
+        if isinstance(local, tuple):
+            return ".".join(str(number) if isinstance(number, int)
+                            else letters for number, letters in local)
         else:
             return None
 
@@ -161,6 +160,33 @@ class PythonVersion(BaseVersion):
     def public(self) -> str:
         return str(self).split("+", 1)[0]
 
+    @property
+    def public_key(self) -> PythonCmpKey:
+        """
+        The comparison key of this version's public version (i.e. without its
+        local segment).
+        """
+        try:
+            return self._public_key
+        except AttributeError:
+            key = self._key
+            if isinstance(key[5], tuple):
+                key = key[:5] + (NegativeInfinity,)
+            self._public_key = key
+            return key
+
+    @property
+    def base_key(self) -> Tuple[int, Tuple[int, ...]]:
+        """
+        The portion of this version's comparison key corresponding to its base
+        version; two versions have the same base version if and only if their
+        base keys are equal.
+        """
+        # This is only needed for the exclusive ordered comparisons, and then
+        # only for pre-, post- and local releases, so it's not worth an extra
+        # slot in every version to cache it.
+        return self._key[:2]
+
     @property
     def base_version(self) -> str:
         parts = []
@@ -186,6 +212,13 @@ class PythonVersion(BaseVersion):
     def is_devrelease(self) -> bool:
         return self.dev is not None
 
+    @property
+    def _point(self) -> PythonPoint:
+        return _version_class(self), self._key
+
+    def _encode_sort_key(self) -> bytes:
+        return _sort_key(self._key)
+
     @property
     def major(self) -> int:
         return self.release[0] if len(self.release) >= 1 else 0
@@ -199,6 +232,125 @@ class PythonVersion(BaseVersion):
         return self.release[2] if len(self.release) >= 3 else 0
 
 
+def _parse_version(
+    version: str
+) -> Tuple[Tuple[int, ...], PythonCmpKey]:
+    # Most versions are already written in their normalized form, which we can
+    # parse much more quickly than with the full regex.
+    parsed = _parse_normalized(version)
+    if parsed is None:
+        parsed = _match_version(version)
+
+    # Generate a key which will be used for sorting
+    key = _cmpkey(
+        parsed.epoch,
+        parsed.release,
+        parsed.pre,
+        parsed.post,
+        parsed.dev,
+        parsed.local,
+    )
+
+    return parsed.release, key
+
+
+def _match_version(version: str) -> _Version:
+    # Validate the version and parse it into pieces
+    match = PythonVersion._regex.search(version)
+    if not match:
+        raise InvalidVersion("Invalid version: '{0}'".format(version))
+
+    # Store the parsed out pieces of the version
+    return _Version(
+        epoch=int(match.group("epoch")) if match.group("epoch") else 0,
+        release=tuple(int(i) for i in match.group("release").split(".")),
+        pre=_parse_letter_version(match.group("pre_l"),
+                                  match.group("pre_n")),
+        post=_parse_letter_version(
+            match.group("post_l"),
+            match.group("post_n1") or match.group("post_n2")
+        ),
+        dev=_parse_letter_version(match.group("dev_l"),
+                                  match.group("dev_n")),
+        local=_parse_local_version(match.group("local")),
+    )
+
+
+def _parse_number(text: str) -> Optional[int]:
+    # `isdigit` also accepts non-ASCII digits, but we've already checked that
+    # the whole version is ASCII.
+    return int(text) if text.isdigit() else None
+
+
+def _parse_normalized(version: str) -> Optional[_Version]:
+    """
+    Parses a version written in its normalized form (e.g. 1!2.0rc1.post2.dev3
+    or 1.0+abc.5), returning None if the version is written any other way.
+    This gives the same result as `_match_version`, but only uses simple
+    string operations.
+    """
+    if not version.isascii():
+        return None
+
+    public, plus, local_str = version.partition("+")
+    local: Optional[LocalType] = None
+    if plus:
+        local_parts = local_str.split(".")
+        if not all(i.isalnum() and i.islower() or i.isdigit()
+                   for i in local_parts):
+            return None
+        local = tuple(int(i) if i.isdigit() else i for i in local_parts)
+
+    epoch = 0
+    if "!" in public:
+        epoch_str, _, public = public.partition("!")
+        if not epoch_str.isdigit():
+            return None
+        epoch = int(epoch_str)
+
+    parts = public.split(".")
+    end = len(parts)
+
+    dev: Optional[LetterVersion] = None
+    if end > 1 and parts[end - 1].startswith("dev"):
+        number = _parse_number(parts[end - 1][3:])
+        if number is None:
+            return None
+        dev = ("dev", number)
+        end -= 1
+
+    post: Optional[LetterVersion] = None
+    if end > 1 and parts[end - 1].startswith("post"):
+        number = _parse_number(parts[end - 1][4:])
+        if number is None:
+            return None
+        post = ("post", number)
+        end -= 1
+
+    # The pre-release segment, if any, is attached to the last part of the
+    # release segment.
+    pre: Optional[LetterVersion] = None
+    last = parts[end - 1]
+    pre_str = last.lstrip("0123456789")
+    if pre_str:
+        letter = "rc" if pre_str.startswith("rc") else pre_str[0]
+        number = _parse_number(pre_str[len(letter):])
+        if letter not in ("a", "b", "rc") or number is None:
+            return None
+        pre = (letter, number)
+        parts[end - 1] = last[:-len(pre_str)]
+
+    release = []
+    for i in range(end):
+        number = _parse_number(parts[i])
+        if number is None:
+            return None
+        release.append(number)
+
+    return _Version(epoch=epoch, release=tuple(release), pre=pre, post=post,
+                    dev=dev, local=local)
+
+
 def _parse_letter_version(
     letter: str, number: Union[str, bytes, SupportsInt]
 ) -> Optional[LetterVersion]:
@@ -249,6 +401,19 @@ def _parse_local_version(local: str) -> Optional[LocalType]:
     return None
 
 
+def _release_key(release: Tuple[int, ...]) -> Tuple[int, ...]:
+    # When we compare a release version, we want to compare it with all of the
+    # trailing zeros removed. So we'll use a reverse the list, drop all the now
+    # leading zeros until we come to something non zero, then take the rest
+    # re-reverse it back into the correct order and make it a tuple and use
+    # that for our sorting key.
+    if not release or release[-1] != 0:
+        return release
+    return tuple(reversed(list(itertools.dropwhile(
+        lambda x: x == 0, reversed(release)
+    ))))
+
+
 def _cmpkey(
     epoch: int,
     release: Tuple[int, ...],
@@ -257,14 +422,7 @@ def _cmpkey(
     dev: Optional[LetterVersion],
     local: Optional[LocalType],
 ) -> PythonCmpKey:
-    # When we compare a release version, we want to compare it with all of the
-    # trailing zeros removed. So we'll use a reverse the list, drop all the now
-    # leading zeros until we come to something non zero, then take the rest
-    # re-reverse it back into the correct order and make it a tuple and use
-    # that for our sorting key.
-    _release = tuple(reversed(list(itertools.dropwhile(
-        lambda x: x == 0, reversed(release)
-    ))))
+    _release = _release_key(release)
 
     # We need to "trick" the sorting algorithm to put 1.0.dev0 before 1.0a0.
     # We'll do this by abusing the pre segment, but we _only_ want to do this
@@ -310,6 +468,370 @@ def _cmpkey(
     return epoch, _release, _pre, _post, _dev, _local
 
 
+def _encode_segment(value: PrePostDevType) -> bytes:
+    if isinstance(value, NegativeInfinityType):
+        return b"\x00"
+    if isinstance(value, InfinityType):
+        return b"\x02"
+    letter, number = value
+    return b"\x01" + encode_str(letter) + encode_int(number)
+
+
+def _encode_local(local: LocalCmpType) -> bytes:
+    if isinstance(local, NegativeInfinityType):
+        return b"\x00"
+    parts = [b"\x01"]
+    for number, letters in local:
+        # Alphanumeric segments sort before numeric ones.
+        if isinstance(number, int):
+            parts.extend((b"\x02", encode_int(number)))
+        else:
+            parts.extend((b"\x01", encode_str(letters)))
+    parts.append(b"\x00")
+    return b"".join(parts)
+
+
+def _sort_key(key: PythonCmpKey) -> bytes:
+    """
+    Encodes a comparison key as bytes which compare in the same order. Each
+    part of the key is encoded so that no encoding is a prefix of another;
+    sequences mark each item with a byte that sorts after their terminator,
+    so shorter sequences sort first, and Infinity and NegativeInfinity are
+    encoded as bytes sorting after and before any real value.
+    """
+    epoch, release, pre, post, dev, local = key
+    parts = [encode_int(epoch)]
+    for i in release:
+        parts.extend((b"\x01", encode_int(i)))
+    parts.extend((b"\x00", _encode_segment(pre), _encode_segment(post),
+                  _encode_segment(dev), _encode_local(local)))
+    return b"".join(parts)
+
+
+# When compiling specifiers into Intervals, versions are first grouped into
+# classes by which of the pre-release (or development release), post-release
+# and local segments they have, since the exclusive ordered comparisons treat
+# those specially. Within each class, versions are ordered by their comparison
+# key.
+_PRE_CLASS = 4
+_POST_CLASS = 2
+_LOCAL_CLASS = 1
+_CLASSES = range(8)
+
+_FINAL_CLASSES = [c for c in _CLASSES if not c & _PRE_CLASS]
+_PRERELEASE_CLASSES = [c for c in _CLASSES if c & _PRE_CLASS]
+
+
+def _version_class(version: "PythonVersion") -> int:
+    _, _, pre, post, dev, local = version._key
+    return (
+        (_PRE_CLASS if isinstance(pre, tuple) or isinstance(dev, tuple)
+         else 0) |
+        (_POST_CLASS if isinstance(post, tuple) else 0) |
+        (_LOCAL_CLASS if isinstance(local, tuple) else 0)
+    )
+
+
+def _floor_key(epoch: int, release: object = NegativeInfinity) -> CmpKey:
+    """
+    Returns a key which sorts below every version with the given epoch and
+    release (or just the given epoch, if release is omitted).
+    """
+    return (epoch, release, NegativeInfinity, NegativeInfinity,
+            NegativeInfinity, NegativeInfinity)
+
+
+def _ceiling_key(epoch: int, release: object = Infinity) -> CmpKey:
+    """
+    Returns a key which sorts above every version with the given epoch and
+    release (or just the given epoch, if release is omitted).
+    """
+    return (epoch, release, Infinity, Infinity, Infinity, Infinity)
+
+
+def _local_ceiling_key(key: CmpKey) -> CmpKey:
+    """
+    Returns a key which sorts above the given key, and above every local
+    version of the given key, but below everything else.
+    """
+    return key[:5] + (Infinity,)
+
+
+def _class_start(cls: int) -> Cut:
+    if cls == 0:
+        return MIN
+    if cls == len(_CLASSES):
+        return MAX
+    return before((cls, NegativeInfinity))
+
+
+def _key_range(start: Optional[Cut], end: Optional[Cut],
+               classes: Iterable[int] = _CLASSES) -> Intervals:
+    """
+    Returns the Intervals covering the keys between the cuts `start` and `end`
+    (either of which may be None to indicate that side is unbounded) within
+    each of the given classes.
+    """
+    bounds: List[Cut] = []
+    for c in classes:
+        lo = _class_start(c) if start is None else ((c, start[0]), start[1])
+        hi = _class_start(c + 1) if end is None else ((c, end[0]), end[1])
+        if lo < hi:
+            if bounds and bounds[-1] == lo:
+                bounds[-1] = hi
+            else:
+                bounds.extend((lo, hi))
+    return Intervals(bounds)
+
+
+# All of the final releases (including post-releases and local versions).
+_FINAL_INTERVALS = _key_range(None, None, _FINAL_CLASSES)
+
+
+def _prefix_intervals(prefix: List[str]) -> Tuple[Intervals, bool]:
+    """
+    Returns the Intervals for a prefix match against the (split) prefix, and
+    whether they're exact.
+    """
+    # Prefix matching works by comparing the split strings of the versions, so
+    # we can only reason about it in terms of comparison keys if the prefix is
+    # written in its normalized form.
+    try:
+        version = PythonVersion(".".join(prefix))
+    except InvalidVersion:
+        return Intervals.everything(), False
+    if ( _version_split(str(version)) != prefix or
+         version.dev is not None or version.local is not None ):
+        return Intervals.everything(), False
+
+    # With a non-zero epoch, the epoch and first release segment are a single
+    # string, so the length of the prospective version's release segment
+    # matters. Just match everything with the same epoch and check the rest
+    # individually.
+    if version.epoch != 0:
+        return _key_range(before(_floor_key(version.epoch)),
+                          after(_ceiling_key(version.epoch))), False
+
+    release = version.release
+    start = _floor_key(0, _release_key(release))
+
+    # Similarly, if there are pre- or post-release segments, the length of the
+    # prospective version's release segment matters. Just match everything
+    # with the same release.
+    if version.pre is not None or version.post is not None:
+        return _key_range(before(start),
+                          after(_ceiling_key(0, _release_key(release)))), False
+
+    # Otherwise, this is a range from the prefix up to the next release at the
+    # same level (e.g. ==1.2.* means >=1.2.dev0,<1.3.dev0). However, if the
+    # prefix ends in a zero, prospective versions with fewer release segments
+    # and a pre-, post- or development release segment (e.g. 1a1 for ==1.0.*)
+    # don't match, so we need to check those individually.
+    end = _floor_key(0, _release_key(release[:-1] + (release[-1] + 1,)))
+    exact = len(release) == 1 or release[-1] != 0
+    return _key_range(before(start), before(end)), exact
+
+
+def _cut_class(cut: Cut) -> int:
+    point = cut[0]
+    if isinstance(point, NegativeInfinityType):
+        return _CLASSES[0]
+    if isinstance(point, InfinityType):
+        return _CLASSES[-1]
+    return point[0]
+
+
+def _suffixes(cls: int, key: Optional[CmpKey], local_part: str) -> Iterator[
+    Tuple[Optional[LetterVersion], Optional[LetterVersion],
+          Optional[LetterVersion], Optional[LocalType]]
+]:
+    """
+    Yields the pre-, post-, development and local segments for versions of
+    the given class which are either the smallest possible, or the same as
+    (or just after) the segments in `key`.
+    """
+    pres: List[Optional[LetterVersion]] = [None]
+    devs: List[Optional[LetterVersion]] = [None]
+    if cls & _PRE_CLASS:
+        pres.append(("a", 0))
+        devs.append(("dev", 0))
+        if key is not None and isinstance(key[2], tuple):
+            pres.extend((key[2], (key[2][0], key[2][1] + 1)))
+        if key is not None and isinstance(key[4], tuple):
+            devs.extend((key[4], ("dev", key[4][1] + 1)))
+
+    posts: List[Optional[LetterVersion]] = [None]
+    if cls & _POST_CLASS:
+        posts = [("post", 0)]
+        if key is not None and isinstance(key[3], tuple):
+            posts.extend((key[3], ("post", key[3][1] + 1)))
+
+    locals_: List[Optional[LocalType]] = [None]
+    if cls & _LOCAL_CLASS:
+        locals_ = [(local_part,)]
+        if key is not None and isinstance(key[5], tuple):
+            key_local = tuple(s or i for i, s in key[5])
+            locals_.extend((key_local, key_local + (local_part,)))
+
+    for pre, dev in itertools.product(pres, devs):
+        if (pre is not None or dev is not None) == bool(cls & _PRE_CLASS):
+            for post, local in itertools.product(posts, locals_):
+                yield pre, post, dev, local
+
+
+def _least_versions(cls: int, cut: Cut, depth: int, local_part: str,
+                    lengths: Iterable[int]) -> Iterator[str]:
+    """
+    Yields the smallest version of the given class above `cut`. If there's
+    no smallest one (e.g. nothing is just after 1.0, since 1.0.0.1 is after
+    1.0.0.0.1 and so on), yields a version above `cut` which is still below
+    any interval bound with a release shorter than `depth`, and whose local
+    string segments are all before `local_part`. Since prefix matching can
+    depend on how many release segments are written, this version is yielded
+    both without trailing zeros in its release, and padded with zeros to each
+    of the given `lengths` (and `depth - 1`).
+    """
+    point = cut[0]
+    if isinstance(point, InfinityType):
+        return
+
+    key: Optional[CmpKey] = None
+    epoch = 0
+    release: Tuple[int, ...] = ()
+    if isinstance(point, tuple) and isinstance(point[1], tuple):
+        key = point[1]
+        epoch, release = key[:2]
+        if isinstance(release, NegativeInfinityType):
+            key, release = None, ()
+        elif isinstance(release, InfinityType):
+            key, epoch, release = None, epoch + 1, ()
+
+    best = None
+    for segments in _suffixes(cls, key, local_part):
+        candidate = _cmpkey(epoch, release, *segments)
+        if ((cls, candidate), AT) > cut and (best is None or
+                                             candidate < best[0]):
+            best = candidate, segments
+    if best is None:
+        # Nothing with this release is above the cut, so move to a release
+        # just after it.
+        release = release + (0,) * depth + (1,)
+        best = min(((_cmpkey(epoch, release, *segments), segments)
+                    for segments in _suffixes(cls, None, local_part)),
+                   key=lambda item: item[0])
+
+    pre, post, dev, local = best[1]
+    suffix = "".join((
+        "{}{}".format(*pre) if pre else "",
+        ".post{}".format(post[1]) if post else "",
+        ".dev{}".format(dev[1]) if dev else "",
+        "+" + ".".join(str(i) for i in local) if local else "",
+    ))
+    for size in sorted({len(release), depth - 1, *lengths}):
+        if size >= len(release):
+            padded = release + (0,) * (size - len(release))
+            yield "{}{}{}".format(
+                "{}!".format(epoch) if epoch else "",
+                ".".join(str(i) for i in padded) or "0",
+                suffix
+            )
+
+
+def _witnesses(intervals: Intervals, cuts: List[Cut], classes: List[int],
+               lengths: Iterable[int] = ()) -> Iterator[str]:
+    """
+    Yields versions of the given classes which are the smallest in each of
+    the intervals, and just after each of the extra cuts (see
+    `_least_versions`). If there's any version in the intervals, one of these
+    will be.
+    """
+    bound_keys = [p[1] for p, _ in itertools.chain(intervals.bounds, cuts)
+                  if isinstance(p, tuple) and isinstance(p[1], tuple)]
+    depth = max((len(k[1]) for k in bound_keys
+                 if isinstance(k[1], tuple)), default=0) + 1
+    local_part = "0" * max((len(s) for k in bound_keys
+                            if isinstance(k[5], tuple)
+                            for _, s in k[5]), default=0) + "0a"
+
+    for start, end in intervals:
+        for c in range(_cut_class(start), _cut_class(end) + 1):
+            if c in classes:
+                yield from _least_versions(
+                    c, start if c == _cut_class(start) else _class_start(c),
+                    depth, local_part, lengths
+                )
+
+    for (point, side) in cuts:
+        if isinstance(point, tuple):
+            for c in classes:
+                yield from _least_versions(c, ((c, point[1]), side), depth,
+                                           local_part, lengths)
+
+
+def _any_version(intervals: Intervals, inexact: Iterable[BaseSpecifier],
+                 prereleases: bool,
+                 predicate: Callable[[UnparsedVersion], bool],
+                 extra_cuts: Iterable[Cut] = ()) -> bool:
+    """
+    Returns whether any version inside `intervals` (limited to final releases
+    unless `prereleases` is True) satisfies `predicate`, which may also check
+    the specifiers in `inexact`. Candidates are also tried just after each of
+    `extra_cuts`.
+    """
+    if not intervals.bounds:
+        return False
+
+    # The smallest version in each of the intervals is a candidate, but
+    # specifiers we can't represent exactly could exclude it while still
+    # matching something else. For those, add candidates just after each
+    # of the bounds of their intervals (or for !=, the intervals of the
+    # versions they exclude), plus their own versions and the smallest
+    # versions which share a prefix of their segments, written with the
+    # same number of release segments.
+    classes = list(_CLASSES if prereleases else _FINAL_CLASSES)
+    cuts: List[Cut] = list(extra_cuts)
+    texts: List[str] = []
+    lengths: Set[int] = set()
+    for spec in inexact:
+        assert isinstance(spec, PythonSpecifier)
+        operand = spec._parse_operand(spec.version)
+        if spec.operator == "!=":
+            cuts.extend(spec._intervals_equal(operand)[0].bounds)
+        else:
+            cuts.extend(spec._get_intervals()[0].bounds)
+
+        text = (spec.version[:-2] if spec.version.endswith(".*")
+                else spec.version)
+        try:
+            parsed = PythonVersion(text)
+        except InvalidVersion:
+            continue
+        texts.extend((text, _canonicalize_version(text)))
+        lengths.add(len(parsed.release))
+        # Add cuts before the smallest keys with the same epoch and
+        # release, then also the same pre-release, and so on.
+        key = parsed._key
+        cuts.extend(before((0, key[:i] + (NegativeInfinity,) * (6 - i)))
+                    for i in range(2, 6))
+
+    for version in itertools.chain(texts, _witnesses(intervals, cuts,
+                                                     classes, lengths)):
+        try:
+            if predicate(version):
+                return True
+        except InvalidVersion:
+            pass
+    return False
+
+
+def _has_version(intervals: Intervals) -> bool:
+    """
+    Returns whether any version lies inside `intervals`.
+    """
+    return _any_version(intervals, (), True,
+                        lambda v: PythonVersion(str(v))._point in intervals)
+
+
 class PythonSpecifier(IndividualSpecifier):
     _regex_str = r"""
         (?P<operator>(~=|==|!=|<=|>=|<|>|===))
@@ -418,6 +940,14 @@ class PythonSpecifier(IndividualSpecifier):
         "===": "arbitrary",
     }
 
+    def _split_spec(self, spec: str) -> Tuple[str, str]:
+        # Most specifiers are just an operator and a plain release, which we
+        # can recognize without the full regex.
+        split = _split_release_spec(spec)
+        if split is not None:
+            return split
+        return super()._split_spec(spec)
+
     def _coerce_version(self, version: UnparsedVersion) -> PythonVersion:
         if not isinstance(version, PythonVersion):
             version = PythonVersion(str(version))
@@ -427,104 +957,105 @@ class PythonSpecifier(IndividualSpecifier):
     def _canonical_spec(self) -> Tuple[str, str]:
         return self._spec[0], _canonicalize_version(self._spec[1])
 
-    def _compare_compatible(self, prospective: BaseVersion, spec: str) -> bool:
-        # Compatible releases have an equivalent combination of >= and ==. That
-        # is that ~=2.2 is equivalent to >=2.2,==2.*. This allows us to
-        # implement this in terms of the other specifiers instead of
-        # implementing it ourselves. The only thing we need to do is construct
-        # the other specifiers.
-
-        # We want everything but the last item in the version, but we want to
-        # ignore post and dev releases and we want to treat the pre-release as
-        # it's own separate segment.
-        prefix = ".".join(list(
-            itertools.takewhile(
-                lambda x: (not x.startswith("post") and not
-                           x.startswith("dev")),
-                _version_split(spec),
-            )
-        )[:-1])
+    def _parse_operand(self, version: str) -> "_Operand":
+        operator = self.operator
+        if operator == "===":
+            # Arbitrary equality is case-insensitive, so just lowercase the
+            # operand once up front.
+            return _Operand(version.lower(), None, None, None, None)
 
-        # Add the prefix notation to the end of our string
-        prefix += ".*"
-
-        return (self._get_operator(">=")(prospective, spec) and
-                self._get_operator("==")(prospective, prefix))
-
-    def _compare_equal(self, prospective: BaseVersion, spec: str) -> bool:
-        # We need special logic to handle prefix matching
-        if spec.endswith(".*"):
-            # In the case of prefix matching we want to ignore local segment.
-            prospective = PythonVersion(prospective.public)
+        if operator in ("==", "!=") and version.endswith(".*"):
             # Split the spec out by dots, and pretend that there is an implicit
             # dot in between a release segment and a pre-release segment.
-            split_spec = _version_split(spec[:-2])  # Remove the trailing .*
-
-            # Split the prospective version out by dots, and pretend that there
-            # is an implicit dot in between a release segment and a pre-release
-            # segment.
-            split_prospective = _version_split(str(prospective))
-
-            # Shorten the prospective version to be the same length as the spec
-            # so that we can determine if the specifier is a prefix of the
-            # prospective version or not.
-            shortened_prospective = split_prospective[: len(split_spec)]
-
-            # Pad out our two sides with zeros so that they both equal the same
-            # length.
-            padded_spec, padded_prospective = _pad_version(
-                split_spec, shortened_prospective
-            )
-
-            return padded_prospective == padded_spec
+            split = _version_split(version[:-2])
+            return _Operand(version, None, split, _compile_prefix(split),
+                            None)
+
+        parsed = PythonVersion(version)
+        prefix = match_prefix = bounds = None
+        if operator == "~=":
+            # Compatible releases have an equivalent combination of >= and ==.
+            # That is that ~=2.2 is equivalent to >=2.2,==2.*, so we need the
+            # prefix for the == portion. We want everything but the last item
+            # in the version, but we want to ignore post and dev releases and
+            # we want to treat the pre-release as it's own separate segment.
+            prefix = _version_split(".".join(list(
+                itertools.takewhile(
+                    lambda x: (not x.startswith("post") and not
+                               x.startswith("dev")),
+                    _version_split(version),
+                )
+            )[:-1]))
+            match_prefix = _compile_prefix(prefix)
+            bounds = _compatible_bounds(parsed, prefix)
+
+        return _Operand(version, parsed, prefix, match_prefix, bounds)
+
+    def _compare_compatible(self, prospective: PythonVersion,
+                            spec: "_Operand") -> bool:
+        # Usually, this is just a range of comparison keys.
+        if spec.bounds is not None:
+            lower, upper = spec.bounds
+            return lower <= prospective._key < upper
+
+        # Otherwise, this is implemented in terms of the other specifiers; the
+        # operand holds both the version for >= and the prefix for ==.
+        return (self._compare_greater_than_equal(prospective, spec) and
+                self._compare_equal(prospective, spec))
+
+    def _compare_equal(self, prospective: PythonVersion,
+                       spec: "_Operand") -> bool:
+        # We need special logic to handle prefix matching
+        if spec.match_prefix is not None:
+            return spec.match_prefix(prospective)
         else:
-            # Convert our spec string into a PythonVersion
-            spec_version = PythonVersion(spec)
+            assert spec.version is not None
 
             # If the specifier does not have a local segment, then we want to
             # act as if the prospective version also does not have a local
             # segment.
-            if not spec_version.local:
-                prospective = PythonVersion(prospective.public)
+            if not spec.version.local:
+                return prospective.public_key == spec.version._key
 
-            return prospective == spec_version
+            return prospective._key == spec.version._key
 
-    def _compare_not_equal(self, prospective: BaseVersion, spec: str) -> bool:
+    def _compare_not_equal(self, prospective: PythonVersion,
+                           spec: "_Operand") -> bool:
         return not self._compare_equal(prospective, spec)
 
-    def _compare_less_than_equal(self, prospective: BaseVersion,
-                                 spec: str) -> bool:
+    def _compare_less_than_equal(self, prospective: PythonVersion,
+                                 spec: "_Operand") -> bool:
         # NB: Local version identifiers are NOT permitted in the version
         # specifier, so local version labels can be universally removed from
         # the prospective version.
-        return PythonVersion(prospective.public) <= PythonVersion(spec)
+        assert spec.version is not None
+        return prospective.public_key <= spec.version._key
 
-    def _compare_greater_than_equal(self, prospective: BaseVersion,
-                                    spec: str) -> bool:
+    def _compare_greater_than_equal(self, prospective: PythonVersion,
+                                    spec: "_Operand") -> bool:
         # NB: Local version identifiers are NOT permitted in the version
         # specifier, so local version labels can be universally removed from
         # the prospective version.
-        return PythonVersion(prospective.public) >= PythonVersion(spec)
+        assert spec.version is not None
+        return prospective.public_key >= spec.version._key
 
-    def _compare_less_than(self, prospective: BaseVersion,
-                           spec_str: str) -> bool:
-        # Convert our spec to a PythonVersion instance, since we'll want to
-        # work with it as a version.
-        spec = PythonVersion(spec_str)
+    def _compare_less_than(self, prospective: PythonVersion,
+                           spec: "_Operand") -> bool:
+        spec_version = spec.version
+        assert spec_version is not None
 
         # Check to see if the prospective version is less than the spec
         # version. If it's not we can short circuit and just return False now
         # instead of doing extra unneeded work.
-        if not prospective < spec:
+        if not prospective < spec_version:
             return False
 
         # This special case is here so that, unless the specifier itself
         # includes is a pre-release version, that we do not accept pre-release
         # versions for the version mentioned in the specifier (e.g. <3.1 should
         # not match 3.1.dev0, but should match 3.0.dev0).
-        if not spec.is_prerelease and prospective.is_prerelease:
-            if ( PythonVersion(prospective.base_version) ==
-                 PythonVersion(spec.base_version) ):
+        if not spec_version.is_prerelease and prospective.is_prerelease:
+            if prospective.base_key == spec_version.base_key:
                 return False
 
         # If we've gotten to here, it means that prospective version is both
@@ -532,32 +1063,29 @@ class PythonSpecifier(IndividualSpecifier):
         # version in the spec.
         return True
 
-    def _compare_greater_than(self, prospective: BaseVersion,
-                              spec_str: str) -> bool:
-        # Convert our spec to a PythonVersion instance, since we'll want to
-        # work with it as a version.
-        spec = PythonVersion(spec_str)
+    def _compare_greater_than(self, prospective: PythonVersion,
+                              spec: "_Operand") -> bool:
+        spec_version = spec.version
+        assert spec_version is not None
 
         # Check to see if the prospective version is greater than the spec
         # version. If it's not we can short circuit and just return False now
         # instead of doing extra unneeded work.
-        if not prospective > spec:
+        if not prospective > spec_version:
             return False
 
         # This special case is here so that, unless the specifier itself
         # includes is a post-release version, that we do not accept
         # post-release versions for the version mentioned in the specifier
         # (e.g. >3.1 should not match 3.0.post0, but should match 3.2.post0).
-        if not spec.is_postrelease and prospective.is_postrelease:
-            if ( PythonVersion(prospective.base_version) ==
-                 PythonVersion(spec.base_version) ):
+        if not spec_version.is_postrelease and prospective.is_postrelease:
+            if prospective.base_key == spec_version.base_key:
                 return False
 
         # Ensure that we do not allow a local version of the version mentioned
         # in the specifier, which is technically greater than, to match.
         if prospective.local is not None:
-            if ( PythonVersion(prospective.base_version) ==
-                 PythonVersion(spec.base_version) ):
+            if prospective.base_key == spec_version.base_key:
                 return False
 
         # If we've gotten to here, it means that prospective version is both
@@ -566,16 +1094,102 @@ class PythonSpecifier(IndividualSpecifier):
         return True
 
     def _compare_arbitrary(self, prospective: PythonVersion,
-                           spec: str) -> bool:
-        return str(prospective).lower() == str(spec).lower()
-
-    @property
-    def prereleases(self) -> Optional[bool]:
-        # If there is an explicit prereleases set for this, then we'll just
-        # blindly use that.
-        if self._prereleases is not None:
-            return self._prereleases
-
+                           spec: "_Operand") -> bool:
+        return str(prospective).lower() == spec.text
+
+    def _intervals_compatible(self,
+                              spec: "_Operand") -> Tuple[Intervals, bool]:
+        assert spec.prefix is not None
+        prefix_intervals, exact = _prefix_intervals(spec.prefix)
+        ge_intervals, _ = self._intervals_greater_than_equal(spec)
+        return ge_intervals & prefix_intervals, exact
+
+    def _intervals_equal(self, spec: "_Operand") -> Tuple[Intervals, bool]:
+        if spec.prefix is not None:
+            return _prefix_intervals(spec.prefix)
+
+        assert spec.version is not None
+        if spec.version.local:
+            point = spec.version._point
+            return Intervals((before(point), after(point))), True
+
+        # Ignoring local segments means that we match the spec version and all
+        # local versions of it.
+        key = spec.version._key
+        return _key_range(before(key), before(_local_ceiling_key(key))), True
+
+    def _intervals_not_equal(self,
+                             spec: "_Operand") -> Tuple[Intervals, bool]:
+        intervals, exact = self._intervals_equal(spec)
+        if not exact:
+            return Intervals.everything(), False
+        return ~intervals, True
+
+    def _intervals_less_than_equal(
+        self, spec: "_Operand"
+    ) -> Tuple[Intervals, bool]:
+        assert spec.version is not None
+        key = spec.version._key
+        return _key_range(None, before(_local_ceiling_key(key))), True
+
+    def _intervals_greater_than_equal(
+        self, spec: "_Operand"
+    ) -> Tuple[Intervals, bool]:
+        assert spec.version is not None
+        return _key_range(before(spec.version._key), None), True
+
+    def _intervals_less_than(self,
+                             spec: "_Operand") -> Tuple[Intervals, bool]:
+        version = spec.version
+        assert version is not None
+        key = version._key
+        if version.is_prerelease:
+            return _key_range(None, before(key)), True
+
+        # Pre-releases of the spec's base version don't match, so pre-releases
+        # must be below the spec's base version.
+        return (
+            _key_range(None, before(key), _FINAL_CLASSES) |
+            _key_range(None, before(_floor_key(*key[:2])),
+                       _PRERELEASE_CLASSES)
+        ), True
+
+    def _intervals_greater_than(self,
+                                spec: "_Operand") -> Tuple[Intervals, bool]:
+        version = spec.version
+        assert version is not None
+        key = version._key
+
+        # Local versions (and post-releases, unless the spec is one) of the
+        # spec's base version don't match, so they must be above the spec's
+        # base version.
+        special = _LOCAL_CLASS
+        if not version.is_postrelease:
+            special |= _POST_CLASS
+        return (
+            _key_range(after(key), None,
+                       [c for c in _CLASSES if not c & special]) |
+            _key_range(after(_ceiling_key(*key[:2])), None,
+                       [c for c in _CLASSES if c & special])
+        ), True
+
+    def _intervals_arbitrary(self,
+                             spec: "_Operand") -> Tuple[Intervals, bool]:
+        # Only versions whose normalized form is the operand can match, so if
+        # the operand isn't normalized, nothing matches. Otherwise, we need to
+        # check versions with the same key individually, since (e.g.) 1.0 and
+        # 1.0.0 have the same key but aren't the same string.
+        try:
+            version = PythonVersion(spec.text)
+        except InvalidVersion:
+            return Intervals(), True
+        if str(version) != spec.text:
+            return Intervals(), True
+
+        point = version._point
+        return Intervals((before(point), after(point))), False
+
+    def _imply_prereleases(self) -> bool:
         # Look at all of our specifiers and determine if they are inclusive
         # operators, and if they are if they are including an explicit
         # prerelease.
@@ -593,9 +1207,55 @@ class PythonSpecifier(IndividualSpecifier):
 
         return False
 
-    @prereleases.setter
-    def prereleases(self, value: bool) -> None:
-        self._prereleases = value
+
+def _split_release_spec(spec: str) -> Optional[Tuple[str, str]]:
+    """
+    Splits a specifier written as an operator followed by a plain release
+    segment (e.g. >=1.2, or ==1.2.* for (non-)equality) into its operator and
+    version, returning None if the specifier is written any other way. This
+    gives the same result as `PythonSpecifier._regex`, but only uses simple
+    string operations.
+    """
+    spec = spec.strip()
+    operator = spec[:2]
+    if operator not in ("~=", "==", "!=", "<=", ">="):
+        operator = spec[:1]
+        if operator not in ("<", ">"):
+            return None
+
+    version = spec[len(operator):].strip()
+    release = version
+    if operator in ("==", "!=") and release.endswith(".*"):
+        release = release[:-2]
+
+    # `isdigit` also accepts non-ASCII digits, so check for those too.
+    if not (release.replace(".", "").isdigit() and release.isascii() and
+            release[0] != "." and release[-1] != "." and ".." not in release):
+        return None
+    # Compatible releases need at least two release segments.
+    if operator == "~=" and "." not in release:
+        return None
+
+    return operator, version
+
+
+class _Operand(NamedTuple):
+    # The operand of the specifier as written (lowercased for arbitrary
+    # equality, since that comparison is case-insensitive).
+    text: str
+    # The operand parsed as a version, or None for prefix matching and
+    # arbitrary equality.
+    version: Optional[PythonVersion]
+    # The split prefix to match against for prefix matching (including the
+    # implied prefix of a compatible release), or None otherwise.
+    prefix: Optional[List[str]]
+    # The compiled matcher for the prefix (see `_compile_prefix`), or None if
+    # there's no prefix.
+    match_prefix: Optional[Callable[["PythonVersion"], bool]]
+    # For a compatible release, the lower (inclusive) and upper (exclusive)
+    # bounds on the comparison keys of matching versions, if they're exactly
+    # a range of keys; None otherwise.
+    bounds: Optional[Tuple[PythonCmpKey, PythonCmpKey]]
 
 
 def _canonicalize_version(_version: str) -> str:
@@ -616,10 +1276,9 @@ def _canonicalize_version(_version: str) -> str:
         parts.append("{0}!".format(version.epoch))
 
     # Release segment
-    # NB: This strips trailing '.0's to normalize
-    parts.append(re.sub(r"(\.0)+$", "", ".".join(
-        str(x) for x in version.release
-    )))
+    # NB: This strips trailing '.0's to normalize, the same as the release key
+    #     (except that the release 0 is kept).
+    parts.append(".".join(str(x) for x in version._key[1] or (0,)))
 
     # Pre-release
     if version.pre is not None:
@@ -654,32 +1313,125 @@ def _version_split(version: str) -> List[str]:
     return result
 
 
-def _pad_version(
-    left: List[str], right: List[str],
-) -> Tuple[List[str], List[str]]:
-    left_split, right_split = [], []
+_prefix_part_regex = re.compile(r"^(a|b|rc|post|dev)?(0|[1-9][0-9]*)$")
 
-    # Get the release segment of our versions
-    left_split.append(list(itertools.takewhile(lambda x: x.isdigit(), left)))
-    right_split.append(list(itertools.takewhile(lambda x: x.isdigit(), right)))
 
-    # Get the rest of our versions
-    left_split.append(left[len(left_split[0]):])
-    right_split.append(right[len(right_split[0]):])
+def _prefix_part(part: str) -> Tuple[str, int]:
+    """
+    Parses a part of a split prefix into the form it has in a comparison key
+    (e.g. "post1" becomes ("post", 1)), or ("", N) for a release number.
+    Raises ValueError if the part isn't written the same way as in a
+    normalized version, since it can never match then.
+    """
+    match = _prefix_part_regex.search(part)
+    if not match:
+        raise ValueError(part)
+    return match.group(1) or "", int(match.group(2))
 
-    # Insert our padding
-    left_split.insert(1, ["0"] * max(
-        0, len(right_split[0]) - len(left_split[0])
-    ))
-    right_split.insert(1, ["0"] * max(
-        0, len(left_split[0]) - len(right_split[0])
+
+def _compile_prefix(prefix: List[str]) -> Callable[["PythonVersion"], bool]:
+    """
+    Returns a callable which determines whether a version matches the (split)
+    prefix, ignoring its local segment.
+
+    Prefix matching is defined in terms of strings: the prospective version is
+    normalized and split the same way as the prefix, shortened to the length
+    of the prefix, and then the release segments of each are padded with
+    zeros to the same length before comparing the two. This compiles that
+    into a comparison of the prospective version's release and its pre-,
+    post- and development release segments (in the form they have in its
+    comparison key) against precomputed tuples.
+    """
+    if not prefix:
+        return lambda prospective: True
+
+    if not prefix[0].isdigit():
+        # The prefix has an epoch (or is otherwise strange), so its first
+        # part is never considered part of the release segment. This can only
+        # match versions with a non-zero epoch, for which the same is true,
+        # and then there's no padding to worry about.
+        def match_epoch(prospective: PythonVersion) -> bool:
+            if prospective.epoch == 0:
+                return False
+            split = _version_split(prospective.public)
+            return split[:len(prefix)] == prefix
+
+        return match_epoch
+
+    try:
+        parts = [_prefix_part(i) for i in prefix]
+    except ValueError:
+        return lambda prospective: False
+
+    release = tuple(n for kind, n in itertools.takewhile(
+        lambda x: not x[0], parts
     ))
+    suffix = tuple(parts[len(release):])
+    if any(not kind for kind, n in suffix):
+        return lambda prospective: False
+    size = len(release)
+
+    def match(prospective: PythonVersion) -> bool:
+        key = prospective._key
+        if key[0] != 0:
+            return False
+
+        prospective_release = prospective._release
+        prospective_suffix = tuple(i for i in key[2:5]
+                                   if isinstance(i, tuple))
+
+        # If the prospective version has a longer release segment, its suffix
+        # is cut off, so the prefix must be a release; if it has a shorter
+        # one, its release is padded with zeros and the suffixes must match
+        # exactly.
+        length = len(prospective_release)
+        if length > size:
+            return not suffix and prospective_release[:size] == release
+        elif length == size:
+            return (prospective_release == release and
+                    prospective_suffix[:len(suffix)] == suffix)
+        else:
+            return (prospective_release == release[:length] and
+                    not any(release[length:]) and
+                    prospective_suffix == suffix)
+
+    return match
+
 
-    return (list(itertools.chain(*left_split)),
-            list(itertools.chain(*right_split)))
+def _compatible_bounds(
+    version: "PythonVersion", prefix: List[str]
+) -> Optional[Tuple[PythonCmpKey, PythonCmpKey]]:
+    """
+    Returns the lower (inclusive) and upper (exclusive) bounds on the
+    comparison keys of the versions matching a compatible release with the
+    given version and (split) prefix, or None if they aren't a single range of
+    keys.
+    """
+    try:
+        parts = [_prefix_part(i) for i in prefix]
+    except ValueError:
+        return None
+    if not parts or any(kind for kind, n in parts):
+        return None
+
+    # The matching versions run from the version itself up to the next
+    # release at the level of the prefix (e.g. ~=1.2.3 means
+    # >=1.2.3,<1.3.dev0). However, if the prefix ends in a zero, prospective
+    # versions with fewer release segments and a pre-, post- or development
+    # release segment don't match (see `_compile_prefix`), so if any of those
+    # are above the lower bound, this isn't a single range.
+    release = tuple(n for kind, n in parts)
+    release_key = _release_key(release)
+    if len(release_key) < len(release) and version._key[1] <= release_key:
+        return None
+
+    upper = _floor_key(0, _release_key(release[:-1] + (release[-1] + 1,)))
+    return version._key, upper
 
 
 class PythonSpecifierSet(BaseSpecifierSet):
+    _specifier_type = PythonSpecifier
+
     def __init__(self, specifiers: str = "",
                  prereleases: Optional[bool] = None) -> None:
         # Split on , to break each individual specifier into its own item, and
@@ -690,10 +1442,38 @@ class PythonSpecifierSet(BaseSpecifierSet):
         # Parse each individual specifier.
         parsed: Set[BaseSpecifier] = set()
         for specifier in split_specifiers:
-            parsed.add(PythonSpecifier(specifier))
+            parsed.add(self._specifier_type(specifier))
 
         super().__init__(parsed, prereleases)
 
+    @classmethod
+    def intern(cls, specifiers: str = "",
+               prereleases: Optional[bool] = None) -> "PythonSpecifierSet":
+        """
+        Returns a shared, frozen PythonSpecifierSet for the string
+        `specifiers` and the given prerelease policy, only parsing it if no
+        shared set for them exists already. Its individual specifiers are
+        shared too (see `PythonSpecifier.intern`), so the same specifier
+        appearing in many different sets is only parsed once. Shared sets are
+        kept only as long as they're in use elsewhere.
+        """
+        def create() -> PythonSpecifierSet:
+            return cls._from_specs((
+                cls._specifier_type.intern(s.strip())
+                for s in specifiers.split(",") if s.strip()
+            ), prereleases)
+
+        return _intern((cls, specifiers, prereleases), create)
+
+    def _matched_intervals(self, prereleases: bool) -> Intervals:
+        intervals = self._get_compiled()[0]
+        return intervals if prereleases else intervals & _FINAL_INTERVALS
+
+    def _any_version(self, intervals: Intervals,
+                     inexact: Iterable[BaseSpecifier], prereleases: bool,
+                     predicate: Callable[[UnparsedVersion], bool]) -> bool:
+        return _any_version(intervals, inexact, prereleases, predicate)
+
     def _coerce_version(self, version: UnparsedVersion) -> PythonVersion:
         if not isinstance(version, PythonVersion):
             version = PythonVersion(str(version))
@@ -726,6 +1506,25 @@ class PythonSpecifierSet(BaseSpecifierSet):
         return filtered
 
 
+class FrozenPythonSpecifier(PythonSpecifier):
+    """
+    A PythonSpecifier whose prerelease policy is fixed when it's created.
+    Since nothing about it can change, the results of `contains` are cached
+    for its lifetime.
+    """
+    _frozen = True
+
+
+class FrozenPythonSpecifierSet(PythonSpecifierSet):
+    """
+    A PythonSpecifierSet whose prerelease policy is fixed when it's created,
+    made up of FrozenPythonSpecifiers. Since nothing about it can change, the
+    results of `contains` are cached for its lifetime.
+    """
+    _frozen = True
+    _specifier_type = FrozenPythonSpecifier
+
+
 Version = PythonVersion
 Specifier = PythonSpecifier
 SpecifierSet = PythonSpecifierSet
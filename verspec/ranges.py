@@ -0,0 +1,553 @@
+from bisect import bisect_right
+from typing import (Any, Callable, Iterable, Iterator, List, Optional, Set,
+                    Tuple, Union)
+
+from .baseversion import UnparsedVersion
+from .basespecifier import InvalidSpecifier
+from .infinity import Infinity, NegativeInfinity
+from .intervals import AFTER, AT, BEFORE, MAX, MIN, Cut, Intervals
+from .python import (PythonSpecifier, PythonSpecifierSet, PythonVersion,
+                     _CLASSES, _FINAL_INTERVALS, _any_version, _has_version,
+                     _key_range)
+
+__all__ = ["VersionRange"]
+
+# Each part of a range either contains all of its versions (True), none of
+# them (False), or only those satisfying a formula over specifiers we can't
+# represent exactly as intervals. Formulas are nested tuples: `("spec", text,
+# s)`, `("not", f)`, `("and", f, g)`, or `("or", f, g)`. Specifiers are paired
+# with their text, since specifiers which compare equal (e.g. `===1.0` and
+# `===1.0.0`) may still match different versions.
+Value = Any
+RangeLike = Union["VersionRange", PythonSpecifierSet, PythonSpecifier, str]
+
+
+def _not(a: Value) -> Value:
+    if isinstance(a, bool):
+        return not a
+    if a[0] == "not":
+        return a[1]
+    return ("not", a)
+
+
+def _and(a: Value, b: Value) -> Value:
+    if a is False or b is False:
+        return False
+    if a is True or a == b:
+        return b
+    if b is True:
+        return a
+    return ("and", a, b)
+
+
+def _or(a: Value, b: Value) -> Value:
+    if a is True or b is True:
+        return True
+    if a is False or a == b:
+        return b
+    if b is False:
+        return a
+    return ("or", a, b)
+
+
+def _evaluate(value: Value, version: PythonVersion) -> bool:
+    if isinstance(value, bool):
+        return value
+    op = value[0]
+    if op == "spec":
+        return value[2].contains(version, prereleases=True)
+    if op == "not":
+        return not _evaluate(value[1], version)
+    if op == "and":
+        return _evaluate(value[1], version) and _evaluate(value[2], version)
+    return _evaluate(value[1], version) or _evaluate(value[2], version)
+
+
+def _formula_specifiers(value: Value) -> Iterator[PythonSpecifier]:
+    if isinstance(value, bool):
+        return
+    if value[0] == "spec":
+        yield value[2]
+    else:
+        for i in value[1:]:
+            yield from _formula_specifiers(i)
+
+
+def _key_versions(key: Any) -> Iterator[str]:
+    """
+    Yields the release of the comparison key `key` as a version string, along
+    with the full version for the key (ignoring its local segment, if it's
+    only a bound above local versions) if it's the key of a real version.
+    """
+    if not isinstance(key, tuple) or not isinstance(key[1], tuple):
+        return
+    epoch, release, pre, post, dev, local = key
+    # Comparison keys drop trailing zeros from the release, so add back
+    # enough to write it in the usual way (e.g. 1.0 instead of 1).
+    release = release + (0,) * (2 - len(release))
+    base = "{}{}".format("{}!".format(epoch) if epoch else "",
+                         ".".join(str(i) for i in release))
+    yield base
+
+    # Bounds above local versions have an infinite local segment; the version
+    # they're above is the same key without it.
+    if local is Infinity:
+        key = key[:5] + (NegativeInfinity,)
+    text = "".join((
+        base,
+        "{}{}".format(*pre) if isinstance(pre, tuple) else "",
+        ".post{}".format(post[1]) if isinstance(post, tuple) else "",
+        ".dev{}".format(dev[1]) if isinstance(dev, tuple) else "",
+        "+" + ".".join(s or str(i) for i, s in local)
+        if isinstance(local, tuple) else "",
+    ))
+    if text != base and PythonVersion(text)._key == key:
+        yield text
+
+
+def _key_cut(cut: Cut, end: bool = False) -> Cut:
+    """
+    Returns the cut at the same place as `cut` within every class of versions
+    (see `_key_range`), as a comparison key paired with a side. If `end` is
+    True, `cut` is the end of an interval, so a cut at the start of a class
+    is the end of the previous class, above every key.
+    """
+    point, side = cut
+    key = point[1] if isinstance(point, tuple) else point
+    if not isinstance(key, tuple):
+        return (Infinity, AFTER) if end else (NegativeInfinity, BEFORE)
+    return key, side
+
+
+def _open(cut: Cut) -> Optional[Cut]:
+    """
+    Returns the key cut `cut`, or None if it's below or above every key.
+    """
+    return cut if isinstance(cut[0], tuple) else None
+
+
+def _texts(cuts: Iterable[Cut]) -> Set[str]:
+    """
+    Returns the version strings for the keys of the key cuts `cuts` (see
+    `_key_versions`).
+    """
+    result: Set[str] = set()
+    for key, _ in cuts:
+        result.update(_key_versions(key))
+    return result
+
+
+def _excludable(target: Intervals, end: Cut, start: Cut,
+                classes: Iterable[int]) -> bool:
+    """
+    Returns whether the versions of the given classes between the key cuts
+    `end` and `start` can be excluded with a single != clause (if there are
+    any) without excluding anything in `target`.
+    """
+    gap = _key_range(_open(end), _open(start), classes)
+    if not _has_version(gap):
+        return True
+    for text in _texts([end, start]):
+        for op in ("==", "==.*"):
+            spec = _specifier(op[:2] + text + op[2:])
+            if spec is None:
+                continue
+            intervals, exact = spec._get_intervals()
+            if ( exact and not _has_version(gap - intervals) and
+                 not _has_version(intervals & target) ):
+                return True
+    return False
+
+
+def _groups(target: Intervals) -> Iterator[Tuple[Intervals, Cut, Cut]]:
+    """
+    Splits `target` into groups of intervals whose keys overlap, or are only
+    separated by versions which a != clause could exclude, yielding each
+    group along with the key cuts (see `_key_cut`) at its start and end.
+    """
+    # Intervals may run from the end of one class into the next, so split
+    # them up by class first. Only the classes with anything in `target` need
+    # to be excluded between groups; the rest can be left out by the sets'
+    # pre-release policies instead.
+    spans: List[Tuple[Cut, Cut, Cut, Cut]] = []
+    classes = []
+    for c in _CLASSES:
+        class_spans = list(target & _key_range(None, None, [c]))
+        if class_spans:
+            classes.append(c)
+        spans.extend((_key_cut(start), _key_cut(end, True), start, end)
+                     for start, end in class_spans)
+    spans.sort()
+
+    groups: List[Tuple[List[Tuple[Cut, Cut]], Cut, Cut]] = []
+    for key_start, key_end, start, end in spans:
+        if groups and (key_start <= groups[-1][2] or
+                       _excludable(target, groups[-1][2], key_start,
+                                   classes)):
+            members, group_start, group_end = groups[-1]
+            members.append((start, end))
+            groups[-1] = (members, group_start, max(group_end, key_end))
+        else:
+            groups.append(([(start, end)], key_start, key_end))
+
+    for members, group_start, group_end in groups:
+        bounds: List[Cut] = []
+        for start, end in sorted(members):
+            if bounds and bounds[-1] == start:
+                bounds[-1] = end
+            else:
+                bounds.extend((start, end))
+        yield Intervals(bounds), group_start, group_end
+
+
+def _coerce(other: RangeLike) -> "VersionRange":
+    if isinstance(other, VersionRange):
+        return other
+    if isinstance(other, (PythonSpecifierSet, PythonSpecifier, str)):
+        return VersionRange(other)
+    raise TypeError("can't combine VersionRange and {}".format(
+        type(other).__name__
+    ))
+
+
+class VersionRange:
+    """
+    An immutable set of PEP 440 versions. Unlike specifier sets, which can
+    only express the intersection of their specifiers, ranges can be combined
+    with `|` (union), `&` (intersection), `-` (difference), `^` (symmetric
+    difference), and `~` (complement).
+
+    A range is stored as a sorted sequence of disjoint intervals, so checking
+    whether it contains a version is a binary search. Specifiers which can't
+    be represented exactly as intervals (e.g. `===` or some prefix matches)
+    are kept alongside the intervals they apply to and checked individually.
+    """
+
+    __slots__ = ("_bounds", "_values")
+
+    def __init__(self, specifiers: Union[PythonSpecifierSet, PythonSpecifier,
+                                         str, None] = None,
+                 prereleases: Optional[bool] = None) -> None:
+        """
+        Create a range of the versions contained by `specifiers` (a specifier
+        set or a string to parse as one). As with `contains`, `prereleases`
+        overrides whether pre-releases are included. If `specifiers` is None,
+        the range is empty.
+        """
+        self._bounds: Tuple[Cut, ...] = ()
+        self._values: Tuple[Value, ...] = (False,)
+        if specifiers is None:
+            return
+
+        if isinstance(specifiers, str):
+            specifiers = PythonSpecifierSet(specifiers)
+        elif isinstance(specifiers, PythonSpecifier):
+            specifiers = PythonSpecifierSet._from_specs(
+                {specifiers}, specifiers._prereleases
+            )
+        elif not isinstance(specifiers, PythonSpecifierSet):
+            raise TypeError("expected a PythonSpecifierSet, not {}".format(
+                type(specifiers).__name__
+            ))
+
+        accept = specifiers._accepts_prereleases(prereleases)
+        intervals = specifiers._matched_intervals(accept)
+        inside: Value = True
+        for spec in sorted(specifiers._get_compiled()[1], key=str):
+            inside = _and(inside, ("spec", str(spec), spec))
+
+        bounds = list(intervals.bounds)
+        values = [False]
+        for _ in bounds:
+            values.append(inside if values[-1] is False else False)
+        if bounds and bounds[0] == MIN:
+            del bounds[0], values[0]
+        if bounds and bounds[-1] == MAX:
+            del bounds[-1], values[-1]
+        self._bounds, self._values = self._merge(bounds, values)
+
+    @classmethod
+    def everything(cls) -> "VersionRange":
+        """
+        Returns a range containing every version, including pre-releases.
+        """
+        return cls._make((), (True,))
+
+    @classmethod
+    def _make(cls, bounds: Tuple[Cut, ...],
+              values: Tuple[Value, ...]) -> "VersionRange":
+        result = cls.__new__(cls)
+        result._bounds, result._values = bounds, values
+        return result
+
+    @staticmethod
+    def _merge(bounds: Iterable[Cut], values: Iterable[Value]) -> Tuple[
+        Tuple[Cut, ...], Tuple[Value, ...]
+    ]:
+        # Drop any bounds between two parts with the same contents, so that
+        # equivalent ranges are stored the same way.
+        values = iter(values)
+        merged_bounds: List[Cut] = []
+        merged_values = [next(values)]
+        for cut, value in zip(bounds, values):
+            if value != merged_values[-1]:
+                merged_bounds.append(cut)
+                merged_values.append(value)
+        return tuple(merged_bounds), tuple(merged_values)
+
+    def _combine(self, other: RangeLike,
+                 op: Callable[[Value, Value], Value]) -> "VersionRange":
+        other = _coerce(other)
+        a, b = self._bounds, other._bounds
+        i = j = 0
+        bounds: List[Cut] = []
+        values = [op(self._values[0], other._values[0])]
+        while i < len(a) or j < len(b):
+            if j == len(b) or (i < len(a) and a[i] <= b[j]):
+                cut = a[i]
+                if j < len(b) and a[i] == b[j]:
+                    j += 1
+                i += 1
+            else:
+                cut = b[j]
+                j += 1
+            bounds.append(cut)
+            values.append(op(self._values[i], other._values[j]))
+        return self._make(*self._merge(bounds, values))
+
+    def __and__(self, other: RangeLike) -> "VersionRange":
+        return self._combine(other, _and)
+
+    def __or__(self, other: RangeLike) -> "VersionRange":
+        return self._combine(other, _or)
+
+    def __sub__(self, other: RangeLike) -> "VersionRange":
+        return self._combine(other, lambda a, b: _and(a, _not(b)))
+
+    def __xor__(self, other: RangeLike) -> "VersionRange":
+        return self._combine(other, lambda a, b: _or(_and(a, _not(b)),
+                                                     _and(_not(a), b)))
+
+    def __rand__(self, other: RangeLike) -> "VersionRange":
+        return _coerce(other) & self
+
+    def __ror__(self, other: RangeLike) -> "VersionRange":
+        return _coerce(other) | self
+
+    def __rsub__(self, other: RangeLike) -> "VersionRange":
+        return _coerce(other) - self
+
+    def __rxor__(self, other: RangeLike) -> "VersionRange":
+        return _coerce(other) ^ self
+
+    def __invert__(self) -> "VersionRange":
+        return self._make(self._bounds, tuple(_not(i) for i in self._values))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (VersionRange, PythonSpecifierSet,
+                                  PythonSpecifier, str)):
+            return NotImplemented
+        return (self ^ other).is_empty()
+
+    def __repr__(self) -> str:
+        try:
+            text = repr([str(i) for i in self.to_specifier_sets()])
+        except ValueError:
+            text = "..."
+        return "<{}({})>".format(type(self).__name__, text)
+
+    @property
+    def exact(self) -> bool:
+        """
+        Whether this range is made up entirely of intervals, without any
+        specifiers to check individually.
+        """
+        return all(isinstance(i, bool) for i in self._values)
+
+    def _intervals(self, inside: Callable[[Value], bool]) -> Intervals:
+        """
+        Returns the Intervals covering each part of this range whose contents
+        satisfy `inside`.
+        """
+        bounds = [MIN, *self._bounds, MAX]
+        result: List[Cut] = []
+        for start, end, value in zip(bounds, bounds[1:], self._values):
+            if inside(value):
+                if result and result[-1] == start:
+                    result[-1] = end
+                else:
+                    result.extend((start, end))
+        return Intervals(result)
+
+    def contains(self, item: UnparsedVersion) -> bool:
+        version = (item if isinstance(item, PythonVersion)
+                   else PythonVersion(str(item)))
+        value = self._values[bisect_right(self._bounds,
+                                          (version._point, AT))]
+        return value if isinstance(value, bool) else _evaluate(value, version)
+
+    def __contains__(self, item: UnparsedVersion) -> bool:
+        return self.contains(item)
+
+    def filter(self, iterable: Iterable[UnparsedVersion]) -> Iterator[
+        UnparsedVersion
+    ]:
+        return (i for i in iterable if self.contains(i))
+
+    def is_empty(self) -> bool:
+        """
+        Returns whether no version is in this range.
+        """
+        if _has_version(self._intervals(lambda v: v is True)):
+            return False
+
+        # Search the parts with formulas, including candidates just after our
+        # own bounds, so that each part is searched on its own even when it's
+        # next to another part.
+        inexact = {s for i in self._values for s in _formula_specifiers(i)}
+        return not _any_version(self._intervals(lambda v: v is not False),
+                                inexact, True, self.contains, self._bounds)
+
+    def to_specifier_sets(self) -> List[PythonSpecifierSet]:
+        """
+        Returns a list of specifier sets such that a version is in this range
+        if and only if one of the sets contains it. Raises ValueError if this
+        range can't be written this way.
+        """
+        if not self.exact:
+            raise ValueError("range contains specifiers which can't be " +
+                             "represented exactly")
+
+        # Each group of nearby intervals is written separately, using only the
+        # versions at its own bounds. Usually a single set using the outermost
+        # bounds (and != clauses for any gaps) is enough; if not, fall back to
+        # trying every bound in the group.
+        target = self._intervals(lambda v: v)
+        result: List[PythonSpecifierSet] = []
+        for part, start, end in _groups(target):
+            local = target & _key_range(_open(start), _open(end))
+            starts = _texts(map(_key_cut, part.bounds[::2]))
+            ends = _texts(_key_cut(i, True) for i in part.bounds[1::2])
+            sets = self._cover(part, local, _texts([start]), _texts([end]),
+                               starts | ends)
+            if sets is None:
+                sets = self._cover(part, local, starts, ends, starts | ends)
+            if sets is None:
+                raise ValueError("range can't be written as specifier sets")
+            result.extend(sets)
+        return result
+
+    @classmethod
+    def _cover(cls, part: Intervals, target: Intervals, starts: Set[str],
+               ends: Set[str], holes: Set[str]
+               ) -> Optional[List[PythonSpecifierSet]]:
+        """
+        Returns specifier sets which together contain the versions in `part`
+        and no versions outside `target`, built from the versions in `starts`,
+        `ends` and `holes` (see `_candidates`), or None if there are none.
+        """
+        remaining = part
+        chosen: List[Tuple[PythonSpecifierSet, Intervals]] = []
+        for spec_set, covered in cls._candidates(target, starts, ends, holes):
+            if not _has_version(remaining):
+                break
+            if _has_version(remaining & covered):
+                chosen.append((spec_set, covered))
+                remaining = remaining - covered
+        if _has_version(remaining):
+            return None
+
+        # Earlier choices may be covered by the later ones taken together, so
+        # drop any we don't need.
+        for i in reversed(range(len(chosen))):
+            others = Intervals()
+            for j, (_, covered) in enumerate(chosen):
+                if j != i:
+                    others = others | covered
+            if not _has_version(part - others):
+                del chosen[i]
+        return [i for i, _ in chosen]
+
+    @staticmethod
+    def _candidates(target: Intervals, starts: Set[str], ends: Set[str],
+                    holes: Set[str]) -> Iterator[
+        Tuple[PythonSpecifierSet, Intervals]
+    ]:
+        """
+        Yields specifier sets which only contain versions in `target`, along
+        with the intervals of versions they contain, starting with the ones
+        with the loosest bounds. The sets are bounded below by the versions in
+        `starts` and above by those in `ends`, and may exclude the versions in
+        `holes` with != clauses.
+        """
+        def parsed(texts: Iterable[str]) -> List[Tuple[str, PythonVersion]]:
+            return sorted(((i, PythonVersion(i)) for i in texts),
+                          key=lambda item: (item[1], item[0]))
+
+        lowers: List[Optional[str]] = [None]
+        for text, version in parsed(starts):
+            lowers.extend(op + text for op in ("==", ">=", ">"))
+            if str(version) == version.base_version:
+                prefix = (text.rsplit(".", 1)[0] if text.endswith(".0")
+                          else text)
+                lowers.extend(("~=" + text, "==" + prefix + ".*"))
+        uppers: List[Optional[str]] = [None]
+        for text, _ in reversed(parsed(ends)):
+            uppers.extend(op + text for op in ("<", "<="))
+        excluded: List[Tuple[str, Intervals]] = []
+        for text, _ in parsed(holes):
+            for op in ("==", "==.*"):
+                spec = _specifier(op[:2] + text + op[2:])
+                if spec is not None:
+                    intervals, exact = spec._get_intervals()
+                    if exact:
+                        excluded.append(("!" + str(spec)[1:], intervals))
+
+        # Try simpler sets first; any we don't end up needing are dropped
+        # afterwards.
+        pairs = sorted(((i, j) for i in lowers for j in uppers),
+                       key=lambda pair: pair.count(None), reverse=True)
+        for pair in pairs:
+            clauses = [i for i in pair if i is not None]
+            if not all(_specifier(i) for i in clauses):
+                continue
+            spec_set = PythonSpecifierSet(",".join(clauses))
+            intervals, residual = spec_set._get_compiled()
+            if residual or not _has_version(intervals & target):
+                continue
+
+            # If the set contains any pre-releases, try it both with and
+            # without them.
+            policies: Tuple[Optional[bool], ...] = (None,)
+            if _has_version(intervals - _FINAL_INTERVALS):
+                policies = (True, False)
+            for prereleases in policies:
+                covered = (intervals if prereleases is not False
+                           else intervals & _FINAL_INTERVALS)
+
+                # Try to remove any versions outside the target with !=
+                # clauses.
+                extra = covered - target
+                exclusions = []
+                if _has_version(extra):
+                    for text, equal in excluded:
+                        if ( _has_version(equal & extra) and
+                             not _has_version(equal & covered & target) ):
+                            exclusions.append(text)
+                            covered = covered - equal
+                    if _has_version(covered - target):
+                        continue
+
+                text = ",".join(clauses + exclusions)
+                result = PythonSpecifierSet(text)
+                if ( prereleases is not None and
+                     result._accepts_prereleases(None) != prereleases ):
+                    result = PythonSpecifierSet(text, prereleases)
+                yield result, covered
+
+
+def _specifier(text: str) -> Optional[PythonSpecifier]:
+    try:
+        return PythonSpecifier(text)
+    except InvalidSpecifier:
+        return None
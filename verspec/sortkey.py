@@ -0,0 +1,31 @@
+__all__ = ["encode_int", "encode_str"]
+
+# These helpers encode the pieces of a version's comparison key as byte
+# strings which compare the same way as the original values when using a
+# plain byte-wise comparison (e.g. memcmp). Each encoding is also prefix-free,
+# so the encodings of the pieces of a key can simply be concatenated.
+
+
+def encode_int(value: int) -> bytes:
+    """
+    Encode a non-negative integer as its big-endian bytes, preceded by the
+    number of bytes so that larger numbers sort after smaller ones.
+    """
+    if value < 0:
+        raise ValueError("value must be non-negative")
+    size = (value.bit_length() + 7) // 8
+    data = value.to_bytes(size, "big")
+    if size < 0xff:
+        return bytes((size,)) + data
+    # For truly enormous numbers, the size itself doesn't fit in a byte, so
+    # encode it recursively after a marker which sorts after every other size.
+    return b"\xff" + encode_int(size) + data
+
+
+def encode_str(value: str) -> bytes:
+    """
+    Encode a string as UTF-8 (which preserves code point order), escaping any
+    NUL bytes and adding a terminator which sorts before any other content.
+    """
+    data = value.encode("utf-8", "surrogatepass")
+    return data.replace(b"\x00", b"\x00\xff") + b"\x00\x01"
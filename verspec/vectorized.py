@@ -0,0 +1,348 @@
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+
+from .baseversion import UnparsedVersion
+from .index import _ALL, _FINALS, Specifier, _compiled, _prerelease_mode
+from .infinity import InfinityType, NegativeInfinityType
+from .intervals import BEFORE, MAX, MIN, Cut
+from .python import PythonVersion
+
+try:
+    import numpy  # type: ignore
+except ImportError:  # pragma: no cover
+    numpy = None  # type: ignore
+
+__all__ = ["VersionArray", "have_numpy"]
+
+# When encoding comparison keys as integers, Infinity and NegativeInfinity are
+# replaced with these sentinels. Every number from a real version must lie
+# strictly between them, or the versions can't be encoded.
+_LO = -1
+_HI = 2 ** 62
+
+_PRE_PHASES = {"a": 0, "b": 1, "rc": 2}
+
+# Local version segments can't be encoded as fixed-width integers, so we only
+# record that a version has one. Versions which are otherwise equal and which
+# both have a local segment are compared individually.
+_HAS_LOCAL = 0
+
+# The column holding the first release segment; the columns before it are the
+# class and the epoch, and the columns after the release are pre-release
+# phase and number, post-release number, development release number, and the
+# local flag.
+_RELEASE = 2
+_TRAILING = 5
+
+
+def have_numpy() -> bool:
+    """
+    Returns whether NumPy is available to evaluate specifiers in bulk.
+    """
+    return numpy is not None
+
+
+def _encode_number(value: Any) -> int:
+    if isinstance(value, NegativeInfinityType):
+        return _LO
+    if isinstance(value, InfinityType):
+        return _HI
+    if not 0 <= value < _HI:
+        raise OverflowError("version number {} is too large".format(value))
+    return int(value)
+
+
+def _release_width(point: Any) -> int:
+    if isinstance(point, tuple) and isinstance(point[1], tuple) and \
+       isinstance(point[1][1], tuple):
+        return len(point[1][1])
+    return 0
+
+
+def _encode_point(point: Any, width: int) -> List[int]:
+    """
+    Encodes an interval point (see `BaseVersion._point`) as a list of
+    integers, with the release segment padded to `width` numbers. The lists
+    compare in the same order as the points, except for local segments.
+    """
+    size = _RELEASE + width + _TRAILING
+    if isinstance(point, (InfinityType, NegativeInfinityType)):
+        return [_encode_number(point)] * size
+
+    cls, key = point
+    if isinstance(key, (InfinityType, NegativeInfinityType)):
+        return [cls] + [_encode_number(key)] * (size - 1)
+
+    epoch, release, pre, post, dev, local = key
+    result = [cls, _encode_number(epoch)]
+
+    if isinstance(release, tuple):
+        # Release keys have their trailing zeros removed, so padding them
+        # with zeros preserves their order.
+        result.extend(_encode_number(i) for i in release)
+        result.extend([0] * (width - len(release)))
+    else:
+        result.extend([_encode_number(release)] * width)
+
+    if isinstance(pre, tuple):
+        result.extend((_PRE_PHASES[pre[0]], _encode_number(pre[1])))
+    else:
+        result.extend((_encode_number(pre), 0))
+
+    result.extend(_encode_number(i if isinstance(i, (
+        InfinityType, NegativeInfinityType
+    )) else i[1]) for i in (post, dev))
+
+    result.append(_encode_number(local) if isinstance(local, (
+        InfinityType, NegativeInfinityType
+    )) else _HAS_LOCAL)
+    return result
+
+
+def _has_local(point: Any) -> bool:
+    return (isinstance(point, tuple) and isinstance(point[1], tuple) and
+            isinstance(point[1][5], tuple))
+
+
+def _to_bytes(keys: Any) -> Any:
+    # Convert each row of encoded keys to a byte string which compares the
+    # same way, so that NumPy can compare or sort entire rows at once.
+    # Shifting the values to be non-negative and storing them as big-endian
+    # integers makes the byte order match the numeric order.
+    keys = numpy.ascontiguousarray(keys - _LO, dtype=">u8")
+    return keys.view("S{}".format(keys.shape[-1] * 8)).reshape(-1)
+
+
+def _any(mask: Any) -> bool:
+    return bool(mask.any()) if hasattr(mask, "any") else any(mask)
+
+
+class VersionArray:
+    """
+    An immutable batch of PEP 440 versions which can be compared against a
+    version or checked against specifiers all at once.
+
+    If NumPy is available, the versions' comparison keys are encoded as rows
+    of a fixed-width integer array, and each operation is evaluated as a
+    vectorized comparison against the encoded bounds of a specifier's
+    compiled intervals; the results are then NumPy arrays. Otherwise (or if
+    `use_numpy` is False), the versions are checked one at a time and the
+    results are lists.
+    """
+
+    def __init__(self, versions: Iterable[UnparsedVersion],
+                 use_numpy: Optional[bool] = None) -> None:
+        if use_numpy is None:
+            use_numpy = have_numpy()
+        elif use_numpy and not have_numpy():
+            raise ImportError("numpy is required for use_numpy=True")
+
+        self._items = list(versions)
+        self._versions = [v if isinstance(v, PythonVersion)
+                          else PythonVersion(str(v)) for v in self._items]
+        self._points = [v._point for v in self._versions]
+
+        self._keys: Any = None
+        self._sorted: Any = None
+        self._key_bytes: Any = None
+        self._prereleases: Any = [v.is_prerelease for v in self._versions]
+        if use_numpy:
+            width = max((_release_width(p) for p in self._points), default=0)
+            try:
+                keys = [_encode_point(p, width) for p in self._points]
+            except OverflowError:
+                # Leave any versions with enormous numbers to be checked
+                # individually.
+                pass
+            else:
+                self._keys = numpy.array(keys, dtype=numpy.int64).reshape(
+                    len(keys), _RELEASE + width + _TRAILING
+                )
+                self._prereleases = numpy.array(self._prereleases,
+                                                dtype=bool)
+
+    def __repr__(self) -> str:
+        return "<{}({!r})>".format(
+            type(self).__name__, [str(v) for v in self._versions]
+        )
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[UnparsedVersion]:
+        return iter(self._items)
+
+    @property
+    def keys(self) -> Any:
+        """
+        The encoded comparison keys of the versions as a NumPy array with one
+        row per version, or None if they aren't encoded.
+        """
+        return self._keys
+
+    def _width(self) -> int:
+        return int(self._keys.shape[1]) - _RELEASE - _TRAILING
+
+    def _widen(self, point: Any) -> None:
+        # Pad the release segments of our keys with zeros so that they can be
+        # compared against a point with a longer release.
+        extra = _release_width(point) - self._width()
+        if extra > 0:
+            at = _RELEASE + self._width()
+            self._keys = numpy.insert(self._keys, [at] * extra, 0, axis=1)
+            self._sorted = None
+            self._key_bytes = None
+
+    def _encode_bytes(self, point: Any, start: int = 0) -> Any:
+        row = numpy.array([_encode_point(point, self._width())[start:]],
+                          dtype=numpy.int64)
+        return _to_bytes(row)[0]
+
+    def _get_sorted(self) -> Any:
+        # Returns our encoded keys (as bytes) in sorted order, along with the
+        # index of each one.
+        if self._sorted is None:
+            key_bytes = _to_bytes(self._keys)
+            order = numpy.argsort(key_bytes, kind="stable")
+            self._sorted = (key_bytes[order], order)
+        return self._sorted
+
+    def _position(self, cut: Cut, ties: List[Any]) -> int:
+        """
+        Returns the position of `cut` among our sorted versions. If any
+        versions might be equal to the cut's point but can't be compared
+        exactly, their indices are added to `ties`.
+        """
+        if cut == MIN:
+            return 0
+        if cut == MAX:
+            return len(self)
+
+        point, side = cut
+        self._widen(point)
+        key_bytes, order = self._get_sorted()
+
+        value = self._encode_bytes(point)
+        left = int(numpy.searchsorted(key_bytes, value, side="left"))
+        right = int(numpy.searchsorted(key_bytes, value, side="right"))
+        if left < right and _has_local(point):
+            ties.append(order[left:right])
+        return left if side == BEFORE else right
+
+    def _check(self, mask: Any, residual: Sequence[Any]) -> Any:
+        # Check the versions inside the intervals against any specifiers which
+        # couldn't be represented exactly.
+        versions = self._versions
+        if self._keys is None:
+            return [m and all(s.contains(v, prereleases=True)
+                              for s in residual)
+                    for m, v in zip(mask, versions)]
+        for i in numpy.flatnonzero(mask):
+            mask[i] = all(s.contains(versions[i], prereleases=True)
+                          for s in residual)
+        return mask
+
+    def _match(self, spec: Specifier) -> Any:
+        """
+        Returns a mask of the versions matching `spec`, ignoring its prerelease
+        policy.
+        """
+        intervals, residual = _compiled(spec)
+        if self._keys is None:
+            mask: Any = [p in intervals for p in self._points]
+        elif not intervals:
+            mask = numpy.zeros(len(self), dtype=bool)
+        else:
+            # Find the range of sorted positions covered by each interval, and
+            # then mark those positions in the mask.
+            ties: List[Any] = []
+            bounds = [self._position(cut, ties) for cut in intervals.bounds]
+            delta = numpy.zeros(len(self) + 1, dtype=numpy.int64)
+            numpy.add.at(delta, bounds[0::2], 1)
+            numpy.add.at(delta, bounds[1::2], -1)
+
+            mask = numpy.empty(len(self), dtype=bool)
+            mask[self._get_sorted()[1]] = numpy.cumsum(delta[:-1]) != 0
+
+            # Versions tied with a bound because of their local segments need
+            # to be checked individually.
+            for i in (numpy.concatenate(ties) if ties else ()):
+                mask[i] = self._points[i] in intervals
+
+        return self._check(mask, residual) if residual else mask
+
+    def _select(self, mask: Any, want: bool) -> Any:
+        # Restrict the mask to versions which either are or aren't
+        # pre-releases.
+        if self._keys is None:
+            return [m and p == want for m, p in zip(mask, self._prereleases)]
+        return mask & (self._prereleases == want)
+
+    def compare(self, other: UnparsedVersion) -> Sequence[int]:
+        """
+        Compares each of our versions against `other`, returning -1, 0, or 1
+        for each depending on whether it's less than, equal to, or greater
+        than `other`.
+        """
+        if not isinstance(other, PythonVersion):
+            other = PythonVersion(str(other))
+        if self._keys is None:
+            return [(v > other) - (v < other) for v in self._versions]
+
+        point = other._point
+        try:
+            self._widen(point)
+            value = self._encode_bytes(point, 1)
+        except OverflowError:
+            return [(v > other) - (v < other) for v in self._versions]
+
+        # Compare only the keys, ignoring the class in the first column.
+        if self._key_bytes is None:
+            self._key_bytes = _to_bytes(self._keys[:, 1:])
+        key_bytes = self._key_bytes
+        result = ((key_bytes > value).astype(numpy.int8) -
+                  (key_bytes < value).astype(numpy.int8))
+
+        if _has_local(point):
+            for i in numpy.flatnonzero(key_bytes == value):
+                mine = self._versions[i]
+                result[i] = (mine > other) - (mine < other)
+        return result  # type: ignore
+
+    def contains(self, spec: Specifier,
+                 prereleases: Optional[bool] = None) -> Sequence[bool]:
+        """
+        Returns a mask of the versions contained in `spec`; this is equivalent
+        to calling `spec.contains` for each version.
+        """
+        if prereleases is None:
+            prereleases = spec.prereleases
+        try:
+            mask = self._match(spec)
+        except OverflowError:
+            return [spec.contains(v, prereleases=prereleases)
+                    for v in self._versions]
+        return mask if prereleases else self._select(mask, False)
+
+    def filter(self, spec: Specifier,
+               prereleases: Optional[bool] = None) -> List[UnparsedVersion]:
+        """
+        Returns the items matched by `spec` in their original order, following
+        the same rules for pre-releases as `spec.filter`.
+        """
+        try:
+            mask = self._match(spec)
+        except OverflowError:
+            return list(spec.filter(self._items, prereleases=prereleases))
+
+        prerelease_mask = self._select(mask, True)
+        mode = _prerelease_mode(spec, prereleases,
+                                lambda: _any(prerelease_mask))
+        if mode != _ALL:
+            mask = self._select(mask, False)
+            if mode != _FINALS and not _any(mask):
+                mask = prerelease_mask
+
+        items = self._items
+        if self._keys is None:
+            return [i for i, m in zip(items, mask) if m]
+        return [items[i] for i in numpy.flatnonzero(mask)]